@@ -1,114 +1,384 @@
 # app/utils/clustering.py
 import numpy as np
-import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA
+from scipy.cluster.hierarchy import linkage
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
-from app.models import Article  # Assurez-vous que le chemin est correct
-import json
+from sqlalchemy.orm import Session
+from app.models import Article, ArticleCluster, ClusterSnapshot  # Assurez-vous que le chemin est correct
+from . import crud
+from .config import settings
 from .utils.openai import generate_summary_and_title_async
+from .utils.cluster_summary_cache import get_cluster_summaries_cached
+from .utils.embeddings import embedding_to_array
+from .utils.embedding_store import EmbeddingStore, get_embedding_store
 import asyncio
 
+K_SELECTION_METHODS = ("exhaustive", "minibatch", "ward")
+# Taille minimale (dans la fenêtre) d'un cluster en ligne pour figurer dans un snapshot
+MIN_ONLINE_CLUSTER_SIZE = 2
+
 def find_optimal_k(sse, k_range):
     sse_diff = np.diff(sse)
     sse_diff_2 = np.diff(sse_diff)
     optimal_k_index = np.argmax(np.abs(sse_diff_2)) + 1
     return k_range[optimal_k_index]
 
-def workflow_query_cluster_and_summarize(articles, k_range: range = range(2, 21)):
-    data = []
-    for art in articles:
-        embedding_array = np.array(art.embedding) if art.embedding else None
-        data.append({
-            'id': art.id,
-            'title': art.title,
-            'summary': art.summary,
-            'raw_text': art.raw_text,
-            'published_at': art.published_at,
-            'url': art.url,
-            'embedding': embedding_array
-        })
-
-    df = pd.DataFrame(data)
-
-    # Nettoyer et convertir les embeddings
-    df['embedding'] = df['embedding'].apply(fix_ndarray_embeddings)
-    df = df.dropna(subset=['embedding'])  # Supprimer les lignes sans embeddings
-    embeddings = np.vstack(df['embedding'].values)
-
-    # Trouver le k optimal pour K-Means
-    sse = []
-    for k in k_range:
-        kmeans = KMeans(n_clusters=k, random_state=42)
-        kmeans.fit(embeddings)
-        sse.append(kmeans.inertia_)
-
-    def find_optimal_k(sse, k_range):
-        sse_diff = np.diff(sse)
-        sse_diff_2 = np.diff(sse_diff)
-        optimal_k_index = np.argmax(np.abs(sse_diff_2)) + 1
-        return k_range[optimal_k_index]
-
-    k_optimal = find_optimal_k(sse, k_range)
+def reduce_for_k_selection(embeddings: np.ndarray, sample_size: int, components: int, random_state: int = 42) -> np.ndarray:
+    """
+    Sous-échantillonne les embeddings puis les projette par PCA, pour estimer la courbe
+    du coude à moindre coût (la forme de la courbe, pas les centroïdes, compte ici).
+
+    Parameters:
+        embeddings (np.ndarray): Les embeddings (n, d).
+        sample_size (int): Nombre maximal de points conservés.
+        components (int): Nombre de composantes principales (0 = pas de projection).
+        random_state (int): Graine du tirage et de la PCA.
+
+    Returns:
+        np.ndarray: Les points réduits.
+    """
+    if len(embeddings) > sample_size:
+        rng = np.random.default_rng(random_state)
+        embeddings = embeddings[rng.choice(len(embeddings), sample_size, replace=False)]
+    components = min(components, *embeddings.shape)
+    if 0 < components < embeddings.shape[1]:
+        embeddings = PCA(n_components=components, random_state=random_state).fit_transform(embeddings)
+    return embeddings
+
+def ward_sse(points: np.ndarray, k_range: range) -> List[float]:
+    """
+    Calcule en une seule classification hiérarchique de Ward la somme des carrés
+    intra-clusters (SSE) pour chaque k : chaque fusion de Ward augmente la SSE de
+    exactement hauteur² / 2, la SSE à k clusters est donc la somme des n - k premières.
+
+    Parameters:
+        points (np.ndarray): Les points (n, d), avec n > max(k_range).
+        k_range (range): Les valeurs de k.
+
+    Returns:
+        List[float]: La SSE pour chaque k.
+    """
+    increments = np.cumsum(linkage(points, method='ward')[:, 2] ** 2 / 2)
+    return [float(increments[len(points) - k - 1]) for k in k_range]
+
+def select_optimal_k(
+    embeddings: np.ndarray,
+    k_range: range,
+    method: str = settings.CLUSTER_K_SELECTION,
+    sample_size: int = settings.CLUSTER_K_SAMPLE_SIZE,
+    components: int = settings.CLUSTER_K_PCA_COMPONENTS,
+) -> int:
+    """
+    Choisit k par la méthode du coude (voir `find_optimal_k`).
+
+    - "exhaustive" : un KMeans complet par k sur tous les embeddings (méthode historique) ;
+    - "minibatch" : un MiniBatchKMeans par k sur un sous-échantillon projeté par PCA ;
+    - "ward" : une seule classification de Ward sur le sous-échantillon projeté, qui
+      donne la SSE de tous les k d'un coup (environ quinze fois moins coûteux que
+      "exhaustive" sur 500 articles).
+
+    Parameters:
+        embeddings (np.ndarray): Les embeddings (n, d), avec n > max(k_range).
+        k_range (range): Les valeurs de k candidates (au moins trois).
+        method (str): "exhaustive", "minibatch" ou "ward".
+        sample_size (int): Taille du sous-échantillon ("minibatch" et "ward").
+        components (int): Composantes principales conservées ("minibatch" et "ward", 0 = aucune).
+
+    Returns:
+        int: Le k retenu.
+
+    Raises:
+        ValueError: Si la méthode est inconnue.
+    """
+    if method not in K_SELECTION_METHODS:
+        raise ValueError(f"Méthode de sélection de k inconnue : {method} (attendu : {', '.join(K_SELECTION_METHODS)})")
+    if method == "exhaustive":
+        sse = [KMeans(n_clusters=k, random_state=42).fit(embeddings).inertia_ for k in k_range]
+        return find_optimal_k(sse, k_range)
+
+    points = reduce_for_k_selection(embeddings, max(sample_size, k_range.stop), components)
+    if method == "ward":
+        sse = ward_sse(points, k_range)
+    else:
+        sse = [
+            MiniBatchKMeans(n_clusters=k, random_state=42, n_init=1, batch_size=256).fit(points).inertia_
+            for k in k_range
+        ]
+    return find_optimal_k(sse, k_range)
+
+async def generate_cluster_summaries(cluster_texts: Dict[int, str]) -> Dict[int, dict]:
+    """
+    Génère en parallèle le titre et le résumé de chaque cluster via le client LLM partagé
+    (concurrence et débit limités par le client).
+
+    Parameters:
+        cluster_texts (Dict[int, str]): Le texte concaténé de chaque cluster.
+
+    Returns:
+        Dict[int, dict]: {cluster_id: {"title": ..., "summary": ...}}.
+    """
+    results = await asyncio.gather(*(
+        generate_summary_and_title_async(text, cluster_id) for cluster_id, text in cluster_texts.items()
+    ))
+    return dict(results)
+
+def embedding_matrix(
+    articles,
+    store: Optional[EmbeddingStore] = None,
+    db: Optional[Session] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copie les embeddings des articles dans une matrice float32 contiguë préallouée.
+
+    Parameters:
+        articles (List[Article]): Les articles.
+        store (Optional[EmbeddingStore]): Store local lu en priorité.
+        db (Optional[Session]): Session utilisée pour lire, en une requête, les embeddings
+            des articles absents du store (sinon lus sur les articles).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: La matrice (m, d) des embeddings présents et les
+            positions, dans `articles`, des m articles correspondants, par position croissante.
+    """
+    if store is None or not articles:
+        return attribute_embedding_matrix(articles, range(len(articles)))
+    article_ids = [article.id for article in articles]
+    matrix, positions = store.get(article_ids)
+    if len(positions) == len(articles):
+        return matrix, positions
+
+    # Seuls les articles absents du store sont lus en base
+    missing = np.setdiff1d(np.arange(len(articles)), positions)
+    if db is not None:
+        position_of = {article_ids[i]: i for i in missing}
+        loaded_ids, loaded = crud.load_embedding_matrix(
+            db, [article_ids[i] for i in missing], dimension=matrix.shape[1]
+        )
+        loaded_positions = np.fromiter((position_of[i] for i in loaded_ids), dtype=np.intp, count=len(loaded_ids))
+    else:
+        loaded, loaded_positions = attribute_embedding_matrix(articles, missing)
+    if not len(loaded_positions):
+        return matrix, positions
+    if not len(positions):
+        matrix = np.empty((0, loaded.shape[1]), dtype=np.float32)
+    all_positions = np.concatenate([positions, loaded_positions])
+    order = np.argsort(all_positions, kind='stable')
+    return np.concatenate([matrix, loaded])[order], all_positions[order]
+
+def attribute_embedding_matrix(articles, positions) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copie, depuis l'attribut `embedding` des articles, les embeddings des articles
+    situés aux positions données.
+
+    Parameters:
+        articles (List[Article]): Les articles.
+        positions: Les positions des articles à lire.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: La matrice (m, d) des embeddings présents et les
+            positions des m articles correspondants.
+    """
+    vectors = [(i, embedding_to_array(articles[i].embedding)) for i in positions]
+    vectors = [(i, vector) for i, vector in vectors if vector is not None and vector.size]
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.intp)
+    matrix = np.empty((len(vectors), vectors[0][1].size), dtype=np.float32)
+    for row, (_, vector) in enumerate(vectors):
+        matrix[row] = vector
+    return matrix, np.fromiter((i for i, _ in vectors), dtype=np.intp, count=len(vectors))
+
+def group_by_label(labels: np.ndarray) -> List[np.ndarray]:
+    """
+    Regroupe les positions par label avec un seul tri, du groupe le plus grand au plus
+    petit (à taille égale, par label croissant).
+
+    Parameters:
+        labels (np.ndarray): Le label de chaque élément (entiers de 0 à k - 1).
+
+    Returns:
+        List[np.ndarray]: Pour chaque label non vide, les positions de ses éléments, dans l'ordre d'origine.
+    """
+    counts = np.bincount(labels)
+    groups = np.split(np.argsort(labels, kind='stable'), np.cumsum(counts)[:-1])
+    order = np.argsort(-counts, kind='stable')
+    return [groups[label] for label in order if counts[label]]
+
+def kmeans_groups(
+    articles,
+    k_range: range = range(2, 21),
+    k: Optional[int] = None,
+    store: Optional[EmbeddingStore] = None,
+    db: Optional[Session] = None,
+) -> Tuple[list, Dict[int, np.ndarray]]:
+    """
+    Partie calcul du clustering (choix de k et KMeans), exécutée hors de la boucle d'événements.
+
+    Parameters:
+        articles (List[Article]): Les articles (ceux sans embedding sont ignorés).
+        k_range (range): Les valeurs de k candidates.
+        k (Optional[int]): Nombre de clusters imposé (sinon choisi par `select_optimal_k`).
+        store (Optional[EmbeddingStore]): Store local des embeddings récents.
+        db (Optional[Session]): Session pour lire les embeddings absents du store.
+
+    Returns:
+        Tuple[list, Dict[int, np.ndarray]]: Les articles clusterisés et, pour chaque label,
+            les positions de ses articles, du plus gros cluster au plus petit.
+    """
+    embeddings, positions = embedding_matrix(articles, store, db)
+    if not len(positions):
+        return [], {}
+    articles = [articles[i] for i in positions]
+
+    if k is None:
+        # Pas plus de clusters que d'articles ; la méthode du coude demande au moins trois k
+        k_range = range(k_range.start, min(k_range.stop, len(embeddings)))
+        if len(k_range) < 3:
+            k = min(k_range.start, len(embeddings))
+        else:
+            # Trouver le k optimal pour K-Means
+            k = select_optimal_k(embeddings, k_range)
 
     # Appliquer K-Means avec k optimal
-    kmeans = KMeans(n_clusters=k_optimal, random_state=42)
-    df['cluster'] = kmeans.fit_predict(embeddings)
-
-    # Gérer l'asynchronisme dans une boucle d'événements locale
-    def perform_summarization(df):
-        async def process_clusters():
-            cluster_summaries = {}
-            tasks = []
-            for cluster_id in sorted(df['cluster'].unique()):
-                cluster_text = " ".join(df[df['cluster'] == cluster_id]['raw_text'])
-                tasks.append(generate_summary_and_title_async(cluster_text, cluster_id))
-
-            results = await asyncio.gather(*tasks)
-            for cluster_id, summary_and_title in results:
-                cluster_summaries[cluster_id] = {
-                    "title": summary_and_title.get("title", f"Cluster {cluster_id}"),
-                    "summary": summary_and_title.get("summary", "No summary available."),
-                    "articles": df[df['cluster'] == cluster_id].to_dict(orient='records')
-                }
-            return cluster_summaries
-
-        # Lancer une boucle d'événement locale
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(process_clusters())
-        finally:
-            loop.close()
-
-    cluster_summaries = perform_summarization(df)
-
-    # Trier les clusters par importance (nombre d'articles par cluster)
-    sorted_clusters = sorted(
-        cluster_summaries.items(),
-        key=lambda item: len(item[1]['articles']),
-        reverse=True
+    labels = KMeans(n_clusters=k, random_state=42).fit_predict(embeddings)
+    return articles, {int(labels[members[0]]): members for members in group_by_label(labels)}
+
+async def workflow_query_cluster_and_summarize(
+    articles,
+    k_range: range = range(2, 21),
+    db: Optional[Session] = None,
+    k: Optional[int] = None,
+    store: Optional[EmbeddingStore] = None,
+):
+    """
+    Clusterise des articles par KMeans sur leurs embeddings et génère titre et résumé de chaque cluster.
+
+    Les calculs portent sur une matrice float32 et un tableau de labels, dans un thread ;
+    les appels au LLM sont attendus directement sur la boucle de l'appelant, et les
+    dictionnaires de réponse ne sont construits qu'à la fin.
+
+    Parameters:
+        articles (List[Article]): Les articles (ceux sans embedding sont ignorés).
+        k_range (range): Les valeurs de k candidates.
+        db (Optional[Session]): Session pour le cache des résumés de clusters (sans cache si None).
+        k (Optional[int]): Nombre de clusters imposé (sinon choisi par `select_optimal_k`).
+        store (Optional[EmbeddingStore]): Store local des embeddings récents.
+
+    Returns:
+        dict: {cluster_id: {"title", "summary", "articles"}}, du plus gros cluster au plus petit.
+    """
+    articles, groups = await asyncio.to_thread(kmeans_groups, articles, k_range, k, store, db)
+    if not groups:
+        return {}
+
+    # Titres et résumés : depuis le cache persistant si la composition du cluster a
+    # déjà été résumée, sinon via le LLM
+    clusters = {
+        cluster_id: ([articles[i].id for i in members], " ".join(articles[i].raw_text for i in members))
+        for cluster_id, members in sorted(groups.items())
+    }
+    if db is not None:
+        summaries = await get_cluster_summaries_cached(db, clusters, generate_cluster_summaries)
+    else:
+        summaries = await generate_cluster_summaries({cluster_id: text for cluster_id, (_, text) in clusters.items()})
+
+    # Clusters triés par importance (nombre d'articles par cluster)
+    return {
+        cluster_id: {
+            "title": summaries[cluster_id].get("title") or f"Cluster {cluster_id}",
+            "summary": summaries[cluster_id].get("summary") or "No summary available.",
+            "articles": [article_record(articles[i]) for i in members],
+        }
+        for cluster_id, members in groups.items()
+    }
+
+def article_record(article) -> dict:
+    """
+    Champs d'un article exposés dans la réponse d'un cluster.
+    """
+    return {
+        'id': article.id,
+        'title': article.title,
+        'summary': article.summary,
+        'raw_text': article.raw_text,
+        'published_at': article.published_at,
+        'url': article.url,
+    }
+
+async def online_cluster_summaries(articles, db: Session) -> dict:
+    """
+    Regroupe les articles selon leur cluster en ligne (affecté à l'ingestion) et génère
+    titres et résumés, sans réapprentissage. Seuls les clusters d'au moins
+    `MIN_ONLINE_CLUSTER_SIZE` articles dans la fenêtre sont retenus.
+
+    Parameters:
+        articles (List[Article]): Les articles à regrouper.
+        db (Session): La session de base de données.
+
+    Returns:
+        dict: {cluster_id: {"title", "summary", "articles"}}, du plus gros cluster au plus petit.
+    """
+    membership = dict(
+        db.query(ArticleCluster.article_id, ArticleCluster.cluster_id)
+        .filter(ArticleCluster.article_id.in_([article.id for article in articles]))
+        .all()
     )
+    groups = defaultdict(list)
+    for article in articles:
+        if article.id in membership:
+            groups[membership[article.id]].append(article)
+    groups = {cluster_id: members for cluster_id, members in groups.items() if len(members) >= MIN_ONLINE_CLUSTER_SIZE}
+
+    clusters = {
+        cluster_id: ([article.id for article in members], " ".join(article.raw_text for article in members))
+        for cluster_id, members in groups.items()
+    }
+    summaries = await get_cluster_summaries_cached(db, clusters, generate_cluster_summaries)
+    return {
+        cluster_id: {
+            "title": summaries[cluster_id].get("title") or f"Cluster {cluster_id}",
+            "summary": summaries[cluster_id].get("summary") or "No summary available.",
+            "articles": [{"id": article.id} for article in groups[cluster_id]],
+        }
+        for cluster_id in sorted(groups, key=lambda cluster_id: len(groups[cluster_id]), reverse=True)
+    }
+
+async def refresh_cluster_snapshot(db: Session, window: int = settings.CLUSTER_WINDOW_SIZE) -> ClusterSnapshot:
+    """
+    Clusterise les articles les plus récents (KMeans, ou regroupement selon les clusters
+    en ligne si CLUSTERING_MODE vaut "online"), génère titres et résumés, et enregistre
+    le résultat comme nouveau snapshot (appelé une fois par cycle d'ingestion).
+
+    Parameters:
+        db (Session): La session de base de données.
+        window (int): Nombre d'articles récents à clusteriser.
 
-    # Retourner les clusters triés
-    return {k: v for k, v in sorted_clusters}
-
-def fix_ndarray_embeddings(embedding):
-    """
-    Corrige un numpy.ndarray contenant des listes de nombres.
-    Convertit tout en tableau NumPy de floats.
-    """
-    try:
-        if isinstance(embedding, np.ndarray) and embedding.ndim == 0:
-            return np.array(json.loads(embedding.item()), dtype=float)
-        if isinstance(embedding, np.ndarray) and embedding.size == 1 and isinstance(embedding[0], str):
-            return np.array(json.loads(embedding[0]), dtype=float)
-        if isinstance(embedding, np.ndarray) and embedding.dtype in [np.float32, np.float64]:
-            return embedding
-        if isinstance(embedding, str):
-            return np.array(json.loads(embedding), dtype=float)
-    except Exception as e:
-        print(f"Erreur lors du traitement : {e}, embedding : {embedding}")
-        return None
-    
-    print(f"Embedding invalide ou type inattendu : {type(embedding)}")
-    return None
+    Returns:
+        ClusterSnapshot: Le snapshot créé.
+    """
+    # Avec le store local, les embeddings ne transitent pas par PostgreSQL (seuls ceux
+    # des articles absents du store sont relus, en une requête)
+    store = get_embedding_store()
+    articles = crud.get_latest_articles(db, limit=window, with_embeddings=store is None)
+    if not articles:
+        cluster_summaries = {}
+    elif settings.CLUSTERING_MODE == "online":
+        cluster_summaries = await online_cluster_summaries(articles, db)
+    else:
+        cluster_summaries = await workflow_query_cluster_and_summarize(articles, db=db, store=store)
+    snapshot = crud.create_cluster_snapshot(
+        db,
+        [
+            {
+                "cluster_id": cluster_id,
+                "title": info["title"],
+                "summary": info["summary"],
+                "article_ids": [article["id"] for article in info["articles"]],
+            }
+            for cluster_id, info in cluster_summaries.items()
+        ],
+        article_count=len(articles),
+    )
+    crud.prune_cluster_snapshots(db)
+    return snapshot
@@ -9,6 +9,103 @@ class Settings(BaseSettings):
     NEWS_API_KEY: str
     OPENAI_API_KEY: str # Clé API OpenAI
 
+    # Ingestion
+    RUN_SCHEDULER_IN_WEB: bool = False  # Lancer le scheduler dans le processus web (sinon : python -m app.worker)
+    FETCH_INTERVAL_MINUTES: int = 10
+    INGESTION_LEADER_LOCK_ID: int = 724601  # Verrou consultatif PostgreSQL du worker leader
+    INGESTION_JOB_LOCK_ID: int = 724602  # Verrou consultatif d'une exécution d'ingestion
+    LEADER_RETRY_SECONDS: int = 30  # Attente d'un worker en veille avant de retenter l'élection
+    LEADER_HEARTBEAT_SECONDS: int = 15  # Vérification de la connexion du verrou par le leader
+
+    # NewsAPI
+    NEWS_API_BASE_URL: str = "https://newsapi.org/v2"
+    NEWS_API_TIMEOUT: float = 10.0  # Timeout par requête HTTP (secondes)
+    NEWS_API_PAGE_SIZE: int = 100
+    NEWS_API_MAX_PAGES: int = 5  # Pages récupérées par date et par requête
+    NEWS_API_MAX_RETRIES: int = 3
+    NEWS_API_BACKOFF: float = 1.0  # Délai de base du backoff exponentiel (secondes)
+    NEWS_API_MAX_CONNECTIONS: int = 10  # Taille du pool de connexions
+    NEWS_API_CONCURRENCY: int = 4  # Requêtes simultanées maximales
+
+    # Nettoyage HTML
+    TEXT_CLEANING_WORKERS: int = 0  # Processus pour les gros lots (0 = nombre de CPU)
+    TEXT_CLEANING_PARALLEL_THRESHOLD: int = 5000  # Taille de lot à partir de laquelle le pool est utilisé
+
+    # Quasi-doublons
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 3  # Distance de Hamming maximale entre SimHash (<= 3)
+
+    # Embeddings
+    EMBEDDING_PROVIDER: str = "openai"  # "openai" ou "local" (déterministe, hors ligne)
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_DIMENSION: int = 1536
+    EMBEDDING_BATCH_SIZE: int = 100  # Nombre de textes par appel d'embedding
+    EMBEDDING_MAX_CONCURRENCY: int = 4  # Nombre maximal d'appels d'embedding simultanés
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100000  # Au-delà, les entrées les moins récemment utilisées sont supprimées
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024  # Embeddings de requêtes de recherche gardés en mémoire par processus (LRU)
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600  # Durée de vie d'un embedding de requête en mémoire
+
+    # Recherche sémantique (index : python -m app.tasks.search_index create)
+    VECTOR_SEARCH_BACKEND: str = "auto"  # "pgvector", "inprocess" (force brute en mémoire) ou "auto" (pgvector sur PostgreSQL, inprocess sinon)
+    VECTOR_SEARCH_INPROCESS_SOURCE: str = "database"  # Matrice de "inprocess" : "database" (tous les articles) ou "store" (fenêtre du store d'embeddings)
+    VECTOR_SEARCH_QUANTIZE: bool = False  # "inprocess" : parcours sur une copie int8, puis reclassement exact
+    VECTOR_SEARCH_RERANK_FACTOR: int = 4  # Candidats int8 reclassés : k * facteur
+    VECTOR_SEARCH_METRIC: str = "l2"  # "l2" (<->) ou "cosine" (<=>), identique à la distance de l'index
+    VECTOR_SEARCH_EF_SEARCH: int = 0  # hnsw.ef_search par défaut des recherches (0 = valeur de pgvector)
+    VECTOR_SEARCH_PROBES: int = 0  # ivfflat.probes par défaut des recherches (0 = valeur de pgvector)
+    VECTOR_SEARCH_ITERATIVE_SCAN: str = ""  # Recherches filtrées : "strict_order" ou "relaxed_order" (pgvector >= 0.8), "" = désactivé
+    VECTOR_SEARCH_FILTERED_EF_SEARCH: int = 200  # hnsw.ef_search minimal des recherches filtrées sans parcours itératif
+    VECTOR_INDEX_METHOD: str = "hnsw"  # "hnsw" ou "ivfflat"
+    VECTOR_INDEX_HNSW_M: int = 16
+    VECTOR_INDEX_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_INDEX_IVFFLAT_LISTS: int = 0  # 0 = calculé d'après le nombre d'articles
+    SEARCH_MODE: str = "hybrid"  # "hybrid" (plein texte + vecteurs), "vector" ou "keyword" (sans embedding)
+    TEXT_SEARCH_CONFIG: str = "english"  # Configuration PostgreSQL du tsvector (python -m app.tasks.search_index create-text)
+    SEARCH_FUSION_CANDIDATES: int = 50  # Résultats de chaque classement fusionnés en mode hybride
+    SEARCH_RRF_K: int = 60  # Constante de la fusion par rang réciproque (RRF)
+
+    # LLM (résumés et titres)
+    LLM_MAX_CONCURRENCY: int = 8  # Appels simultanés maximum au LLM, par boucle d'événements
+    LLM_REQUESTS_PER_MINUTE: int = 300  # Débit du seau à jetons partagé par le processus (0 = illimité)
+    LLM_BURST: int = 10  # Capacité du seau : appels pouvant partir sans attente
+    LLM_TIMEOUT_SECONDS: float = 30.0  # Timeout par appel
+
+    # File des résumés d'articles (traitée par le worker)
+    SUMMARY_QUEUE_POLL_SECONDS: int = 10  # Intervalle entre deux vidages de la file
+    SUMMARY_QUEUE_BATCH_SIZE: int = 16  # Jobs réservés et résumés ensemble
+    SUMMARY_QUEUE_MAX_ATTEMPTS: int = 3  # Au-delà, le job est marqué "failed"
+    SUMMARY_QUEUE_POPULARITY_HOURS: float = 6.0  # Une consultation compte comme N heures de fraîcheur
+    SUMMARY_QUEUE_STALE_MINUTES: int = 10  # Jobs "processing" remis en file après ce délai (worker arrêté)
+    SUMMARY_QUEUE_RETENTION_HOURS: int = 24  # Conservation des jobs terminés (mesure du débit)
+
+    # Pipeline d'ingestion en flux (fetch → nettoyage → dédoublonnage → embedding → écriture)
+    PIPELINE_QUEUE_SIZE: int = 8  # Lots en attente maximum entre deux étapes
+    PIPELINE_FETCH_WORKERS: int = 4  # Couples (date, requête) récupérés simultanément
+    PIPELINE_CLEAN_WORKERS: int = 2
+    PIPELINE_EMBED_WORKERS: int = 4  # Lots encodés simultanément
+    PIPELINE_COMMIT_SIZE: int = 50  # Articles par transaction d'écriture
+
+    # Clustering
+    CLUSTER_WINDOW_SIZE: int = 200  # Articles récents clusterisés à chaque cycle d'ingestion
+    CLUSTER_SNAPSHOT_RETENTION: int = 24  # Nombre de snapshots conservés
+    CLUSTER_K_SELECTION: str = "ward"  # "ward", "minibatch" ou "exhaustive" (un KMeans complet par k)
+    CLUSTER_K_SAMPLE_SIZE: int = 1000  # Points utilisés pour choisir k ("ward" et "minibatch")
+    CLUSTER_K_PCA_COMPONENTS: int = 50  # Dimensions après PCA pour choisir k (0 = pas de PCA)
+    CLUSTERING_MODE: str = "batch"  # "batch" (KMeans à chaque cycle) ou "online" (clusters mis à jour à l'ingestion)
+    ONLINE_CLUSTER_DISTANCE_THRESHOLD: float = 0.15  # Distance cosinus au-delà de laquelle un nouveau cluster est ouvert
+    ONLINE_CLUSTER_MERGE_DISTANCE: float = 0.08  # Distance cosinus entre centroïdes en deçà de laquelle deux clusters fusionnent
+    ONLINE_CLUSTER_SPLIT_MIN_SIZE: int = 20  # Taille minimale d'un cluster pour être scindé
+    ONLINE_CLUSTER_SPLIT_SPREAD: float = 0.12  # Distance moyenne au centroïde au-delà de laquelle un cluster est scindé
+    ONLINE_CLUSTER_RETENTION_DAYS: int = 7  # Les clusters sans nouvel article depuis ce délai sont retirés
+    CLUSTER_REBALANCE_INTERVAL_MINUTES: int = 60
+    CLUSTER_SUMMARY_CACHE_ENABLED: bool = True
+    CLUSTER_SUMMARY_CACHE_TTL_HOURS: int = 72  # Au-delà, titre et résumé sont régénérés
+    CLUSTER_SUMMARY_CACHE_MAX_ENTRIES: int = 10000  # Au-delà, les entrées les moins récemment utilisées sont supprimées
+    EMBEDDING_STORE_ENABLED: bool = False  # Copie locale mappée en mémoire des embeddings récents
+    EMBEDDING_STORE_PATH: str = "data/embedding_store"  # Répertoire partagé par le worker (écriture) et l'API (lecture)
+    EMBEDDING_STORE_WINDOW_DAYS: int = 7  # Articles publiés depuis ce délai conservés dans le store
+
     class Config:
         env_file = ".env"  # Chargement des variables d'environnement depuis un fichier .env
 
@@ -1,15 +1,28 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional, Union, Type
+from typing import List, Optional, Union, Type, Set, Tuple, Dict
 from . import models, schemas
 from .models import Article
 from .utils.auth import get_password_hash, verify_password
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import unicodedata
+import base64
+import json
 from sqlalchemy.sql import text
-from .utils.openai import generate_embedding, generate_summary_async
+from .utils.embedding_cache import get_embeddings_cached
 from .models import Article as ArticleModel
-from bs4 import BeautifulSoup
-from sqlalchemy import desc
+from .utils.text_cleaning import clean_texts
+from .utils.near_duplicates import filter_near_duplicates, save_signatures
+from .utils.online_clustering import assign_articles
+from .utils.embedding_store import get_embedding_store
+from .utils.vector_search import BruteForceVectorIndex, vector_index_cache
+from .config import settings
+from sqlalchemy import and_, bindparam, case, cast, column, desc, exists, func, literal, literal_column, or_, select, update, values, Date, Integer, String
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased, defer
+from itertools import groupby
+from .database import dialect_insert
+import numpy as np
 
 def get_user_by_name(db: Session, user_name: str) -> Optional[models.User]:
     """
@@ -172,106 +185,1072 @@ def authenticate_user(db: Session, username: str, password: str) -> Union[models
 
 
 
-def search_articles_by_similarity(db: Session, query_embedding: list, limit: int = 20) -> List[Article]:
+def vector_distance(query_embedding: Union[list, np.ndarray], metric: str = settings.VECTOR_SEARCH_METRIC):
     """
-    Find articles by similarity to a given embedding.
+    Build the distance expression between the article embeddings and a query vector.
+
+    Parameters:
+        query_embedding (Union[list, np.ndarray]): The query vector.
+        metric (str): "l2" (`<->`) or "cosine" (`<=>`); must match the ANN index operator class.
+
+    Returns:
+        ColumnElement: The distance expression, to order by.
+
+    Raises:
+        ValueError: If the metric is unknown.
+    """
+    if metric == "l2":
+        return Article.embedding.l2_distance(query_embedding)
+    if metric == "cosine":
+        return Article.embedding.cosine_distance(query_embedding)
+    raise ValueError(f"Unknown vector metric: {metric}")
+
+def set_vector_search_options(
+    db: Session,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    iterative_scan: Optional[str] = None,
+) -> None:
+    """
+    Set the recall/speed knobs of the ANN index for the current transaction only
+    (`hnsw.ef_search` for HNSW, `ivfflat.probes` for IVFFlat). No-op outside PostgreSQL.
 
     Parameters:
         db (Session): The database session.
-        query_embedding (list): The embedding to compare with.
+        ef_search (Optional[int]): HNSW candidate list size (higher: better recall, slower).
+        probes (Optional[int]): Number of IVFFlat lists scanned (higher: better recall, slower).
+        iterative_scan (Optional[str]): "strict_order" or "relaxed_order" to keep scanning the
+            index until filtered queries get enough rows (pgvector >= 0.8; IVFFlat only
+            supports "relaxed_order").
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    options = [("hnsw.ef_search", str(int(ef_search)) if ef_search else None),
+               ("ivfflat.probes", str(int(probes)) if probes else None)]
+    if iterative_scan:
+        options.append(("hnsw.iterative_scan", iterative_scan))
+        if iterative_scan == "relaxed_order":
+            options.append(("ivfflat.iterative_scan", iterative_scan))
+    for name, value in options:
+        if value:
+            db.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+
+def article_search_filters(
+    published_from: Optional[datetime] = None,
+    published_to: Optional[datetime] = None,
+    subjects: Optional[List[str]] = None,
+) -> list:
+    """
+    Build the WHERE criteria restricting a search, applied inside the ranking queries.
+
+    Parameters:
+        published_from (Optional[datetime]): Earliest publication date (inclusive).
+        published_to (Optional[datetime]): Latest publication date (inclusive).
+        subjects (Optional[List[str]]): Subject names; articles linked to any of them match.
+
+    Returns:
+        list: The SQLAlchemy criteria (empty: no restriction).
+    """
+    criteria = []
+    if published_from is not None:
+        criteria.append(Article.published_at >= published_from)
+    if published_to is not None:
+        criteria.append(Article.published_at <= published_to)
+    if subjects:
+        criteria.append(Article.subjects.any(models.Subject.name.in_(subjects)))
+    return criteria
+
+def encode_search_cursor(position: dict) -> str:
+    """
+    Encode a search position ({"distance", "id"} after a vector page, {"offset"}
+    after a keyword or hybrid page) as an opaque URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by `encode_search_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid search cursor: {cursor}") from e
+    numbers = (int, float)
+    if not isinstance(position, dict) or not (
+        (isinstance(position.get("distance"), numbers) and isinstance(position.get("id"), int))
+        or (isinstance(position.get("offset"), int) and position["offset"] >= 0)
+    ):
+        raise ValueError(f"Invalid search cursor: {cursor}")
+    return position
+
+def search_articles_by_keywords(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    config: str = settings.TEXT_SEARCH_CONFIG,
+    filters: Optional[list] = None,
+    offset: int = 0,
+) -> List[Article]:
+    """
+    Find articles matching a keyword query. On PostgreSQL, uses the GIN-indexed
+    `search_vector` column (see `app.tasks.search_index create-text`) with web search
+    syntax ("quoted phrases", -exclusions, or) ranked by `ts_rank_cd`; elsewhere, falls
+    back to a case-insensitive match of every term in the title or raw text.
+
+    Parameters:
+        db (Session): The database session.
+        query (str): The keyword query.
         limit (int): The maximum number of articles to return.
+        config (str): PostgreSQL text search configuration, the one of the column.
+        filters (Optional[list]): Criteria from `article_search_filters`.
+        offset (int): Number of ranked articles to skip.
 
     Returns:
-        List[Article]: A list of similar articles.
+        List[Article]: The matching articles, best ranked first.
     """
-    query_embedding_pg = f"[{','.join(map(str, query_embedding))}]"
+    if db.get_bind().dialect.name == "postgresql":
+        search_vector = literal_column(f"{Article.__tablename__}.search_vector")
+        tsquery = func.websearch_to_tsquery(cast(config, REGCONFIG), query)
+        return (
+            db.query(Article)
+            .filter(search_vector.op("@@")(tsquery), *(filters or []))
+            .order_by(desc(func.ts_rank_cd(search_vector, tsquery)), desc(Article.published_at), Article.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+    terms = query.lower().split()
+    if not terms:
+        return []
     return (
         db.query(Article)
-        .order_by(Article.embedding.op("<->")(query_embedding_pg))
+        .filter(*(
+            or_(
+                func.lower(Article.title).contains(term, autoescape=True),
+                func.lower(Article.raw_text).contains(term, autoescape=True),
+            )
+            for term in terms
+        ), *(filters or []))
+        .order_by(desc(Article.published_at), Article.id)
+        .offset(offset)
         .limit(limit)
         .all()
     )
 
-def update_article_summary(db: Session, article_id: int, summary: str) -> Article:
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = settings.SEARCH_RRF_K) -> List[int]:
+    """
+    Fuse several rankings of article ids with reciprocal rank fusion: each id scores
+    the sum of 1 / (k + rank) over the rankings it appears in (rank starting at 1).
+
+    Parameters:
+        rankings (List[List[int]]): The rankings, best first.
+        k (int): Damping constant (higher: lower ranks weigh relatively more).
+
+    Returns:
+        List[int]: The fused ranking, ties kept in order of first appearance.
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, article_id in enumerate(ranking, start=1):
+            scores[article_id] = scores.get(article_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+def vector_search_backend(db: Session) -> str:
+    """
+    Resolve VECTOR_SEARCH_BACKEND for a session: "auto" means pgvector on PostgreSQL
+    and the in-process engine elsewhere (SQLite, tests).
+
+    Returns:
+        str: "pgvector" or "inprocess".
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    backend = settings.VECTOR_SEARCH_BACKEND
+    if backend == "auto":
+        return "pgvector" if db.get_bind().dialect.name == "postgresql" else "inprocess"
+    if backend not in ("pgvector", "inprocess"):
+        raise ValueError(f"Unknown vector search backend: {backend}")
+    return backend
+
+def get_inprocess_vector_index(db: Session, metric: str = settings.VECTOR_SEARCH_METRIC) -> BruteForceVectorIndex:
+    """
+    Return the process-wide in-process index, rebuilt when the embedded articles change
+    (count or id bounds of the source), over all articles or over the embedding store
+    window depending on VECTOR_SEARCH_INPROCESS_SOURCE.
+
+    Parameters:
+        db (Session): The database session.
+        metric (str): "l2" or "cosine".
+
+    Returns:
+        BruteForceVectorIndex: The index.
+
+    Raises:
+        ValueError: If the source is "store" and the embedding store is disabled.
+    """
+    options = dict(quantize=settings.VECTOR_SEARCH_QUANTIZE, rerank_factor=settings.VECTOR_SEARCH_RERANK_FACTOR)
+    if settings.VECTOR_SEARCH_INPROCESS_SOURCE == "store":
+        store = get_embedding_store()
+        if store is None:
+            raise ValueError("VECTOR_SEARCH_INPROCESS_SOURCE=store requires EMBEDDING_STORE_ENABLED")
+        ids, vectors = store.view()
+        key = ("store", metric, len(ids), int(ids[0]) if len(ids) else 0, int(ids[-1]) if len(ids) else 0)
+        return vector_index_cache.get(key, lambda: BruteForceVectorIndex(ids, vectors, metric, **options))
+
+    count, first_id, last_id = (
+        db.query(func.count(Article.id), func.min(Article.id), func.max(Article.id))
+        .filter(Article.embedding.isnot(None))
+        .one()
+    )
+    key = ("database", str(db.get_bind().url), metric, count, first_id, last_id)
+    return vector_index_cache.get(key, lambda: BruteForceVectorIndex(*load_embedding_matrix(db), metric, **options))
+
+def rank_articles_in_process(
+    db: Session,
+    query_embedding: Union[list, np.ndarray],
+    limit: int = 20,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+    filters: Optional[list] = None,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[Article, float]]:
     """
-    Update the summary of an article by its ID.
+    Same contract as `rank_articles_by_vector`, computed by the in-process engine:
+    the filters select the allowed ids in SQL, the ranking is a float32 matrix product.
+    """
+    index = get_inprocess_vector_index(db, metric)
+    mask = None
+    if filters:
+        allowed = np.fromiter((article_id for article_id, in db.query(Article.id).filter(*filters)), dtype=np.int64)
+        mask = np.isin(index.ids, allowed)
+    ids, distances = index.search(query_embedding, limit, mask=mask, after=after)
+    found = ids[0] >= 0
+    ranked = list(zip(ids[0][found].tolist(), distances[0][found].tolist()))
+    articles = {article.id: article for article in db.query(Article).filter(Article.id.in_([i for i, _ in ranked]))}
+    return [(articles[article_id], distance) for article_id, distance in ranked if article_id in articles]
+
+def rank_articles_by_vector(
+    db: Session,
+    query_embedding: Union[list, np.ndarray],
+    limit: int = 20,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+    filters: Optional[list] = None,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[Article, float]]:
+    """
+    Rank articles by distance to a query embedding in a single query, filters and
+    keyset position included, so that the ANN index can serve filtered pages. With the
+    in-process backend (VECTOR_SEARCH_BACKEND), delegates to `rank_articles_in_process`.
+
+    With filters or a position, PostgreSQL applies them to the rows the index returns:
+    an HNSW scan only yields `ef_search` candidates, so the scan is made iterative
+    (VECTOR_SEARCH_ITERATIVE_SCAN, pgvector >= 0.8) or, failing that, `ef_search` is
+    raised to VECTOR_SEARCH_FILTERED_EF_SEARCH.
 
     Parameters:
         db (Session): The database session.
-        article_id (int): The ID of the article to update.
-        summary (str): The new summary.
+        query_embedding (Union[list, np.ndarray]): The query vector.
+        limit (int): The maximum number of articles to return.
+        ef_search (Optional[int]): `hnsw.ef_search` for this query (default: VECTOR_SEARCH_EF_SEARCH).
+        probes (Optional[int]): `ivfflat.probes` for this query (default: VECTOR_SEARCH_PROBES).
+        metric (str): "l2" or "cosine".
+        filters (Optional[list]): Criteria from `article_search_filters`.
+        after (Optional[Tuple[float, int]]): (distance, id) of the last article of the previous page.
 
     Returns:
-        Article: The updated article object.
+        List[Tuple[Article, float]]: The articles and their distances, nearest first.
     """
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if article:
-        article.summary = summary
-        db.commit()
-        db.refresh(article)
-    return article
+    if vector_search_backend(db) == "inprocess":
+        return rank_articles_in_process(db, query_embedding, limit, metric, filters, after)
+
+    ef_search = ef_search or settings.VECTOR_SEARCH_EF_SEARCH
+    iterative_scan = None
+    if filters or after:
+        iterative_scan = settings.VECTOR_SEARCH_ITERATIVE_SCAN or None
+        if not iterative_scan:
+            ef_search = max(ef_search, settings.VECTOR_SEARCH_FILTERED_EF_SEARCH)
+    set_vector_search_options(db, ef_search, probes or settings.VECTOR_SEARCH_PROBES, iterative_scan)
 
-def add_articles_to_db(db: Session, articles_data: list):
+    distance = vector_distance(query_embedding, metric)
+    criteria = [Article.embedding.isnot(None), *(filters or [])]
+    if after is not None:
+        last_distance, last_id = after
+        criteria.append(or_(distance > last_distance, and_(distance == last_distance, Article.id > last_id)))
+    # Tri sur la seule distance (l'ordre que l'index sait produire) ; les égalités
+    # exactes de distance, rares, sont départagées par l'identifiant dans le curseur
+    return [
+        (article, float(article_distance))
+        for article, article_distance in (
+            db.query(Article, distance).filter(*criteria).order_by(distance).limit(limit).all()
+        )
+    ]
+
+def search_articles_by_similarity(
+    db: Session,
+    query_embedding: Union[list, np.ndarray],
+    limit: int = 20,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+    query_text: Optional[str] = None,
+    candidates: int = settings.SEARCH_FUSION_CANDIDATES,
+    filters: Optional[list] = None,
+    offset: int = 0,
+) -> List[Article]:
     """
-    Ajoute une liste d'articles à la base de données après vérification des doublons.
+    Find articles by similarity to a given embedding, through the ANN index if one
+    exists for the configured metric (see `app.tasks.search_index`). With `query_text`,
+    the vector ranking is fused with the full-text ranking of the same query
+    (reciprocal rank fusion), which helps short keyword queries such as names.
+
+    Parameters:
+        db (Session): The database session.
+        query_embedding (list): The embedding to compare with (list or float32 array).
+        limit (int): The maximum number of articles to return.
+        ef_search (Optional[int]): `hnsw.ef_search` for this query (default: VECTOR_SEARCH_EF_SEARCH).
+        probes (Optional[int]): `ivfflat.probes` for this query (default: VECTOR_SEARCH_PROBES).
+        metric (str): "l2" or "cosine".
+        query_text (Optional[str]): The query text, for hybrid search.
+        candidates (int): Number of results of each ranking fused in hybrid search.
+        filters (Optional[list]): Criteria from `article_search_filters`.
+        offset (int): Number of ranked articles to skip.
+
+    Returns:
+        List[Article]: A list of similar articles.
+    """
+    depth = offset + limit
+    vector_articles = [
+        article
+        for article, _ in rank_articles_by_vector(
+            db, query_embedding, max(depth, candidates) if query_text else depth,
+            ef_search=ef_search, probes=probes, metric=metric, filters=filters,
+        )
+    ]
+    if not query_text:
+        return vector_articles[offset:]
+
+    # Savepoint : sans colonne tsvector (index plein texte non créé), seul le classement vectoriel est utilisé
+    try:
+        with db.begin_nested():
+            keyword_articles = search_articles_by_keywords(db, query_text, max(depth, candidates), filters=filters)
+    except SQLAlchemyError as e:
+        print(f"[ERROR] Full-text search failed, using the vector ranking only: {e}")
+        return vector_articles[offset:depth]
+
+    articles = {article.id: article for article in vector_articles + keyword_articles}
+    fused = reciprocal_rank_fusion([
+        [article.id for article in vector_articles],
+        [article.id for article in keyword_articles],
+    ])
+    return [articles[article_id] for article_id in fused[offset:depth]]
+
+def search_articles(
+    db: Session,
+    query: str,
+    query_embedding: Optional[Union[list, np.ndarray]] = None,
+    mode: str = settings.SEARCH_MODE,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    filters: Optional[list] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> Tuple[List[Article], Optional[str]]:
+    """
+    Return one page of search results and the cursor of the next page. Vector pages
+    resume after the (distance, id) of the last article (keyset pagination, no rows
+    re-ranked); keyword and hybrid pages resume at an offset in the ranking.
+
+    Parameters:
+        db (Session): The database session.
+        query (str): The query text.
+        query_embedding (Optional[Union[list, np.ndarray]]): The query embedding (unused in "keyword" mode).
+        mode (str): "hybrid", "vector" or "keyword".
+        limit (int): Page size.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        filters (Optional[list]): Criteria from `article_search_filters`.
+        ef_search (Optional[int]): `hnsw.ef_search` for this query.
+        probes (Optional[int]): `ivfflat.probes` for this query.
+
+    Returns:
+        Tuple[List[Article], Optional[str]]: The page and the next cursor (None on the last page).
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the mode.
+    """
+    position = decode_search_cursor(cursor) if cursor else {}
+    if mode == "vector":
+        if "offset" in position:
+            raise ValueError("Cursor does not belong to a vector search")
+        after = (float(position["distance"]), int(position["id"])) if position else None
+        ranked = rank_articles_by_vector(
+            db, query_embedding, limit + 1, ef_search=ef_search, probes=probes, filters=filters, after=after
+        )
+        page = ranked[:limit]
+        next_cursor = (
+            encode_search_cursor({"distance": page[-1][1], "id": page[-1][0].id}) if len(ranked) > limit else None
+        )
+        return [article for article, _ in page], next_cursor
+
+    if position and "offset" not in position:
+        raise ValueError("Cursor does not belong to a keyword or hybrid search")
+    offset = position.get("offset", 0)
+    if mode == "keyword":
+        articles = search_articles_by_keywords(db, query, limit + 1, filters=filters, offset=offset)
+    else:
+        articles = search_articles_by_similarity(
+            db, query_embedding, limit + 1, ef_search=ef_search, probes=probes,
+            query_text=query, filters=filters, offset=offset,
+        )
+    next_cursor = encode_search_cursor({"offset": offset + limit}) if len(articles) > limit else None
+    return articles[:limit], next_cursor
+
+def load_embedding_matrix(
+    db: Session,
+    article_ids: Optional[List[int]] = None,
+    dimension: int = settings.EMBEDDING_DIMENSION,
+    chunk_size: int = 1000,
+) -> Tuple[List[int], np.ndarray]:
+    """
+    Load article embeddings straight into one preallocated float32 (N, dimension)
+    matrix, streaming the rows by chunks instead of materializing one object per article.
+
+    Parameters:
+        db (Session): The database session.
+        article_ids (Optional[List[int]]): The articles to load; all articles if None.
+        dimension (int): The embedding dimension.
+        chunk_size (int): The number of rows fetched per round trip.
+
+    Returns:
+        Tuple[List[int], np.ndarray]: The ids of the articles that have an embedding,
+        by ascending id, and the matching rows of the matrix.
+    """
+    query = db.query(Article.id, Article.embedding).filter(Article.embedding.isnot(None))
+    if article_ids is not None:
+        article_ids = list(article_ids)
+        capacity = len(article_ids)
+        query = query.filter(Article.id.in_(article_ids))
+    else:
+        capacity = db.query(func.count(Article.id)).filter(Article.embedding.isnot(None)).scalar()
+
+    matrix = np.empty((capacity, dimension), dtype=np.float32)
+    ids: List[int] = []
+    for article_id, embedding in query.order_by(Article.id).yield_per(chunk_size):
+        # Articles insérés entre le comptage et la lecture
+        if len(ids) == capacity:
+            break
+        matrix[len(ids)] = embedding
+        ids.append(article_id)
+    return ids, matrix[:len(ids)]
+
+def update_article_summaries(db: Session, summaries: Dict[int, str], chunk_size: int = 1000) -> int:
+    """
+    Write back a batch of generated summaries with set-based updates, without loading
+    or refreshing the articles. On PostgreSQL each chunk is a single
+    `UPDATE articles SET summary = v.summary FROM (VALUES ...) AS v (id, summary) WHERE articles.id = v.id`;
+    other databases fall back to one executemany UPDATE. Does not commit: the caller
+    commits once, with the rest of its transaction.
+
+    Parameters:
+        db (Session): The database session.
+        summaries (Dict[int, str]): The new summary of each article, by article ID.
+        chunk_size (int): The number of rows per statement.
+
+    Returns:
+        int: The number of articles updated.
+    """
+    rows = list(summaries.items())
+    if not rows:
+        return 0
+    articles = Article.__table__
+    updated = 0
+    if db.get_bind().dialect.name == "postgresql":
+        for start in range(0, len(rows), chunk_size):
+            new_values = values(
+                column('id', Integer), column('summary', String), name='new_summaries'
+            ).data(rows[start:start + chunk_size])
+            updated += db.execute(
+                update(articles).where(articles.c.id == new_values.c.id).values(summary=new_values.c.summary)
+            ).rowcount
+    else:
+        updated = db.execute(
+            update(articles).where(articles.c.id == bindparam('article_id')).values(summary=bindparam('new_summary')),
+            [{'article_id': article_id, 'new_summary': summary} for article_id, summary in rows],
+        ).rowcount
+    return updated
+
+def get_existing_urls(db: Session, urls: List[str]) -> Set[str]:
+    """
+    Return the subset of the given URLs already stored, in a single query.
+
+    Parameters:
+        db (Session): The database session.
+        urls (List[str]): The candidate URLs.
+
+    Returns:
+        Set[str]: The URLs that already exist in the articles table.
+    """
+    if not urls:
+        return set()
+    rows = db.query(Article.url).filter(Article.url.in_(set(urls))).all()
+    return {row.url for row in rows}
+
+def filter_new_articles(db: Session, articles: list) -> list:
+    """
+    Retire les articles dont l'URL existe déjà en base ou apparaît plusieurs fois dans le lot.
 
     Parameters:
         db (Session): La session de base de données.
-        articles_data (list): La liste des articles à ajouter.
-        target_date (str): La date des articles ajoutés (pour le log).
+        articles (list): Les articles candidats.
+
+    Returns:
+        list: Les articles à insérer, dans l'ordre d'origine.
+    """
+    existing_urls = get_existing_urls(db, [article['url'] for article in articles])
+    new_articles = []
+    for article in articles:
+        if article['url'] in existing_urls:
+            print(f"[INFO] Article déjà existant : {article['title']}")
+            continue
+        existing_urls.add(article['url'])
+        new_articles.append(article)
+    return new_articles
+
+def insert_articles(db: Session, rows: List[dict]) -> List[Tuple[int, str]]:
+    """
+    Insère un lot d'articles en une seule requête, en ignorant les URLs déjà présentes
+    (`INSERT ... ON CONFLICT (url) DO NOTHING`).
+
+    Parameters:
+        db (Session): La session de base de données.
+        rows (List[dict]): Les colonnes des articles à insérer.
 
     Returns:
-        None
+        List[Tuple[int, str]]: Les couples (id, url) des articles effectivement insérés.
+    """
+    if not rows:
+        return []
+    stmt = dialect_insert(db)(Article).values(rows).on_conflict_do_nothing(index_elements=["url"])
+    result = db.execute(stmt.returning(Article.id, Article.url))
+    return [(row.id, row.url) for row in result]
+
+def prepare_articles(articles_data: list) -> list:
     """
+    Écarte les articles sans titre ou sans contenu et nettoie le HTML de leur texte.
+
+    Parameters:
+        articles_data (list): Les articles bruts.
 
+    Returns:
+        list: Les articles valides, texte nettoyé dans 'raw_text'.
+    """
     valid_articles = [
         item for item in articles_data
         if item.get('title') and item['title'] != "[Removed]" and item.get('raw_text')
     ]
 
-    for item in valid_articles:
-        item['raw_text'] = BeautifulSoup(item['raw_text'], "html.parser").get_text()[:1000]
+    cleaned_texts = clean_texts([item['raw_text'] for item in valid_articles])
+    for item, cleaned_text in zip(valid_articles, cleaned_texts):
+        item['raw_text'] = cleaned_text
+    return valid_articles
 
-    for article in valid_articles:
-        # Vérifier si l'article existe déjà via son URL
-        existing_article = db.query(Article).filter(Article.url == article['url']).first()
-        if existing_article:
-            print(f"[INFO] Article déjà existant : {article['title']}")
-            continue
+def deduplicate_articles(db: Session, articles: list, near_duplicate_index: Optional[dict] = None) -> Tuple[list, int]:
+    """
+    Écarte les articles dont l'URL est déjà connue puis, si activé, les quasi-doublons.
 
-        # Générer un embedding pour le contenu brut
-        embedding = generate_embedding(article['raw_text'])
-
-        # Créer et insérer l'article
-        new_article = Article(
-            title=article['title'],
-            raw_text=article['raw_text'],
-            summary=article.get('summary'),  # Peut être vide si pas fourni
-            published_at=article['published_at'],
-            url=article['url'],
-            embedding=embedding
-        )
-        db.add(new_article)
+    Parameters:
+        db (Session): La session de base de données.
+        articles (list): Les articles préparés.
+        near_duplicate_index (Optional[dict]): Index des SimHash déjà acceptés, partagé entre
+            plusieurs appels (voir `filter_near_duplicates`).
+
+    Returns:
+        Tuple[list, int]: Les articles à insérer et le nombre de quasi-doublons écartés.
+    """
+    # Une seule requête pour écarter les URLs déjà connues
+    new_articles = filter_new_articles(db, articles)
+
+    # Écarter les quasi-doublons (dépêches reprises sous une autre URL) avant l'embedding
+    near_duplicates = []
+    if settings.NEAR_DUPLICATE_ENABLED:
+        new_articles, near_duplicates = filter_near_duplicates(db, new_articles, index=near_duplicate_index)
+        for article, canonical_id in near_duplicates:
+            print(f"[INFO] Quasi-doublon ignoré : {article['title']} (article canonique : {canonical_id})")
+    return new_articles, len(near_duplicates)
+
+def write_articles(
+    db: Session,
+    articles: list,
+    embeddings: List[list],
+    assign_clusters: bool = True,
+) -> List[Tuple[int, str]]:
+    """
+    Insère les articles et leurs embeddings (et leurs signatures SimHash), les affecte à
+    leur cluster en ligne si CLUSTERING_MODE vaut "online", puis valide.
+
+    Parameters:
+        db (Session): La session de base de données.
+        articles (list): Les articles dédupliqués.
+        embeddings (List[list]): Les embeddings, dans le même ordre.
+        assign_clusters (bool): Affecter les articles à leur cluster en ligne ; False quand
+            plusieurs écritures tournent en parallèle (l'affectation est alors faite après coup).
+
+    Returns:
+        List[Tuple[int, str]]: Les couples (id, url) des articles insérés.
+    """
+    rows = [
+        {
+            'title': article['title'],
+            'raw_text': article['raw_text'],
+            'summary': article.get('summary'),  # Peut être vide si pas fourni
+            'published_at': article['published_at'],
+            'url': article['url'],
+            'embedding': embedding,
+        }
+        for article, embedding in zip(articles, embeddings)
+    ]
+    inserted = insert_articles(db, rows)
+    simhashes = {article['url']: article['simhash'] for article in articles if 'simhash' in article}
+    save_signatures(db, [(article_id, simhashes[url]) for article_id, url in inserted if url in simhashes])
+    if assign_clusters and settings.CLUSTERING_MODE == "online":
+        # Affectation au cluster en ligne le plus proche, dans la même transaction
+        embeddings_by_url = {article['url']: embedding for article, embedding in zip(articles, embeddings)}
+        assign_articles(db, [(article_id, embeddings_by_url[url]) for article_id, url in inserted])
+    db.commit()
+    return inserted
+
+def add_articles_to_db(db: Session, articles_data: list, assign_clusters: bool = True) -> Dict[str, int]:
+    """
+    Ajoute une liste d'articles à la base de données après vérification des doublons.
+
+    Parameters:
+        db (Session): La session de base de données.
+        articles_data (list): La liste des articles à ajouter.
+        assign_clusters (bool): Affecter les articles à leur cluster en ligne (voir `write_articles`).
+
+    Returns:
+        Dict[str, int]: Le nombre d'articles insérés ("inserted"), ignorés ("skipped")
+            et, parmi ces derniers, les quasi-doublons ("near_duplicates").
+    """
+    valid_articles = prepare_articles(articles_data)
+    new_articles, near_duplicates = deduplicate_articles(db, valid_articles)
+
+    # Générer les embeddings de tous les nouveaux articles en appels groupés,
+    # en réutilisant ceux des textes déjà vus (articles syndiqués)
+    embeddings = get_embeddings_cached(db, [article['raw_text'] for article in new_articles])
+
+    inserted = write_articles(db, new_articles, embeddings, assign_clusters)
+
+    return {
+        "inserted": len(inserted),
+        "skipped": len(articles_data) - len(inserted),
+        "near_duplicates": near_duplicates,
+    }
+
+def seed_ingestion_coverage(db: Session) -> int:
+    """
+    Initialise la table de couverture à partir des articles existants, si elle est vide.
+
+    Une seule requête agrégée (dates et comptes uniquement) est exécutée, sans charger
+    le contenu des articles.
+
+    Parameters:
+        db (Session): La session de base de données.
+
+    Returns:
+        int: Le nombre de dates ajoutées.
+    """
+    if db.query(models.IngestionCoverage.date).first() is not None:
+        return 0
+    published_date = func.date(Article.published_at, type_=Date)
+    rows = db.query(published_date, func.count(Article.id)).group_by(published_date).all()
+    now = datetime.utcnow()
+    db.add_all([
+        models.IngestionCoverage(date=covered_date, article_count=count, ingested_at=now)
+        for covered_date, count in rows
+    ])
+    db.commit()
+    return len(rows)
+
+def get_next_uncovered_date(db: Session, start_date: date) -> date:
+    """
+    Retourne la date la plus récente, à partir de `start_date` et en remontant le temps,
+    qui n'a pas encore été ingérée.
+
+    Parameters:
+        db (Session): La session de base de données.
+        start_date (date): La date de départ.
+
+    Returns:
+        date: La prochaine date à récupérer.
+    """
+    coverage = models.IngestionCoverage
+    earlier = aliased(models.IngestionCoverage)
+    if db.get_bind().dialect.name == "postgresql":
+        previous_day = coverage.date - 1
+    else:
+        # SQLite stocke les dates en texte ISO
+        previous_day = func.date(coverage.date, '-1 day', type_=Date)
+    # Veille de la date couverte la plus récente dont la veille ne l'est pas : la fin de
+    # la plage continue de dates couvertes qui se termine à `start_date`
+    gap = (
+        select(func.max(previous_day))
+        .where(coverage.date <= start_date, ~exists().where(earlier.date == previous_day))
+        .scalar_subquery()
+    )
+    start_covered = exists().where(coverage.date == start_date)
+    return db.scalar(select(case((start_covered, gap), else_=literal(start_date, Date))))
+
+def mark_date_covered(db: Session, covered_date: date, article_count: int) -> models.IngestionCoverage:
+    """
+    Enregistre qu'une date a été ingérée.
+
+    Parameters:
+        db (Session): La session de base de données.
+        covered_date (date): La date traitée.
+        article_count (int): Le nombre d'articles insérés pour cette date.
 
+    Returns:
+        models.IngestionCoverage: La ligne de couverture.
+    """
+    coverage = db.merge(models.IngestionCoverage(
+        date=covered_date, article_count=article_count, ingested_at=datetime.utcnow()
+    ))
     db.commit()
+    return coverage
 
-def get_latest_articles(db: Session, limit: int = 20):
+def get_latest_articles(db: Session, skip: int = 0, limit: int = 20, with_embeddings: bool = True) -> List[Article]:
     """
     Récupère les articles les plus récents depuis la base de données.
 
     Parameters:
         db (Session): La session de base de données.
+        skip (int): Le nombre d'articles à ignorer (pagination).
         limit (int): Le nombre maximum d'articles à récupérer.
+        with_embeddings (bool): Charger les embeddings (sinon chargés à la demande).
 
     Returns:
         List[Article]: Liste des articles les plus récents.
     """
-    return db.query(Article).order_by(desc(Article.published_at)).limit(limit).all()
+    query = db.query(Article)
+    if not with_embeddings:
+        query = query.options(defer(Article.embedding))
+    return query.order_by(desc(Article.published_at)).offset(skip).limit(limit).all()
+
+def get_articles_by_ids(db: Session, article_ids: List[int], filters: Optional[list] = None) -> List[Article]:
+    """
+    Récupère des articles par identifiant, dans l'ordre des identifiants donnés.
+
+    Parameters:
+        db (Session): La session de base de données.
+        article_ids (List[int]): Les identifiants des articles.
+        filters (Optional[list]): Critères supplémentaires (voir `article_search_filters`).
+
+    Returns:
+        List[Article]: Les articles trouvés, dans l'ordre de `article_ids`.
+    """
+    if not article_ids:
+        return []
+    articles = {
+        article.id: article
+        for article in db.query(Article).options(defer(Article.embedding))
+        .filter(Article.id.in_(article_ids), *(filters or []))
+    }
+    return [articles[article_id] for article_id in article_ids if article_id in articles]
+
+def get_related_articles(
+    db: Session,
+    article_id: int,
+    limit: int = 10,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+) -> Optional[List[Article]]:
+    """
+    Récupère les articles les plus proches d'un article : dans le store local d'embeddings
+    s'il contient l'article (distance L2 uniquement), sinon par une recherche vectorielle
+    (pgvector ou moteur en mémoire selon VECTOR_SEARCH_BACKEND).
 
-async def update_article_if_needed(db: Session, article: ArticleModel):
-        if not article.summary:
-            # Génération asynchrone du résumé pour les articles sans résumé
-            new_summary = await generate_summary_async(article.raw_text)
-            return update_article_summary(db, article.id, new_summary)
-        return article
-    
\ No newline at end of file
+    Parameters:
+        db (Session): La session de base de données.
+        article_id (int): L'article de référence.
+        limit (int): Le nombre maximum d'articles à récupérer.
+        metric (str): "l2" ou "cosine", la distance de l'index vectoriel.
+
+    Returns:
+        Optional[List[Article]]: Les articles proches, du plus proche au plus éloigné, ou
+            None si l'article n'existe pas.
+    """
+    store = get_embedding_store()
+    # Le store ne calcule que des distances L2
+    related_ids = store.related(article_id, limit) if store is not None and metric == "l2" else None
+    if related_ids is not None:
+        return get_articles_by_ids(db, related_ids)
+    article = get_article_by_id(db, article_id)
+    if article is None:
+        return None
+    if article.embedding is None:
+        return []
+    ranked = rank_articles_by_vector(db, article.embedding, limit, metric=metric, filters=[Article.id != article_id])
+    return [related for related, _ in ranked]
+
+def create_cluster_snapshot(db: Session, clusters: List[dict], article_count: int) -> models.ClusterSnapshot:
+    """
+    Enregistre une nouvelle version du clustering des articles récents.
+
+    Parameters:
+        db (Session): La session de base de données.
+        clusters (List[dict]): Les clusters par importance décroissante, chacun avec
+            "cluster_id", "title", "summary" et "article_ids".
+        article_count (int): Le nombre d'articles clusterisés.
+
+    Returns:
+        models.ClusterSnapshot: Le snapshot créé.
+    """
+    snapshot = models.ClusterSnapshot(created_at=datetime.utcnow(), article_count=article_count)
+    snapshot.clusters = [
+        models.SnapshotCluster(
+            cluster_id=int(cluster["cluster_id"]),
+            position=position,
+            title=cluster["title"],
+            summary=cluster["summary"],
+        )
+        for position, cluster in enumerate(clusters)
+    ]
+    db.add(snapshot)
+    db.flush()
+    rows = [
+        {"snapshot_id": snapshot.id, "cluster_id": int(cluster["cluster_id"]), "article_id": int(article_id)}
+        for cluster in clusters
+        for article_id in cluster["article_ids"]
+    ]
+    if rows:
+        db.execute(models.snapshot_cluster_articles.insert(), rows)
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot
+
+def get_latest_cluster_snapshot(db: Session) -> Optional[List[Tuple[models.SnapshotCluster, List[Article]]]]:
+    """
+    Récupère les clusters du snapshot le plus récent et leurs articles, en une seule requête.
+
+    Parameters:
+        db (Session): La session de base de données.
+
+    Returns:
+        Optional[List[Tuple[models.SnapshotCluster, List[Article]]]]: Les clusters par importance
+            décroissante avec leurs articles (du plus récent au plus ancien), ou None si aucun
+            snapshot n'a encore été calculé.
+    """
+    links = models.snapshot_cluster_articles
+    latest_id = db.query(func.max(models.ClusterSnapshot.id)).scalar_subquery()
+    rows = (
+        db.query(models.SnapshotCluster, Article)
+        .join(links, and_(
+            links.c.snapshot_id == models.SnapshotCluster.snapshot_id,
+            links.c.cluster_id == models.SnapshotCluster.cluster_id,
+        ))
+        .join(Article, Article.id == links.c.article_id)
+        .filter(models.SnapshotCluster.snapshot_id == latest_id)
+        .options(defer(Article.embedding))
+        .order_by(models.SnapshotCluster.position, desc(Article.published_at))
+        .all()
+    )
+    if not rows:
+        # Snapshot vide (trop peu d'articles) ou aucun snapshot
+        return [] if db.query(models.ClusterSnapshot.id).first() is not None else None
+    return [
+        (cluster, [article for _, article in group])
+        for cluster, group in groupby(rows, key=lambda row: row[0])
+    ]
+
+def prune_cluster_snapshots(db: Session, keep: int = settings.CLUSTER_SNAPSHOT_RETENTION) -> int:
+    """
+    Supprime les snapshots les plus anciens pour n'en conserver que `keep`.
+
+    Parameters:
+        db (Session): La session de base de données.
+        keep (int): Le nombre de snapshots à conserver.
+
+    Returns:
+        int: Le nombre de snapshots supprimés.
+    """
+    kept_ids = db.query(models.ClusterSnapshot.id).order_by(desc(models.ClusterSnapshot.id)).limit(keep).subquery()
+    stale_ids = [
+        snapshot_id for (snapshot_id,) in
+        db.query(models.ClusterSnapshot.id).filter(models.ClusterSnapshot.id.notin_(db.query(kept_ids.c.id)))
+    ]
+    if stale_ids:
+        # Suppression explicite des lignes filles : SQLite n'applique pas les ON DELETE CASCADE par défaut
+        links = models.snapshot_cluster_articles
+        db.execute(links.delete().where(links.c.snapshot_id.in_(stale_ids)))
+        db.query(models.SnapshotCluster).filter(models.SnapshotCluster.snapshot_id.in_(stale_ids)).delete(synchronize_session=False)
+        db.query(models.ClusterSnapshot).filter(models.ClusterSnapshot.id.in_(stale_ids)).delete(synchronize_session=False)
+        db.commit()
+    return len(stale_ids)
+
+def summary_priority(published_at: datetime) -> float:
+    """
+    Priorité de base d'un job de résumé : la date de publication, en heures.
+    """
+    return (published_at - datetime(1970, 1, 1)).total_seconds() / 3600
+
+def enqueue_summary_jobs(
+    db: Session,
+    articles: List[ArticleModel],
+    popularity_hours: float = settings.SUMMARY_QUEUE_POPULARITY_HOURS,
+) -> int:
+    """
+    Met en file la génération du résumé des articles qui n'en ont pas, sans attendre le
+    LLM. Un article déjà en file gagne en priorité à chaque nouvelle consultation.
+
+    Les jobs sont seulement envoyés (flush) : l'appelant valide la transaction une fois
+    la réponse construite, pour ne pas expirer les articles qu'il vient de charger.
+
+    Parameters:
+        db (Session): La session de base de données.
+        articles (List[Article]): Les articles consultés.
+        popularity_hours (float): Gain de priorité par consultation (en heures de fraîcheur).
+
+    Returns:
+        int: Le nombre d'articles sans résumé mis en file ou dont la priorité a augmenté.
+    """
+    now = datetime.utcnow()
+    rows = {
+        article.id: {
+            'article_id': article.id,
+            'status': 'pending',
+            'priority': summary_priority(article.published_at),
+            'requests': 1,
+            'attempts': 0,
+            'created_at': now,
+            'updated_at': now,
+        }
+        for article in articles
+        if not article.summary
+    }
+    if not rows:
+        return 0
+    jobs = models.SummaryJob.__table__
+    statement = dialect_insert(db)(models.SummaryJob).values(list(rows.values()))
+    db.execute(statement.on_conflict_do_update(
+        index_elements=['article_id'],
+        set_={'requests': jobs.c.requests + 1, 'priority': jobs.c.priority + popularity_hours},
+    ))
+    db.flush()
+    return len(rows)
+
+def claim_summary_jobs(
+    db: Session,
+    limit: int = settings.SUMMARY_QUEUE_BATCH_SIZE,
+    stale_minutes: int = settings.SUMMARY_QUEUE_STALE_MINUTES,
+) -> List[int]:
+    """
+    Réserve les jobs en attente les plus prioritaires (sans bloquer les autres workers
+    sur PostgreSQL) et remet en file ceux abandonnés par un worker arrêté.
+
+    Parameters:
+        db (Session): La session de base de données.
+        limit (int): Nombre maximal de jobs réservés.
+        stale_minutes (int): Délai au-delà duquel un job "processing" est considéré abandonné.
+
+    Returns:
+        List[int]: Les identifiants des articles à résumer.
+    """
+    now = datetime.utcnow()
+    job = models.SummaryJob
+    db.query(job).filter(
+        job.status == 'processing', job.updated_at < now - timedelta(minutes=stale_minutes)
+    ).update({job.status: 'pending'}, synchronize_session=False)
+    jobs = (
+        db.query(job)
+        .filter(job.status == 'pending')
+        .order_by(job.priority.desc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for claimed in jobs:
+        claimed.status = 'processing'
+        claimed.attempts += 1
+        claimed.updated_at = now
+    db.commit()
+    return [claimed.article_id for claimed in jobs]
+
+def complete_summary_jobs(
+    db: Session,
+    summaries: Dict[int, str],
+    failed: List[int],
+    max_attempts: int = settings.SUMMARY_QUEUE_MAX_ATTEMPTS,
+) -> None:
+    """
+    Enregistre le résultat d'un lot de jobs en une transaction : résumés générés, jobs
+    terminés, et jobs en échec remis en file (ou abandonnés après `max_attempts` tentatives).
+
+    Parameters:
+        db (Session): La session de base de données.
+        summaries (Dict[int, str]): Le résumé généré de chaque article.
+        failed (List[int]): Les articles dont la génération a échoué.
+        max_attempts (int): Nombre maximal de tentatives par job.
+    """
+    now = datetime.utcnow()
+    job = models.SummaryJob
+    update_article_summaries(db, summaries)
+    if summaries:
+        db.query(job).filter(job.article_id.in_(summaries)).update(
+            {job.status: 'done', job.updated_at: now, job.completed_at: now}, synchronize_session=False
+        )
+    if failed:
+        db.query(job).filter(job.article_id.in_(failed), job.attempts >= max_attempts).update(
+            {job.status: 'failed', job.updated_at: now, job.completed_at: now}, synchronize_session=False
+        )
+        db.query(job).filter(job.article_id.in_(failed), job.attempts < max_attempts).update(
+            {job.status: 'pending', job.updated_at: now}, synchronize_session=False
+        )
+    db.commit()
+
+def prune_summary_jobs(db: Session, retention_hours: int = settings.SUMMARY_QUEUE_RETENTION_HOURS) -> int:
+    """
+    Supprime les jobs terminés ou abandonnés au-delà de la durée de conservation.
+
+    Parameters:
+        db (Session): La session de base de données.
+        retention_hours (int): Conservation des jobs terminés (heures).
+
+    Returns:
+        int: Le nombre de jobs supprimés.
+    """
+    job = models.SummaryJob
+    deleted = db.query(job).filter(
+        job.status.in_(['done', 'failed']), job.completed_at < datetime.utcnow() - timedelta(hours=retention_hours)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def get_summary_queue_stats(db: Session, window_minutes: int = 60) -> Dict[str, float]:
+    """
+    Mesure la file des résumés (lisible depuis n'importe quel processus), en lecture seule.
+
+    Parameters:
+        db (Session): La session de base de données.
+        window_minutes (int): Fenêtre de mesure du débit (minutes).
+
+    Returns:
+        Dict[str, float]: Le nombre de jobs par état ("pending", "processing", "done",
+            "failed"), les jobs terminés dans la fenêtre ("completed") et le débit
+            ("per_minute").
+    """
+    now = datetime.utcnow()
+    job = models.SummaryJob
+    stats: Dict[str, float] = {'pending': 0, 'processing': 0, 'done': 0, 'failed': 0}
+    stats.update(dict(db.query(job.status, func.count(job.article_id)).group_by(job.status).all()))
+    completed = (
+        db.query(func.count(job.article_id))
+        .filter(job.status == 'done', job.completed_at >= now - timedelta(minutes=window_minutes))
+        .scalar()
+    )
+    stats['completed'] = completed
+    stats['per_minute'] = completed / window_minutes
+    return stats
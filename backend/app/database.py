@@ -19,3 +19,27 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def dialect_insert(db):
+    """
+    Return the dialect-specific `insert` construct of the session's database, which
+    supports `on_conflict_do_nothing` on PostgreSQL and SQLite.
+
+    Parameters:
+        db (Session): The database session.
+
+    Returns:
+        Callable: The `insert` function of the matching SQLAlchemy dialect.
+
+    Raises:
+        NotImplementedError: If the dialect has no upsert support.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Insertion groupée non supportée pour le dialecte {dialect}")
+    return insert
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from .routers.news import router as news_router
 from .routers.users import router as users_router
 from .routers.subjects import router as subjects_router
-from .tasks.background_tasks import start_scheduler
+from .config import settings
 
 import sys
 import os
@@ -17,7 +17,11 @@ app = FastAPI(
     version="1.0.0"
 )
 
-start_scheduler()
+# L'ingestion tourne dans le worker dédié (python -m app.worker), élu par verrou
+# consultatif : les workers web ne démarrent pas de scheduler sauf configuration explicite.
+if settings.RUN_SCHEDULER_IN_WEB:
+    from .tasks.background_tasks import start_scheduler
+    start_scheduler()
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,61 +1,113 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from .. import schemas, crud
 from ..dependencies import get_db
 import asyncio
-from ..crud import update_article_if_needed
 from app.schemas import Article as ArticleSchema
-from ..clustering import workflow_query_cluster_and_summarize
+from ..clustering import refresh_cluster_snapshot
 
 router = APIRouter()
 
+# Un seul calcul à la demande à la fois : les requêtes concurrentes attendent son résultat
+_snapshot_lock = asyncio.Lock()
+
+async def compute_snapshot_on_demand(db: Session):
+    """
+    Calcule le premier snapshot de clusters si aucun n'existe, puis le relit.
+    """
+    async with _snapshot_lock:
+        snapshot = crud.get_latest_cluster_snapshot(db)
+        if snapshot is None:
+            await refresh_cluster_snapshot(db)
+            snapshot = crud.get_latest_cluster_snapshot(db)
+    return snapshot or []
+
 @router.get("/", response_model=schemas.NewsResponse)
 async def read_news(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)) -> schemas.NewsResponse:
     """
     Retrieve a list of recent news articles and their clusters.
     """
     try:
-        articles = crud.get_latest_articles(db, skip=skip, limit=limit)
+        # Les embeddings ne servent pas à la réponse (clusters lus depuis le snapshot)
+        articles = crud.get_latest_articles(db, skip=skip, limit=limit, with_embeddings=False)
     except Exception as e:
         print(f"[ERROR] Failed to fetch latest articles: {e}")
         return schemas.NewsResponse(articles=[], clusters=[])
     
     try:
-        # Mettre à jour les résumés manquants en parallèle
-        updated_articles = await asyncio.gather(
-            *(crud.update_article_if_needed(db, article) for article in articles)
-        )
+        # Résumés manquants générés en arrière-plan : la réponse n'attend pas le LLM
+        # (savepoint : un échec n'annule ni n'expire les articles chargés)
+        with db.begin_nested():
+            crud.enqueue_summary_jobs(db, articles)
     except Exception as e:
-        print(f"[ERROR] Failed to update article summaries: {e}")
-        updated_articles = articles  # Revenir aux articles non mis à jour
+        print(f"[ERROR] Failed to enqueue article summaries: {e}")
 
     try:
-        # Effectuer le clustering et générer les résumés/titres des clusters en thread séparé
-        cluster_summaries = await asyncio.to_thread(workflow_query_cluster_and_summarize, updated_articles)
+        # Clusters précalculés une fois par cycle d'ingestion ; calcul à la demande
+        # uniquement si aucun snapshot n'existe encore (base fraîchement initialisée)
+        snapshot = crud.get_latest_cluster_snapshot(db)
+        if snapshot is None:
+            snapshot = await compute_snapshot_on_demand(db)
     except Exception as e:
-        print(f"[ERROR] Failed to perform clustering and summarization: {e}")
-        cluster_summaries = {}
-    
+        print(f"[ERROR] Failed to load cluster snapshot: {e}")
+        snapshot = []
+
     # Préparer la réponse
-    clusters_json = []
-    for cluster_id, info in cluster_summaries.items():
-        # Convertir les articles du cluster en instances de schéma Pydantic
-        cluster_articles = [
-            schemas.Article(**article) for article in info.get("articles", [])
-        ]
-        clusters_json.append(
-            schemas.ClusterSummary(
-                cluster_id=cluster_id,
-                title=info.get("title", f"Cluster {cluster_id}"),
-                summary=info.get("summary", "No summary available."),
-                articles=cluster_articles
-            )
+    clusters_json = [
+        schemas.ClusterSummary(
+            cluster_id=cluster.cluster_id,
+            title=cluster.title,
+            summary=cluster.summary,
+            articles=cluster_articles,
         )
-    
+        for cluster, cluster_articles in snapshot
+    ]
+
     response = schemas.NewsResponse(
-        articles=updated_articles,
+        articles=articles,
         clusters=clusters_json
     )
-    
-    return response
\ No newline at end of file
+
+    # Validation unique, une fois la réponse construite : les jobs de résumé mis en file
+    try:
+        db.commit()
+    except Exception as e:
+        print(f"[ERROR] Failed to commit article summary jobs: {e}")
+        db.rollback()
+    return response
+
+@router.get("/summary-queue", response_model=schemas.SummaryQueueStats)
+def read_summary_queue(db: Session = Depends(get_db)) -> schemas.SummaryQueueStats:
+    """
+    Report the depth and throughput of the background article summary queue.
+
+    Parameters:
+        db (Session): The database session dependency.
+
+    Returns:
+        schemas.SummaryQueueStats: The number of jobs per state and the summaries completed over the last hour.
+    """
+    return schemas.SummaryQueueStats(**crud.get_summary_queue_stats(db))
+
+@router.get("/{article_id}/related", response_model=List[schemas.Article])
+def read_related_news(article_id: int, limit: int = 10, db: Session = Depends(get_db)) -> List[schemas.Article]:
+    """
+    Retrieve the articles closest to a given article (local embedding store, or pgvector
+    for articles outside the store's window).
+
+    Parameters:
+        article_id (int): The ID of the reference article.
+        limit (int): The maximum number of articles to return.
+        db (Session): The database session dependency.
+
+    Returns:
+        List[schemas.Article]: The related articles, closest first.
+
+    Raises:
+        HTTPException: If the article is not found.
+    """
+    related = crud.get_related_articles(db, article_id, limit=limit)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Article non trouvé")
+    return related
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from .. import schemas, crud
+from ..config import settings
 from ..dependencies import get_db
-from ..utils.openai import generate_embedding
-from ..crud import search_articles_by_similarity, update_article_if_needed
+from ..utils.embedding_cache import query_embedding_cache
+from ..utils.embedding_store import get_embedding_store
+from ..crud import search_articles_by_similarity
 from ..clustering import workflow_query_cluster_and_summarize
 from app.schemas import Article as ArticleSchema
-import asyncio
 
 
 router = APIRouter()
@@ -58,28 +61,75 @@ def get_followed_subjects(user_name: str, db: Session = Depends(get_db)) -> List
     return user.liked_subjects
 
 @router.get("/search", response_model=schemas.NewsResponse)
-async def search_news(q: str, db: Session = Depends(get_db)) -> schemas.NewsResponse:
+async def search_news(
+    q: str,
+    mode: Optional[Literal["hybrid", "vector", "keyword"]] = Query(
+        None, description="hybrid (plein texte + vecteurs), vector ou keyword (sans embedding) ; défaut : SEARCH_MODE"
+    ),
+    ef_search: Optional[int] = Query(None, ge=1, le=1000, description="hnsw.ef_search de la requête (index HNSW)"),
+    probes: Optional[int] = Query(None, ge=1, le=10000, description="ivfflat.probes de la requête (index IVFFlat)"),
+    published_from: Optional[datetime] = Query(None, description="Articles publiés à partir de cette date"),
+    published_to: Optional[datetime] = Query(None, description="Articles publiés jusqu'à cette date"),
+    subjects: Optional[List[str]] = Query(None, description="Articles liés à l'un de ces sujets"),
+    limit: int = Query(20, ge=1, le=100, description="Taille de la page"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente"),
+    db: Session = Depends(get_db),
+) -> schemas.NewsResponse:
     """
     Recherche des articles similaires basés sur une requête textuelle et retourne les clusters.
+
+    `mode` choisit le classement : fusion plein texte + vecteurs, vecteurs seuls, ou
+    mots-clés seuls (aucun appel d'embedding). `ef_search` et `probes` règlent, pour cette
+    requête, le compromis rappel/latence de l'index approché (valeurs par défaut :
+    VECTOR_SEARCH_EF_SEARCH et VECTOR_SEARCH_PROBES).
+
+    Les filtres (dates de publication, sujets) sont appliqués dans la requête de
+    classement elle-même ; `next_cursor` permet de demander la page suivante.
     """
-    # Génération de l'embedding pour la requête
-    query_embedding = generate_embedding(q)
-    
-    # Recherche des articles similaires dans la base de données
-    similar_articles = crud.search_articles_by_similarity(db, query_embedding)
+    mode = mode or settings.SEARCH_MODE
+    filters = crud.article_search_filters(published_from, published_to, subjects)
+
+    # Embedding de la requête : cache mémoire, puis cache persistant, puis fournisseur
+    # (chargement hors de la boucle d'événements, partagé par les requêtes identiques)
+    query_embedding = None if mode == "keyword" else await query_embedding_cache.get(q)
     
-    # Mettre à jour les résumés manquants en parallèle
+    # Recherche des articles similaires dans la base de données ; en cas d'échec de la
+    # requête pgvector, recherche exhaustive dans le store local des articles récents
     try:
-        updated_articles = await asyncio.gather(
-            *(crud.update_article_if_needed(db, article) for article in similar_articles)
+        similar_articles, next_cursor = crud.search_articles(
+            db,
+            q,
+            query_embedding,
+            mode=mode,
+            limit=limit,
+            cursor=cursor,
+            filters=filters,
+            ef_search=ef_search,
+            probes=probes,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        store = get_embedding_store()
+        if store is None or query_embedding is None or cursor:
+            raise
+        print(f"[ERROR] pgvector search failed, falling back to the local embedding store: {e}")
+        db.rollback()
+        # Filtres appliqués en SQL aux voisins du store, sur un voisinage élargi
+        nearest_ids = store.nearest(query_embedding, limit=limit * 10 if filters else limit)[0]
+        similar_articles, next_cursor = crud.get_articles_by_ids(db, nearest_ids, filters=filters)[:limit], None
+    
+    # Résumés manquants générés en arrière-plan : la réponse n'attend pas le LLM
+    # (savepoint : un échec n'annule ni n'expire les articles chargés)
+    try:
+        with db.begin_nested():
+            crud.enqueue_summary_jobs(db, similar_articles)
     except Exception as e:
-        print(f"[ERROR] Failed to update article summaries: {e}")
-        updated_articles = similar_articles  # Revenir aux articles non mis à jour
+        print(f"[ERROR] Failed to enqueue article summaries: {e}")
     
-    # Effectuer le clustering et générer les résumés/titres des clusters en thread séparé
+    # Clustering (calcul dans un thread) puis résumés/titres via le client LLM partagé
     try:
-        cluster_summaries = await asyncio.to_thread(workflow_query_cluster_and_summarize, updated_articles)
+        cluster_summaries = await workflow_query_cluster_and_summarize(similar_articles, db=db)
     except Exception as e:
         print(f"[ERROR] Failed to perform clustering and summarization: {e}")
         cluster_summaries = {}
@@ -101,8 +151,15 @@ async def search_news(q: str, db: Session = Depends(get_db)) -> schemas.NewsResp
         )
     
     response = schemas.NewsResponse(
-        articles=updated_articles,
-        clusters=clusters_json
+        articles=similar_articles,
+        clusters=clusters_json,
+        next_cursor=next_cursor
     )
-    
+
+    # Validation unique, une fois la réponse construite : les jobs de résumé mis en file
+    try:
+        db.commit()
+    except Exception as e:
+        print(f"[ERROR] Failed to commit article summary jobs: {e}")
+        db.rollback()
     return response
\ No newline at end of file
@@ -136,4 +136,24 @@ class ClusterSummary(BaseModel):
 
 class NewsResponse(BaseModel):
     articles: List[Article]
-    clusters: List[ClusterSummary]
\ No newline at end of file
+    clusters: List[ClusterSummary]
+    next_cursor: Optional[str] = None  # Page suivante d'une recherche (None : dernière page)
+
+class SummaryQueueStats(BaseModel):
+    """
+    État de la file des résumés d'articles.
+
+    Attributes:
+        pending (int): Jobs en attente.
+        processing (int): Jobs en cours de traitement.
+        done (int): Jobs terminés encore conservés.
+        failed (int): Jobs abandonnés après le nombre maximal de tentatives.
+        completed (int): Résumés générés pendant la dernière heure.
+        per_minute (float): Débit moyen sur la dernière heure.
+    """
+    pending: int
+    processing: int
+    done: int
+    failed: int
+    completed: int
+    per_minute: float
\ No newline at end of file
@@ -0,0 +1,208 @@
+# app/tasks/backfill.py
+"""
+Backfill des dates historiques : `python -m app.tasks.backfill --start 2024-01-01 --end 2024-01-31`.
+
+Les jours sont traités du plus récent au plus ancien, plusieurs à la fois. Chaque jour
+terminé est enregistré dans `ingestion_coverage` : une exécution interrompue reprend
+là où elle s'était arrêtée (les jours déjà couverts sont ignorés, sauf avec --force).
+
+Le backfill détient le verrou de l'ingestion (INGESTION_JOB_LOCK_ID) pendant toute son
+exécution : ni l'ingestion planifiée (et la synchronisation du store d'embeddings), ni
+le rééquilibrage des clusters ne tournent en même temps. Les jours parallèles ne
+touchent pas aux clusters en ligne ; les articles sont affectés une fois tous les jours
+traités, par un seul écrivain.
+"""
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud import add_articles_to_db, mark_date_covered
+from ..database import SessionLocal
+from ..models import IngestionCoverage
+from ..utils.fetch_news import fetch_news_by_date
+from ..utils.online_clustering import assign_unclustered_articles
+from .leader import advisory_lock
+
+logging.basicConfig(level=logging.INFO)
+
+
+def ingest_day(db: Session, target_date: date, query: str = 'news', max_pages: int = settings.NEWS_API_MAX_PAGES) -> Dict[str, int]:
+    """
+    Récupère et insère les articles d'une date, puis l'enregistre comme couverte. Les
+    articles ne sont pas affectés aux clusters en ligne (voir `backfill`).
+
+    Parameters:
+        db (Session): La session de base de données.
+        target_date (date): La date à traiter.
+        query (str): Les mots-clés de recherche NewsAPI.
+        max_pages (int): Nombre maximal de pages à récupérer.
+
+    Returns:
+        Dict[str, int]: Les compteurs renvoyés par `add_articles_to_db`.
+    """
+    articles_data = fetch_news_by_date(target_date, query, max_pages=max_pages)
+    stats = add_articles_to_db(db, articles_data, assign_clusters=False)
+    mark_date_covered(db, target_date, stats["inserted"])
+    return stats
+
+
+def pending_dates(db: Session, start: date, end: date, force: bool = False) -> List[date]:
+    """
+    Liste les dates de l'intervalle restant à traiter, de la plus récente à la plus ancienne.
+
+    Parameters:
+        db (Session): La session de base de données.
+        start (date): Première date (incluse).
+        end (date): Dernière date (incluse).
+        force (bool): Retraiter aussi les dates déjà couvertes.
+
+    Returns:
+        List[date]: Les dates à traiter.
+    """
+    covered = set()
+    if not force:
+        covered = {
+            covered_date for (covered_date,) in db.query(IngestionCoverage.date)
+            .filter(IngestionCoverage.date >= start, IngestionCoverage.date <= end)
+        }
+    days = (end - start).days + 1
+    return [end - timedelta(days=i) for i in range(days) if end - timedelta(days=i) not in covered]
+
+
+def backfill(
+    start: date,
+    end: date,
+    workers: int = 4,
+    force: bool = False,
+    session_factory: Callable[[], Session] = SessionLocal,
+    ingest: Optional[Callable[[Session, date], Dict[str, int]]] = None,
+) -> Optional[Dict[str, float]]:
+    """
+    Ingère toutes les dates non couvertes de l'intervalle avec un parallélisme borné, sous
+    le verrou de l'ingestion, puis affecte les nouveaux articles aux clusters en ligne.
+
+    Parameters:
+        start (date): Première date (incluse).
+        end (date): Dernière date (incluse).
+        workers (int): Nombre de jours traités simultanément.
+        force (bool): Retraiter aussi les dates déjà couvertes.
+        session_factory (Callable[[], Session]): Fabrique de sessions (une par jour traité).
+        ingest (Optional[Callable]): Fonction d'ingestion d'un jour (défaut : `ingest_day`).
+
+    Returns:
+        Optional[Dict[str, float]]: Jours traités et en échec, articles insérés, articles
+            affectés aux clusters en ligne, durée et débit (articles/s) ; None si une
+            ingestion est déjà en cours.
+    """
+    db = session_factory()
+    try:
+        with advisory_lock(db.get_bind(), settings.INGESTION_JOB_LOCK_ID) as acquired:
+            if not acquired:
+                logging.info("[BACKFILL] Une ingestion est déjà en cours dans un autre processus, abandon.")
+                return None
+            totals = _backfill(start, end, workers, force, session_factory, ingest or ingest_day)
+            if settings.CLUSTERING_MODE == "online":
+                totals["assigned"] = _assign_backfilled_articles(db)
+            return totals
+    finally:
+        db.close()
+
+
+def _assign_backfilled_articles(db: Session, batch_size: int = 1000) -> int:
+    # Par lots, jusqu'à épuisement des articles récents sans cluster
+    assigned = 0
+    while True:
+        count = assign_unclustered_articles(db, limit=batch_size)
+        assigned += count
+        if count < batch_size:
+            logging.info(f"[BACKFILL] {assigned} article(s) affecté(s) aux clusters en ligne.")
+            return assigned
+
+
+def _backfill(
+    start: date,
+    end: date,
+    workers: int,
+    force: bool,
+    session_factory: Callable[[], Session],
+    ingest: Callable[[Session, date], Dict[str, int]],
+) -> Dict[str, float]:
+    db = session_factory()
+    try:
+        dates = pending_dates(db, start, end, force)
+    finally:
+        db.close()
+    logging.info(f"[BACKFILL] {len(dates)} jour(s) à traiter entre {start} et {end}.")
+
+    totals = {"days": 0, "failed_days": 0, "inserted": 0, "skipped": 0, "assigned": 0}
+    started_at = time.perf_counter()
+
+    def process(target_date: date) -> Dict[str, int]:
+        session = session_factory()
+        try:
+            return ingest(session, target_date)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(process, target_date): target_date for target_date in dates}
+        for future in as_completed(futures):
+            target_date = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                logging.error(f"[BACKFILL] {target_date} : échec ({e}), sera repris au prochain lancement.")
+                totals["failed_days"] += 1
+                continue
+            totals["days"] += 1
+            totals["inserted"] += stats["inserted"]
+            totals["skipped"] += stats["skipped"]
+            elapsed = time.perf_counter() - started_at
+            logging.info(
+                f"[BACKFILL] {target_date} : {stats['inserted']} insérés, {stats['skipped']} ignorés "
+                f"({totals['days']}/{len(dates)} jours, {totals['inserted'] / elapsed:.1f} articles/s)"
+            )
+
+    elapsed = time.perf_counter() - started_at
+    totals["elapsed"] = elapsed
+    totals["articles_per_second"] = totals["inserted"] / elapsed if elapsed > 0 else 0.0
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill des articles pour un intervalle de dates.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="Première date (AAAA-MM-JJ)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Dernière date (AAAA-MM-JJ)")
+    parser.add_argument("--workers", type=int, default=4, help="Jours traités en parallèle")
+    parser.add_argument("--query", default="news", help="Mots-clés NewsAPI")
+    parser.add_argument("--max-pages", type=int, default=settings.NEWS_API_MAX_PAGES)
+    parser.add_argument("--force", action="store_true", help="Retraiter les jours déjà couverts")
+    args = parser.parse_args()
+
+    if args.start > args.end:
+        parser.error("--start doit précéder --end")
+
+    totals = backfill(
+        args.start,
+        args.end,
+        workers=args.workers,
+        force=args.force,
+        ingest=lambda db, target_date: ingest_day(db, target_date, args.query, args.max_pages),
+    )
+    if totals is None:
+        raise SystemExit(1)
+    logging.info(
+        f"[BACKFILL] Terminé : {totals['days']} jour(s), {totals['failed_days']} en échec, "
+        f"{totals['inserted']} articles insérés en {totals['elapsed']:.1f}s "
+        f"({totals['articles_per_second']:.1f} articles/s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
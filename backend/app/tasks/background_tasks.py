@@ -1,9 +1,20 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
+import asyncio
 import logging
-from ..database import SessionLocal
+from ..config import settings
+from ..database import SessionLocal, engine
+from .leader import advisory_lock
+from .pipeline import format_stage_metrics
+from .summary_queue import drain_summary_queue, format_queue_stats
 from ..utils.fetch_news import populate_function
+from ..utils.embedding_cache import embedding_cache_stats
+from ..utils.cluster_summary_cache import cluster_summary_cache_stats
+from ..utils.embedding_store import get_embedding_store
+from ..clustering import refresh_cluster_snapshot
+from ..crud import get_latest_cluster_snapshot, get_summary_queue_stats
+from ..utils.online_clustering import assign_unclustered_articles, rebalance_clusters
 
 
 logging.basicConfig(level=logging.INFO)
@@ -11,25 +22,137 @@ logging.basicConfig(level=logging.INFO)
 def scheduled_fetch_news():
     """
     Fonction qui sera appelée périodiquement pour récupérer et insérer les articles dans la DB.
+    Un verrou consultatif garantit qu'une seule ingestion tourne à la fois dans le cluster.
     """
+    with advisory_lock(engine, settings.INGESTION_JOB_LOCK_ID) as acquired:
+        if not acquired:
+            logging.info("[SCHEDULER] Une ingestion est déjà en cours dans un autre processus, passage.")
+            return
+        _fetch_news()
+
+def _fetch_news():
     logging.info(f"[SCHEDULER] Début de scheduled_fetch_news à {datetime.now()}")
     db = SessionLocal()
     try:
         # Appelez ici la fonction de peuplement que vous avez créée, par ex. main() ou fetch_and_populate_articles
-        populate_function()
+        stats = populate_function()
+        logging.info(
+            f"[SCHEDULER] {stats['date']} : {stats['inserted']} article(s) insérés, "
+            f"{stats['skipped']} ignorés (dont {stats['near_duplicates']} quasi-doublons)"
+        )
+        logging.info(f"[SCHEDULER] Pipeline : {format_stage_metrics(stats['stages'])}")
+        store = get_embedding_store()
+        if store is not None:
+            # Ajout incrémental des nouveaux embeddings, avant le clustering qui les lit
+            store_stats = store.sync(db)
+            logging.info(
+                f"[SCHEDULER] Store d'embeddings : {store_stats['added']} ajouté(s), "
+                f"{store_stats['evicted']} retiré(s), {store_stats['size']} au total"
+            )
+        # Un clustering par cycle, seulement si de nouveaux articles sont arrivés
+        if stats['inserted'] or get_latest_cluster_snapshot(db) is None:
+            snapshot = asyncio.run(refresh_cluster_snapshot(db))
+            logging.info(
+                f"[SCHEDULER] Snapshot de clusters v{snapshot.id} : {len(snapshot.clusters)} clusters "
+                f"sur {snapshot.article_count} articles"
+            )
+        for name, cache in (("d'embeddings", embedding_cache_stats), ("des résumés de clusters", cluster_summary_cache_stats)):
+            cache_stats = cache.snapshot()
+            logging.info(
+                f"[SCHEDULER] Cache {name} : {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['evictions']} évictions (taux {cache_stats['hit_ratio']:.0%})"
+            )
     except Exception as e:
         logging.error(f"[SCHEDULER] Erreur lors de la récupération des articles : {e}")
     finally:
         db.close()
     logging.info(f"[SCHEDULER] Fin de scheduled_fetch_news à {datetime.now()}")
 
-def start_scheduler():
+def scheduled_rebalance_clusters():
     """
-    Configure et démarre l'APScheduler pour lancer 'scheduled_fetch_news' de temps en temps.
+    Rééquilibre les clusters en ligne (fusions, scissions, retrait des clusters inactifs).
+    Partage le verrou de l'ingestion pour ne pas modifier les centroïdes pendant une affectation.
+    """
+    with advisory_lock(engine, settings.INGESTION_JOB_LOCK_ID) as acquired:
+        if not acquired:
+            logging.info("[SCHEDULER] Ingestion en cours, rééquilibrage des clusters reporté.")
+            return
+        db = SessionLocal()
+        try:
+            assigned = assign_unclustered_articles(db)
+            stats = rebalance_clusters(db)
+            logging.info(
+                f"[SCHEDULER] Clusters en ligne : {assigned} article(s) affecté(s), {stats['merged']} fusion(s), "
+                f"{stats['split']} scission(s), {stats['retired']} cluster(s) retiré(s)"
+            )
+        except Exception as e:
+            logging.error(f"[SCHEDULER] Erreur lors du rééquilibrage des clusters : {e}")
+        finally:
+            db.close()
+
+def scheduled_process_summaries():
+    """
+    Vide la file des résumés d'articles mis en file par les endpoints de lecture et
+    supprime les jobs terminés au-delà de la durée de conservation.
+    """
+    try:
+        result = asyncio.run(drain_summary_queue())
+        if result['processed'] or result['pruned']:
+            db = SessionLocal()
+            try:
+                logging.info(
+                    f"[SCHEDULER] Résumés : {result['processed']} job(s) traité(s) en {result['elapsed']:.1f}s, "
+                    f"{result['pruned']} job(s) terminé(s) supprimé(s) ; "
+                    f"file : {format_queue_stats(get_summary_queue_stats(db))}"
+                )
+            finally:
+                db.close()
+    except Exception as e:
+        logging.error(f"[SCHEDULER] Erreur lors du traitement de la file des résumés : {e}")
+
+def create_scheduler() -> BackgroundScheduler:
+    """
+    Configure l'APScheduler avec les tâches périodiques d'ingestion, sans le démarrer.
+
+    Returns:
+        BackgroundScheduler: Le scheduler configuré.
     """
     scheduler = BackgroundScheduler(timezone="UTC")
-    # Exemple : run toutes les 6 heures
-    scheduler.add_job(scheduled_fetch_news, IntervalTrigger(minutes=10), id='fetch_news_job')
-    
+    scheduler.add_job(
+        scheduled_fetch_news,
+        IntervalTrigger(minutes=settings.FETCH_INTERVAL_MINUTES),
+        id='fetch_news_job',
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        scheduled_process_summaries,
+        IntervalTrigger(seconds=settings.SUMMARY_QUEUE_POLL_SECONDS),
+        id='process_summaries_job',
+        max_instances=1,
+        coalesce=True,
+    )
+    if settings.CLUSTERING_MODE == "online":
+        scheduler.add_job(
+            scheduled_rebalance_clusters,
+            IntervalTrigger(minutes=settings.CLUSTER_REBALANCE_INTERVAL_MINUTES),
+            id='rebalance_clusters_job',
+            max_instances=1,
+            coalesce=True,
+        )
+    return scheduler
+
+def start_scheduler() -> BackgroundScheduler:
+    """
+    Configure et démarre l'APScheduler pour lancer 'scheduled_fetch_news' de temps en temps.
+
+    En production, l'ingestion tourne dans le worker dédié (`python -m app.worker`) ;
+    cette fonction ne sert que si RUN_SCHEDULER_IN_WEB est activé.
+
+    Returns:
+        BackgroundScheduler: Le scheduler démarré.
+    """
+    scheduler = create_scheduler()
     scheduler.start()
     logging.info("[SCHEDULER] APScheduler démarré.")
+    return scheduler
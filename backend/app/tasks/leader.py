@@ -0,0 +1,96 @@
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+def try_acquire_lock(engine: Engine, lock_id: int) -> Optional[Connection]:
+    """
+    Tente de prendre le verrou consultatif (advisory lock) PostgreSQL `lock_id` sur une
+    connexion dédiée. Le verrou reste détenu tant que la connexion est ouverte et est
+    libéré automatiquement par PostgreSQL si le processus meurt.
+
+    Sur les autres bases (SQLite en développement et en test), il n'y a qu'un seul
+    processus : le verrou est considéré comme acquis.
+
+    Parameters:
+        engine (Engine): Le moteur de base de données.
+        lock_id (int): L'identifiant du verrou.
+
+    Returns:
+        Optional[Connection]: La connexion qui détient le verrou, ou None s'il est déjà pris.
+    """
+    connection = engine.connect()
+    if engine.dialect.name != "postgresql":
+        return connection
+    try:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:lock_id)"), {"lock_id": lock_id}).scalar()
+        # Valider pour ne pas laisser une transaction ouverte pendant toute la durée du verrou
+        connection.commit()
+    except Exception:
+        connection.close()
+        raise
+    if not acquired:
+        connection.close()
+        return None
+    return connection
+
+
+def release_lock(connection: Connection, lock_id: int) -> None:
+    """
+    Libère le verrou consultatif et ferme sa connexion.
+
+    Parameters:
+        connection (Connection): La connexion renvoyée par `try_acquire_lock`.
+        lock_id (int): L'identifiant du verrou.
+    """
+    try:
+        if connection.engine.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": lock_id})
+            connection.commit()
+    except Exception as e:
+        logging.warning(f"[LEADER] Impossible de libérer le verrou {lock_id} : {e}")
+    finally:
+        connection.close()
+
+
+def lock_is_alive(connection: Connection) -> bool:
+    """
+    Vérifie que la connexion qui détient le verrou est toujours ouverte (sinon le
+    verrou a été perdu et un autre processus peut l'avoir pris).
+
+    Parameters:
+        connection (Connection): La connexion renvoyée par `try_acquire_lock`.
+
+    Returns:
+        bool: True si la connexion répond.
+    """
+    try:
+        connection.execute(text("SELECT 1"))
+        connection.commit()
+        return True
+    except Exception as e:
+        logging.error(f"[LEADER] Connexion du verrou perdue : {e}")
+        return False
+
+
+@contextmanager
+def advisory_lock(engine: Engine, lock_id: int) -> Iterator[bool]:
+    """
+    Gestionnaire de contexte qui tente de prendre le verrou et le libère à la sortie.
+
+    Parameters:
+        engine (Engine): Le moteur de base de données.
+        lock_id (int): L'identifiant du verrou.
+
+    Yields:
+        bool: True si le verrou a été acquis.
+    """
+    connection = try_acquire_lock(engine, lock_id)
+    try:
+        yield connection is not None
+    finally:
+        if connection is not None:
+            release_lock(connection, lock_id)
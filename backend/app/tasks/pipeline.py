@@ -0,0 +1,335 @@
+# app/tasks/pipeline.py
+"""
+Pipeline d'ingestion en flux : fetch → nettoyage → dédoublonnage → embedding → écriture.
+
+Chaque page NewsAPI traverse les étapes dès qu'elle est reçue, sans attendre la fin
+du téléchargement des autres pages. Les étapes sont reliées par des files bornées
+(PIPELINE_QUEUE_SIZE) : une étape lente ralentit les précédentes au lieu de laisser
+les lots s'accumuler en mémoire. Les articles sont écrits par petites transactions
+(PIPELINE_COMMIT_SIZE) : une erreur ne fait perdre que le lot concerné.
+
+Utilisation : `python -m app.tasks.pipeline --date 2024-01-01 --date 2024-01-02`.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud import deduplicate_articles, mark_date_covered, prepare_articles, write_articles
+from ..database import SessionLocal
+from ..utils.embedding_cache import get_embeddings_cached
+from ..utils.embeddings import EmbeddingProvider
+from ..utils.newsapi_client import NewsAPIClient
+
+logging.basicConfig(level=logging.INFO)
+
+STAGES = ("fetch", "clean", "dedupe", "embed", "write")
+
+# Marqueur de fin de flux envoyé à chaque worker de l'étape suivante
+_DONE = object()
+
+Batch = Tuple[date, List[dict]]
+
+
+class StageMetrics:
+    """
+    Compteurs d'une étape du pipeline.
+
+    Attributes:
+        batches (int): Nombre de lots traités.
+        items_in (int): Nombre d'articles reçus.
+        items_out (int): Nombre d'articles transmis à l'étape suivante.
+        errors (int): Nombre de lots en échec.
+        busy_seconds (float): Temps cumulé passé à traiter des lots (tous workers confondus).
+        max_queue_depth (int): Nombre maximal de lots en attente dans la file de sortie.
+    """
+
+    def __init__(self):
+        self.batches = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class IngestionPipeline:
+    """
+    Pipeline d'ingestion en flux, une instance par exécution.
+
+    Le dédoublonnage et l'écriture ont chacun un seul worker : le premier garde
+    l'ensemble des URLs et l'index des SimHash des articles encore en vol (pas
+    encore en base), le second sérialise les transactions. Le fetch, le nettoyage
+    et l'embedding ont une concurrence configurable.
+
+    Parameters:
+        session_factory (Callable[[], Session]): Fabrique de sessions (une par étape qui accède à la base).
+        client_factory (Callable[[], NewsAPIClient]): Fabrique du client NewsAPI.
+        provider (Optional[EmbeddingProvider]): Le fournisseur d'embeddings (défaut : celui configuré).
+        max_pages (int): Nombre maximal de pages par couple (date, requête).
+        queue_size (int): Taille des files entre étapes.
+        fetch_workers (int): Couples (date, requête) récupérés simultanément.
+        clean_workers (int): Lots nettoyés simultanément.
+        embed_workers (int): Lots encodés simultanément.
+        commit_size (int): Articles par transaction d'écriture.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        client_factory: Callable[[], NewsAPIClient] = NewsAPIClient,
+        provider: Optional[EmbeddingProvider] = None,
+        max_pages: int = settings.NEWS_API_MAX_PAGES,
+        queue_size: int = settings.PIPELINE_QUEUE_SIZE,
+        fetch_workers: int = settings.PIPELINE_FETCH_WORKERS,
+        clean_workers: int = settings.PIPELINE_CLEAN_WORKERS,
+        embed_workers: int = settings.PIPELINE_EMBED_WORKERS,
+        commit_size: int = settings.PIPELINE_COMMIT_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.client_factory = client_factory
+        self.provider = provider
+        self.max_pages = max_pages
+        self.queue_size = max(1, queue_size)
+        self.workers = {
+            "fetch": max(1, fetch_workers),
+            "clean": max(1, clean_workers),
+            "dedupe": 1,
+            "embed": max(1, embed_workers),
+            "write": 1,
+        }
+        self.commit_size = max(1, commit_size)
+        self.metrics = {stage: StageMetrics() for stage in STAGES}
+        self.inserted: Dict[date, int] = defaultdict(int)
+        self.fetched = 0
+        self.near_duplicates = 0
+        self.failed_dates: Set[date] = set()
+
+    async def _put(self, stage: str, queue: asyncio.Queue, batch) -> None:
+        await queue.put(batch)
+        metrics = self.metrics[stage]
+        metrics.max_queue_depth = max(metrics.max_queue_depth, queue.qsize())
+
+    async def _run_stage(
+        self,
+        stage: str,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable,
+        downstream_workers: int,
+    ) -> None:
+        """
+        Lance les workers d'une étape jusqu'à la fin du flux, puis signale la fin à l'étape suivante.
+
+        `handler(batch, emit)` traite un lot et appelle `emit(target_date, articles)` pour
+        chaque lot produit. Un lot en échec est journalisé et abandonné ; sa date n'est
+        pas marquée comme couverte et sera reprise à la prochaine ingestion.
+        """
+        metrics = self.metrics[stage]
+
+        async def emit(target_date: date, articles: List[dict]) -> None:
+            metrics.items_out += len(articles)
+            if outbox is not None and articles:
+                await self._put(stage, outbox, (target_date, articles))
+
+        async def worker() -> None:
+            while True:
+                batch = await inbox.get()
+                if batch is _DONE:
+                    return
+                started_at = time.perf_counter()
+                try:
+                    await handler(batch, emit)
+                except Exception as e:
+                    metrics.errors += 1
+                    self.failed_dates.add(batch[0])
+                    logging.error(f"[PIPELINE] Étape {stage}, lot du {batch[0]} abandonné : {e}")
+                finally:
+                    metrics.batches += 1
+                    metrics.busy_seconds += time.perf_counter() - started_at
+
+        await asyncio.gather(*(worker() for _ in range(self.workers[stage])))
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_DONE)
+
+    async def _fetch(self, client: NewsAPIClient, request: Tuple[date, str], emit) -> None:
+        target_date, query = request
+        async for articles in client.iter_day_pages(target_date, query, max_pages=self.max_pages):
+            self.metrics["fetch"].items_in += len(articles)
+            self.fetched += len(articles)
+            await emit(target_date, articles)
+
+    async def _clean(self, batch: Batch, emit) -> None:
+        target_date, articles = batch
+        self.metrics["clean"].items_in += len(articles)
+        await emit(target_date, await asyncio.to_thread(prepare_articles, articles))
+
+    async def _dedupe(self, db: Session, seen_urls: Set[str], index: dict, batch: Batch, emit) -> None:
+        target_date, articles = batch
+        self.metrics["dedupe"].items_in += len(articles)
+        # Doublons d'URL entre pages ou requêtes différentes, pas encore en base
+        articles = [article for article in articles if article['url'] not in seen_urls]
+        kept, near_duplicates = await asyncio.to_thread(deduplicate_articles, db, articles, index)
+        seen_urls.update(article['url'] for article in kept)
+        self.near_duplicates += near_duplicates
+        await emit(target_date, kept)
+
+    def _embed_sync(self, texts: List[str]) -> List[list]:
+        db = self.session_factory()
+        try:
+            return get_embeddings_cached(db, texts, provider=self.provider)
+        finally:
+            db.close()
+
+    async def _embed(self, batch: Batch, emit) -> None:
+        target_date, articles = batch
+        self.metrics["embed"].items_in += len(articles)
+        embeddings = await asyncio.to_thread(self._embed_sync, [article['raw_text'] for article in articles])
+        for article, embedding in zip(articles, embeddings):
+            article['embedding'] = embedding
+        await emit(target_date, articles)
+
+    def write_batch(self, db: Session, articles: List[dict]) -> int:
+        """
+        Écrit un lot d'articles encodés dans une transaction et renvoie le nombre d'insertions.
+        """
+        try:
+            return len(write_articles(db, articles, [article['embedding'] for article in articles]))
+        except Exception:
+            db.rollback()
+            raise
+
+    async def _write(self, db: Session, batch: Batch, emit) -> None:
+        target_date, articles = batch
+        self.metrics["write"].items_in += len(articles)
+        for start in range(0, len(articles), self.commit_size):
+            inserted = await asyncio.to_thread(self.write_batch, db, articles[start:start + self.commit_size])
+            self.inserted[target_date] += inserted
+            self.metrics["write"].items_out += inserted
+
+    async def run(self, requests: Iterable[Tuple[date, str]]) -> Dict[str, object]:
+        """
+        Ingère les couples (date, requête) puis marque comme couvertes les dates sans lot en échec.
+
+        Parameters:
+            requests (Iterable[Tuple[date, str]]): Les couples (date, requête) à ingérer.
+
+        Returns:
+            Dict[str, object]: Les compteurs "inserted", "skipped" et "near_duplicates",
+                les dates "covered" et "failed_dates", la durée "elapsed" et les
+                métriques de chaque étape ("stages").
+        """
+        requests = list(requests)
+        started_at = time.perf_counter()
+        queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in STAGES}
+        # Les requêtes et leurs marqueurs de fin sont connus d'avance : file non bornée
+        queues["fetch"] = asyncio.Queue()
+        for request in requests:
+            queues["fetch"].put_nowait(request)
+        for _ in range(self.workers["fetch"]):
+            queues["fetch"].put_nowait(_DONE)
+
+        dedupe_db = self.session_factory()
+        write_db = self.session_factory()
+        seen_urls: Set[str] = set()
+        near_duplicate_index: dict = {}
+        try:
+            async with self.client_factory() as client:
+                handlers = {
+                    "fetch": lambda request, emit: self._fetch(client, request, emit),
+                    "clean": self._clean,
+                    "dedupe": lambda batch, emit: self._dedupe(dedupe_db, seen_urls, near_duplicate_index, batch, emit),
+                    "embed": self._embed,
+                    "write": lambda batch, emit: self._write(write_db, batch, emit),
+                }
+                await asyncio.gather(*(
+                    self._run_stage(
+                        stage,
+                        queues[stage],
+                        queues[STAGES[i + 1]] if i + 1 < len(STAGES) else None,
+                        handlers[stage],
+                        self.workers[STAGES[i + 1]] if i + 1 < len(STAGES) else 0,
+                    )
+                    for i, stage in enumerate(STAGES)
+                ))
+
+            covered = sorted({target_date for target_date, _ in requests} - self.failed_dates)
+            for target_date in covered:
+                mark_date_covered(write_db, target_date, self.inserted[target_date])
+        finally:
+            dedupe_db.close()
+            write_db.close()
+
+        inserted = sum(self.inserted.values())
+        return {
+            "inserted": inserted,
+            "skipped": self.fetched - inserted,
+            "near_duplicates": self.near_duplicates,
+            "covered": covered,
+            "failed_dates": sorted(self.failed_dates),
+            "elapsed": time.perf_counter() - started_at,
+            "stages": {stage: metrics.snapshot() for stage, metrics in self.metrics.items()},
+        }
+
+
+def format_stage_metrics(stages: Dict[str, Dict[str, float]]) -> str:
+    """
+    Met en forme les métriques des étapes pour les journaux.
+    """
+    return " | ".join(
+        f"{stage} : {m['items_in']}→{m['items_out']} en {m['busy_seconds']:.2f}s, "
+        f"file max {m['max_queue_depth']}, {m['errors']} erreur(s)"
+        for stage, m in stages.items()
+    )
+
+
+def run_pipeline(requests: Iterable[Tuple[date, str]], **kwargs) -> Dict[str, object]:
+    """
+    Exécute le pipeline de façon synchrone (scheduler, worker, CLI).
+
+    Parameters:
+        requests (Iterable[Tuple[date, str]]): Les couples (date, requête) à ingérer.
+        **kwargs: Les paramètres de `IngestionPipeline`.
+
+    Returns:
+        Dict[str, object]: Le résultat de `IngestionPipeline.run`.
+    """
+    return asyncio.run(IngestionPipeline(**kwargs).run(requests))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingestion en flux des articles de quelques dates.")
+    parser.add_argument("--date", type=date.fromisoformat, action="append", required=True, help="Date (AAAA-MM-JJ), répétable")
+    parser.add_argument("--query", action="append", help="Mots-clés NewsAPI, répétable (défaut : news)")
+    parser.add_argument("--max-pages", type=int, default=settings.NEWS_API_MAX_PAGES)
+    args = parser.parse_args()
+
+    queries = args.query or ["news"]
+    result = run_pipeline([(target_date, query) for target_date in args.date for query in queries], max_pages=args.max_pages)
+    logging.info(
+        f"[PIPELINE] {result['inserted']} articles insérés, {result['skipped']} ignorés "
+        f"(dont {result['near_duplicates']} quasi-doublons) en {result['elapsed']:.1f}s ; "
+        f"dates en échec : {result['failed_dates'] or 'aucune'}"
+    )
+    logging.info(f"[PIPELINE] {format_stage_metrics(result['stages'])}")
+
+
+if __name__ == "__main__":
+    main()
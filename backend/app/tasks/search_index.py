@@ -0,0 +1,275 @@
+# app/tasks/search_index.py
+"""
+Gestion des index de recherche des articles (PostgreSQL uniquement).
+
+Index approché (ANN) sur `articles.embedding`, HNSW ou IVFFlat, pour la distance L2
+(`<->`, `vector_l2_ops`) ou cosinus (`<=>`, `vector_cosine_ops`). La requête de
+recherche doit utiliser la même distance que l'index (VECTOR_SEARCH_METRIC) pour que
+PostgreSQL s'en serve ; le compromis rappel/latence se règle par requête avec
+`hnsw.ef_search` ou `ivfflat.probes`.
+
+Index plein texte : colonne générée `articles.search_vector` (tsvector du titre, pondéré
+'A', et du texte brut, pondéré 'B') indexée en GIN, utilisée par la recherche par
+mots-clés et la recherche hybride (`crud.search_articles_by_keywords`).
+
+Utilisation :
+    python -m app.tasks.search_index create --method hnsw --metric l2
+    python -m app.tasks.search_index create --method ivfflat --metric cosine --replace
+    python -m app.tasks.search_index create-text
+    python -m app.tasks.search_index show
+    python -m app.tasks.search_index drop
+    python -m app.tasks.search_index drop-text
+"""
+import argparse
+import logging
+import math
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from ..database import engine as default_engine
+
+logging.basicConfig(level=logging.INFO)
+
+VECTOR_INDEX_METHODS = ("hnsw", "ivfflat")
+# Distance -> (classe d'opérateurs de l'index, opérateur de la requête)
+VECTOR_METRICS = {
+    "l2": ("vector_l2_ops", "<->"),
+    "cosine": ("vector_cosine_ops", "<=>"),
+}
+VECTOR_INDEX_NAME = "ix_articles_embedding_ann"
+TEXT_SEARCH_COLUMN = "search_vector"
+TEXT_INDEX_NAME = "ix_articles_search_vector"
+
+
+def ivfflat_lists(rows: int) -> int:
+    """
+    Nombre de listes IVFFlat recommandé par pgvector : lignes / 1000 jusqu'à un million
+    de lignes, racine carrée au-delà (au moins 1).
+    """
+    return max(1, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+
+
+def vector_index_ddl(
+    method: str = settings.VECTOR_INDEX_METHOD,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+    m: int = settings.VECTOR_INDEX_HNSW_M,
+    ef_construction: int = settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION,
+    lists: int = 100,
+    table: str = "articles",
+    column: str = "embedding",
+    name: str = VECTOR_INDEX_NAME,
+) -> str:
+    """
+    Construit l'instruction de création de l'index approché.
+
+    Parameters:
+        method (str): "hnsw" ou "ivfflat".
+        metric (str): "l2" ou "cosine".
+        m (int): Connexions par nœud (HNSW).
+        ef_construction (int): Taille de la liste de candidats à la construction (HNSW).
+        lists (int): Nombre de listes (IVFFlat).
+        table (str): Table indexée.
+        column (str): Colonne vector indexée.
+        name (str): Nom de l'index.
+
+    Returns:
+        str: L'instruction CREATE INDEX CONCURRENTLY.
+
+    Raises:
+        ValueError: Si la méthode ou la distance est inconnue.
+    """
+    if method not in VECTOR_INDEX_METHODS:
+        raise ValueError(f"Méthode d'index inconnue : {method} (attendu : {', '.join(VECTOR_INDEX_METHODS)})")
+    if metric not in VECTOR_METRICS:
+        raise ValueError(f"Distance inconnue : {metric} (attendu : {', '.join(VECTOR_METRICS)})")
+    opclass = VECTOR_METRICS[metric][0]
+    options = f"m = {int(m)}, ef_construction = {int(ef_construction)}" if method == "hnsw" else f"lists = {int(lists)}"
+    return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {method} ({column} {opclass}) WITH ({options})"
+
+
+def create_vector_index(
+    engine: Engine = default_engine,
+    method: str = settings.VECTOR_INDEX_METHOD,
+    metric: str = settings.VECTOR_SEARCH_METRIC,
+    m: int = settings.VECTOR_INDEX_HNSW_M,
+    ef_construction: int = settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION,
+    lists: int = settings.VECTOR_INDEX_IVFFLAT_LISTS,
+    replace: bool = False,
+    table: str = "articles",
+    name: str = VECTOR_INDEX_NAME,
+) -> str:
+    """
+    Crée l'index approché sans bloquer les écritures (CREATE INDEX CONCURRENTLY, hors
+    transaction). Un index IVFFlat doit être créé une fois la table remplie : ses
+    centroïdes sont calculés sur les données présentes.
+
+    Parameters:
+        engine (Engine): Le moteur de base de données.
+        method (str): "hnsw" ou "ivfflat".
+        metric (str): "l2" ou "cosine".
+        m (int): Connexions par nœud (HNSW).
+        ef_construction (int): Taille de la liste de candidats à la construction (HNSW).
+        lists (int): Nombre de listes IVFFlat (0 = calculé d'après le nombre de lignes).
+        replace (bool): Supprimer d'abord l'index existant (changement de méthode ou de distance).
+        table (str): Table indexée.
+        name (str): Nom de l'index.
+
+    Returns:
+        str: L'instruction exécutée.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if method == "ivfflat" and not lists:
+            rows = connection.execute(text(f"SELECT count(*) FROM {table} WHERE embedding IS NOT NULL")).scalar()
+            lists = ivfflat_lists(rows)
+        ddl = vector_index_ddl(method, metric, m, ef_construction, lists, table=table, name=name)
+        if replace:
+            connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        connection.execute(text(ddl))
+    return ddl
+
+
+def drop_vector_index(engine: Engine = default_engine, name: str = VECTOR_INDEX_NAME) -> None:
+    """
+    Supprime l'index approché (la recherche redevient exacte, par parcours séquentiel).
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def get_vector_index(engine: Engine = default_engine, name: str = VECTOR_INDEX_NAME) -> Optional[Dict[str, str]]:
+    """
+    Décrit l'index approché existant.
+
+    Returns:
+        Optional[Dict[str, str]]: La méthode ("method"), la distance ("metric") et la
+            définition ("definition") de l'index, ou None s'il n'existe pas.
+    """
+    with engine.connect() as connection:
+        definition = connection.execute(
+            text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"), {"name": name}
+        ).scalar()
+    if definition is None:
+        return None
+    method = next((method for method in VECTOR_INDEX_METHODS if f"USING {method}" in definition), "")
+    metric = next((metric for metric, (opclass, _) in VECTOR_METRICS.items() if opclass in definition), "")
+    return {"method": method, "metric": metric, "definition": definition}
+
+
+def text_search_ddl(config: str = settings.TEXT_SEARCH_CONFIG, table: str = "articles") -> List[str]:
+    """
+    Construit les instructions de création de la colonne tsvector et de son index GIN.
+
+    Parameters:
+        config (str): Configuration de recherche plein texte PostgreSQL (ex. "english").
+        table (str): Table indexée.
+
+    Returns:
+        List[str]: L'ajout de la colonne générée puis la création de l'index.
+
+    Raises:
+        ValueError: Si le nom de configuration n'est pas un identifiant.
+    """
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", config):
+        raise ValueError(f"Configuration plein texte invalide : {config}")
+    document = (
+        f"setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(raw_text, '')), 'B')"
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {TEXT_SEARCH_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS ({document}) STORED",
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {TEXT_INDEX_NAME} ON {table} USING gin ({TEXT_SEARCH_COLUMN})",
+    ]
+
+
+def create_text_search_index(
+    engine: Engine = default_engine,
+    config: str = settings.TEXT_SEARCH_CONFIG,
+    replace: bool = False,
+) -> List[str]:
+    """
+    Ajoute la colonne tsvector générée et son index GIN. L'ajout de la colonne réécrit
+    la table sous verrou exclusif (une fois) ; l'index est ensuite créé sans bloquer les
+    écritures. Les recherches doivent utiliser la même configuration (TEXT_SEARCH_CONFIG).
+
+    Parameters:
+        engine (Engine): Le moteur de base de données.
+        config (str): Configuration de recherche plein texte PostgreSQL.
+        replace (bool): Recréer la colonne et l'index (changement de configuration).
+
+    Returns:
+        List[str]: Les instructions exécutées.
+    """
+    statements = text_search_ddl(config)
+    if replace:
+        drop_text_search_index(engine)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+    return statements
+
+
+def drop_text_search_index(engine: Engine = default_engine) -> None:
+    """
+    Supprime l'index GIN et la colonne tsvector (la recherche hybride se limite alors
+    au classement vectoriel).
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {TEXT_INDEX_NAME}"))
+        connection.execute(text(f"ALTER TABLE articles DROP COLUMN IF EXISTS {TEXT_SEARCH_COLUMN}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gestion de l'index approché des embeddings d'articles.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="Créer l'index")
+    create.add_argument("--method", choices=VECTOR_INDEX_METHODS, default=settings.VECTOR_INDEX_METHOD)
+    create.add_argument("--metric", choices=tuple(VECTOR_METRICS), default=settings.VECTOR_SEARCH_METRIC)
+    create.add_argument("--m", type=int, default=settings.VECTOR_INDEX_HNSW_M)
+    create.add_argument("--ef-construction", type=int, default=settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION)
+    create.add_argument("--lists", type=int, default=settings.VECTOR_INDEX_IVFFLAT_LISTS, help="0 = d'après le nombre d'articles")
+    create.add_argument("--replace", action="store_true", help="Remplacer l'index existant")
+    create_text = commands.add_parser("create-text", help="Créer la colonne tsvector et son index GIN")
+    create_text.add_argument("--config", default=settings.TEXT_SEARCH_CONFIG)
+    create_text.add_argument("--replace", action="store_true", help="Recréer la colonne et l'index")
+    commands.add_parser("drop", help="Supprimer l'index")
+    commands.add_parser("drop-text", help="Supprimer l'index plein texte")
+    commands.add_parser("show", help="Afficher les index existants")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        if args.metric != settings.VECTOR_SEARCH_METRIC:
+            logging.warning(
+                f"[INDEX] Distance {args.metric} différente de VECTOR_SEARCH_METRIC={settings.VECTOR_SEARCH_METRIC} : "
+                "l'index ne sera pas utilisé par la recherche."
+            )
+        ddl = create_vector_index(
+            method=args.method, metric=args.metric, m=args.m,
+            ef_construction=args.ef_construction, lists=args.lists, replace=args.replace,
+        )
+        logging.info(f"[INDEX] {ddl}")
+    elif args.command == "create-text":
+        for statement in create_text_search_index(config=args.config, replace=args.replace):
+            logging.info(f"[INDEX] {statement}")
+    elif args.command == "drop":
+        drop_vector_index()
+        logging.info("[INDEX] Index supprimé.")
+    elif args.command == "drop-text":
+        drop_text_search_index()
+        logging.info("[INDEX] Index plein texte supprimé.")
+    else:
+        index = get_vector_index()
+        logging.info(f"[INDEX] {index['definition'] if index else 'Aucun index approché.'}")
+        with default_engine.connect() as connection:
+            definition = connection.execute(
+                text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"), {"name": TEXT_INDEX_NAME}
+            ).scalar()
+        logging.info(f"[INDEX] {definition or 'Aucun index plein texte.'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# app/tasks/summary_queue.py
+"""
+Traitement de la file persistante des résumés d'articles (table `summary_jobs`).
+
+Les endpoints de lecture ne font que mettre en file les articles sans résumé
+(`crud.enqueue_summary_jobs`) et répondent immédiatement ; le worker réserve les jobs
+les plus prioritaires par lots, génère les résumés en parallèle via le client LLM
+partagé et enregistre chaque lot en une transaction. Plusieurs workers peuvent vider
+la file simultanément (réservation `FOR UPDATE SKIP LOCKED` sur PostgreSQL).
+
+Utilisation ponctuelle : `python -m app.tasks.summary_queue`.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud import claim_summary_jobs, complete_summary_jobs, get_summary_queue_stats, prune_summary_jobs
+from ..database import SessionLocal
+from ..models import Article
+from ..utils.openai import generate_summary_async
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def process_summary_batch(db: Session, batch_size: int = settings.SUMMARY_QUEUE_BATCH_SIZE) -> int:
+    """
+    Réserve un lot de jobs, génère les résumés en parallèle et enregistre le lot.
+
+    Parameters:
+        db (Session): La session de base de données.
+        batch_size (int): Nombre maximal de jobs réservés.
+
+    Returns:
+        int: Le nombre de jobs traités (0 si la file est vide).
+    """
+    article_ids = claim_summary_jobs(db, batch_size)
+    if not article_ids:
+        return 0
+    rows = db.query(Article.id, Article.raw_text, Article.summary).filter(Article.id.in_(article_ids)).all()
+    # Un article résumé entre la mise en file et la réservation garde son résumé
+    summaries = {article_id: summary for article_id, _, summary in rows if summary}
+    texts = {article_id: raw_text for article_id, raw_text, summary in rows if not summary}
+
+    results = await asyncio.gather(*(generate_summary_async(text) for text in texts.values()), return_exceptions=True)
+    failed = []
+    for article_id, result in zip(texts, results):
+        if isinstance(result, BaseException) or not result:
+            logging.error(f"[SUMMARIES] Échec du résumé de l'article {article_id} : {result!r}")
+            failed.append(article_id)
+        else:
+            summaries[article_id] = result
+    complete_summary_jobs(db, summaries, failed)
+    return len(article_ids)
+
+
+async def drain_summary_queue(
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = settings.SUMMARY_QUEUE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Traite des lots jusqu'à ce que la file soit vide (ou `max_batches` lots), puis
+    supprime les jobs terminés au-delà de SUMMARY_QUEUE_RETENTION_HOURS.
+
+    Parameters:
+        session_factory (Callable[[], Session]): Fabrique de sessions.
+        batch_size (int): Nombre de jobs par lot.
+        max_batches (Optional[int]): Nombre maximal de lots traités.
+
+    Returns:
+        Dict[str, float]: Le nombre de jobs traités ("processed"), de jobs terminés
+            supprimés ("pruned") et la durée ("elapsed").
+    """
+    start = time.perf_counter()
+    processed = batches = 0
+    db = session_factory()
+    try:
+        while max_batches is None or batches < max_batches:
+            count = await process_summary_batch(db, batch_size)
+            if not count:
+                break
+            processed += count
+            batches += 1
+        pruned = prune_summary_jobs(db)
+    finally:
+        db.close()
+    return {"processed": processed, "pruned": pruned, "elapsed": time.perf_counter() - start}
+
+
+def format_queue_stats(stats: Dict[str, float]) -> str:
+    """
+    Résumé lisible de l'état de la file pour les logs.
+    """
+    return (
+        f"{stats['pending']} en attente, {stats['processing']} en cours, {stats['failed']} en échec ; "
+        f"{stats['completed']} résumé(s) la dernière heure ({stats['per_minute']:.1f}/min)"
+    )
+
+
+def main() -> None:
+    result = asyncio.run(drain_summary_queue())
+    logging.info(f"[SUMMARIES] {result['processed']} job(s) traité(s) en {result['elapsed']:.1f}s")
+    db = SessionLocal()
+    try:
+        logging.info(f"[SUMMARIES] File : {format_queue_stats(get_summary_queue_stats(db))}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import dialect_insert
+from ..models import ClusterSummaryCacheEntry
+from .embedding_cache import CacheStats
+from .openai import SUMMARY_AND_TITLE_PROMPT_VERSION
+
+cluster_summary_cache_stats = CacheStats()
+
+
+def cluster_summary_key(article_ids: Iterable[int], prompt_version: str = SUMMARY_AND_TITLE_PROMPT_VERSION) -> str:
+    """
+    Compute the cache key of a cluster from its members, independently of their order.
+
+    Parameters:
+        article_ids (Iterable[int]): The ids of the cluster's articles.
+        prompt_version (str): The version of the summary prompt.
+
+    Returns:
+        str: The SHA-256 hex digest of the prompt version and the sorted article ids.
+    """
+    members = ",".join(str(article_id) for article_id in sorted(int(article_id) for article_id in article_ids))
+    return hashlib.sha256(f"{prompt_version}\x00{members}".encode("utf-8")).hexdigest()
+
+
+def evict_cluster_summary_cache(
+    db: Session,
+    max_entries: int = settings.CLUSTER_SUMMARY_CACHE_MAX_ENTRIES,
+    ttl_hours: int = settings.CLUSTER_SUMMARY_CACHE_TTL_HOURS,
+) -> int:
+    """
+    Supprime les entrées expirées, puis les moins récemment utilisées au-delà de `max_entries`.
+
+    Parameters:
+        db (Session): La session de base de données.
+        max_entries (int): Taille maximale du cache.
+        ttl_hours (int): Durée de validité d'une entrée (heures).
+
+    Returns:
+        int: Le nombre d'entrées supprimées.
+    """
+    deleted = (
+        db.query(ClusterSummaryCacheEntry)
+        .filter(ClusterSummaryCacheEntry.created_at < datetime.utcnow() - timedelta(hours=ttl_hours))
+        .delete(synchronize_session=False)
+    )
+    excess = db.query(func.count(ClusterSummaryCacheEntry.key)).scalar() - max_entries
+    if excess > 0:
+        oldest_keys = (
+            db.query(ClusterSummaryCacheEntry.key)
+            .order_by(ClusterSummaryCacheEntry.last_used_at.asc())
+            .limit(excess)
+            .subquery()
+        )
+        deleted += (
+            db.query(ClusterSummaryCacheEntry)
+            .filter(ClusterSummaryCacheEntry.key.in_(db.query(oldest_keys.c.key)))
+            .delete(synchronize_session=False)
+        )
+    cluster_summary_cache_stats.record(evictions=deleted)
+    return deleted
+
+
+async def get_cluster_summaries_cached(
+    db: Session,
+    clusters: Dict[int, Tuple[List[int], str]],
+    generate: Callable[[Dict[int, str]], Awaitable[Dict[int, dict]]],
+    prompt_version: str = SUMMARY_AND_TITLE_PROMPT_VERSION,
+    ttl_hours: int = settings.CLUSTER_SUMMARY_CACHE_TTL_HOURS,
+    max_entries: int = settings.CLUSTER_SUMMARY_CACHE_MAX_ENTRIES,
+) -> Dict[int, dict]:
+    """
+    Retourne le titre et le résumé de chaque cluster en consultant d'abord le cache
+    persistant ; seuls les clusters dont la composition n'a pas encore été résumée
+    (ou dont l'entrée a expiré) sont envoyés au LLM.
+
+    Les écritures du cache ne sont pas validées : l'appelant valide sa transaction une
+    seule fois (un commit ici expirerait les articles de sa session).
+
+    Parameters:
+        db (Session): La session de base de données.
+        clusters (Dict[int, Tuple[List[int], str]]): Pour chaque cluster, les identifiants
+            de ses articles et le texte à résumer.
+        generate (Callable): Coroutine qui génère les titres et résumés d'un dictionnaire {cluster_id: texte}
+            et renvoie {cluster_id: {"title": ..., "summary": ...}}.
+        prompt_version (str): Version du prompt (une nouvelle version invalide le cache).
+        ttl_hours (int): Durée de validité d'une entrée (heures).
+        max_entries (int): Taille maximale du cache après insertion.
+
+    Returns:
+        Dict[int, dict]: {cluster_id: {"title": ..., "summary": ...}}.
+    """
+    if not settings.CLUSTER_SUMMARY_CACHE_ENABLED:
+        return await generate({cluster_id: text for cluster_id, (_, text) in clusters.items()})
+    if not clusters:
+        return {}
+
+    keys = {
+        cluster_id: cluster_summary_key(article_ids, prompt_version)
+        for cluster_id, (article_ids, _) in clusters.items()
+    }
+    now = datetime.utcnow()
+
+    cached: Dict[str, dict] = {
+        entry.key: {"title": entry.title, "summary": entry.summary}
+        for entry in db.query(ClusterSummaryCacheEntry.key, ClusterSummaryCacheEntry.title, ClusterSummaryCacheEntry.summary)
+        .filter(
+            ClusterSummaryCacheEntry.key.in_(set(keys.values())),
+            ClusterSummaryCacheEntry.created_at >= now - timedelta(hours=ttl_hours),
+        )
+    }
+    if cached:
+        db.query(ClusterSummaryCacheEntry).filter(ClusterSummaryCacheEntry.key.in_(cached.keys())).update(
+            {ClusterSummaryCacheEntry.last_used_at: now}, synchronize_session=False
+        )
+
+    missing = {cluster_id: clusters[cluster_id][1] for cluster_id, key in keys.items() if key not in cached}
+    cluster_summary_cache_stats.record(hits=len(keys) - len(missing), misses=len(missing))
+
+    generated: Dict[int, dict] = {}
+    if missing:
+        generated = await generate(missing)
+        rows = [
+            {
+                'key': keys[cluster_id],
+                'prompt_version': prompt_version,
+                'title': result['title'],
+                'summary': result['summary'],
+                'created_at': now,
+                'last_used_at': now,
+            }
+            # Les réponses que le LLM n'a pas formatées correctement ne sont pas mises en cache
+            for cluster_id, result in generated.items()
+            if result.get('title') and result.get('summary')
+        ]
+        if rows:
+            # Une entrée expirée est remplacée
+            statement = dialect_insert(db)(ClusterSummaryCacheEntry).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=["key"],
+                set_={
+                    'title': statement.excluded.title,
+                    'summary': statement.excluded.summary,
+                    'created_at': statement.excluded.created_at,
+                    'last_used_at': statement.excluded.last_used_at,
+                },
+            ))
+        evict_cluster_summary_cache(db, max_entries, ttl_hours)
+
+    db.flush()
+    return {
+        cluster_id: cached[key] if key in cached else generated.get(cluster_id, {})
+        for cluster_id, key in keys.items()
+    }
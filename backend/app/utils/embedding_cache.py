@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import threading
+import time
+import unicodedata
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal, dialect_insert
+from ..models import EmbeddingCacheEntry
+from .embeddings import EmbeddingProvider, generate_embeddings_batch, get_embedding_provider
+
+
+class CacheStats:
+    """
+    Compteurs d'un cache persistant pour le processus courant.
+
+    Attributes:
+        hits (int): Nombre d'éléments servis depuis le cache.
+        misses (int): Nombre d'éléments qui ont dû être générés.
+        evictions (int): Nombre d'entrées supprimées par la politique LRU.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Return the current counters and hit ratio.
+
+        Returns:
+            Dict[str, float]: hits, misses, evictions and hit_ratio.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+embedding_cache_stats = CacheStats()
+
+
+def embedding_cache_key(text: str, model: str) -> str:
+    """
+    Compute the cache key of a text for a given embedding model.
+
+    Parameters:
+        text (str): The cleaned text.
+        model (str): The embedding model name.
+
+    Returns:
+        str: The SHA-256 hex digest of the model and the text.
+    """
+    return hashlib.sha256(f"{model}\x00{text.strip()}".encode("utf-8")).hexdigest()
+
+
+def evict_embedding_cache(db: Session, max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES) -> int:
+    """
+    Supprime les entrées les moins récemment utilisées au-delà de `max_entries`.
+
+    Parameters:
+        db (Session): La session de base de données.
+        max_entries (int): Taille maximale du cache.
+
+    Returns:
+        int: Le nombre d'entrées supprimées.
+    """
+    excess = db.query(func.count(EmbeddingCacheEntry.key)).scalar() - max_entries
+    if excess <= 0:
+        return 0
+    oldest_keys = (
+        db.query(EmbeddingCacheEntry.key)
+        .order_by(EmbeddingCacheEntry.last_used_at.asc())
+        .limit(excess)
+        .subquery()
+    )
+    deleted = (
+        db.query(EmbeddingCacheEntry)
+        .filter(EmbeddingCacheEntry.key.in_(db.query(oldest_keys.c.key)))
+        .delete(synchronize_session=False)
+    )
+    embedding_cache_stats.record(evictions=deleted)
+    return deleted
+
+
+def get_embeddings_cached(
+    db: Session,
+    texts: List[str],
+    provider: Optional[EmbeddingProvider] = None,
+    max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES,
+) -> List[List[float]]:
+    """
+    Retourne les embeddings des textes en consultant d'abord le cache persistant ;
+    seuls les textes absents du cache sont envoyés au fournisseur, en appels groupés.
+
+    Parameters:
+        db (Session): La session de base de données.
+        texts (List[str]): Les textes nettoyés à encoder.
+        provider (Optional[EmbeddingProvider]): Le fournisseur à utiliser (défaut : celui configuré).
+        max_entries (int): Taille maximale du cache après insertion.
+
+    Returns:
+        List[List[float]]: Les embeddings, dans le même ordre que `texts`.
+    """
+    provider = provider or get_embedding_provider()
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return generate_embeddings_batch(texts, provider=provider)
+    if not texts:
+        return []
+
+    keys = [embedding_cache_key(text, provider.model_name) for text in texts]
+    unique_keys = set(keys)
+    now = datetime.utcnow()
+
+    cached: Dict[str, List[float]] = {
+        entry.key: np.frombuffer(entry.embedding, dtype=np.float32).tolist()
+        for entry in db.query(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding)
+        .filter(EmbeddingCacheEntry.key.in_(unique_keys))
+    }
+    if cached:
+        db.query(EmbeddingCacheEntry).filter(EmbeddingCacheEntry.key.in_(cached.keys())).update(
+            {EmbeddingCacheEntry.last_used_at: now}, synchronize_session=False
+        )
+
+    # Un seul appel par texte distinct absent du cache
+    missing: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+    embedding_cache_stats.record(hits=len(keys) - len(missing), misses=len(missing))
+
+    if missing:
+        generated = generate_embeddings_batch(list(missing.values()), provider=provider)
+        rows = []
+        for key, embedding in zip(missing.keys(), generated):
+            vector = np.asarray(embedding, dtype=np.float32)
+            cached[key] = vector.tolist()
+            rows.append({
+                'key': key,
+                'model': provider.model_name,
+                'embedding': vector.tobytes(),
+                'created_at': now,
+                'last_used_at': now,
+            })
+        db.execute(
+            dialect_insert(db)(EmbeddingCacheEntry).values(rows).on_conflict_do_nothing(index_elements=["key"])
+        )
+        evict_embedding_cache(db, max_entries)
+
+    db.commit()
+    return [cached[key] for key in keys]
+
+
+def get_embedding_cached(db: Session, text: str) -> List[float]:
+    """
+    Retourne l'embedding d'un seul texte en consultant le cache persistant.
+
+    Parameters:
+        db (Session): La session de base de données.
+        text (str): Le texte à encoder.
+
+    Returns:
+        List[float]: L'embedding.
+    """
+    return get_embeddings_cached(db, [text])[0]
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalise une requête de recherche (Unicode NFKC, espaces réduits, casse ignorée),
+    pour que ses variantes triviales partagent le même embedding.
+
+    Parameters:
+        text (str): La requête saisie.
+
+    Returns:
+        str: La requête normalisée, qui est aussi le texte encodé.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split()).casefold()
+
+
+def load_query_embedding(text: str) -> List[float]:
+    """
+    Charge l'embedding d'une requête via le cache persistant, dans une session dédiée
+    (appelé dans un thread, indépendamment de la session de la requête HTTP).
+    """
+    db = SessionLocal()
+    try:
+        return get_embedding_cached(db, text)
+    finally:
+        db.close()
+
+
+class QueryEmbeddingCache:
+    """
+    Cache mémoire LRU/TTL des embeddings de requêtes de recherche, devant le cache
+    persistant. Les requêtes identiques simultanées (après normalisation) partagent un
+    seul chargement, exécuté dans un thread pour ne pas bloquer la boucle d'événements.
+
+    Attributes:
+        stats (CacheStats): Les requêtes coalescées comptent comme des hits.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], List[float]] = load_query_embedding,
+        max_entries: int = settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds: float = settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Chargements en cours, par boucle d'événements (une tâche n'est attendue que sur sa boucle)
+        self._inflight = weakref.WeakKeyDictionary()
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return embedding
+
+    def _store(self, key: str, embedding: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, embedding)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        self.stats.record(evictions=evicted)
+
+    async def _load(self, key: str) -> np.ndarray:
+        embedding = np.asarray(await asyncio.to_thread(self.loader, key), dtype=np.float32)
+        embedding.setflags(write=False)
+        self._store(key, embedding)
+        return embedding
+
+    async def get(self, text: str) -> np.ndarray:
+        """
+        Retourne l'embedding d'une requête de recherche.
+
+        Parameters:
+            text (str): La requête saisie.
+
+        Returns:
+            np.ndarray: L'embedding float32 (en lecture seule, partagé entre les requêtes).
+        """
+        key = normalize_query(text)
+        embedding = self._lookup(key)
+        if embedding is not None:
+            self.stats.record(hits=1)
+            return embedding
+
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is None:
+            self.stats.record(misses=1)
+            task = inflight[key] = asyncio.ensure_future(self._load(key))
+            task.add_done_callback(lambda done: inflight.pop(key, None) if inflight.get(key) is done else None)
+        else:
+            self.stats.record(hits=1)
+        # shield : l'annulation d'une requête HTTP n'interrompt pas le chargement partagé
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache partagé par toutes les recherches du processus
+query_embedding_cache = QueryEmbeddingCache()
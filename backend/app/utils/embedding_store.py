@@ -0,0 +1,314 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Article
+
+META_FILE = "meta.json"
+
+
+class EmbeddingStore:
+    """
+    Copie locale, mappée en mémoire, des embeddings des articles récents.
+
+    Le répertoire `path` contient, pour chaque génération g :
+        - vectors-g.f32 : matrice float32 (capacité, dimension) ;
+        - ids-g.i64 : identifiants des articles, croissants (index par recherche dichotomique) ;
+        - published-g.i64 : dates de publication (secondes epoch), pour la fenêtre glissante ;
+    et meta.json, qui désigne la génération courante et le nombre de lignes valides.
+
+    Un seul processus écrit (le worker d'ingestion, sous le verrou d'ingestion) : les
+    nouvelles lignes sont ajoutées au-delà du nombre de lignes publié, puis meta.json est
+    remplacé atomiquement. Quand des articles sortent de la fenêtre ou que la capacité
+    est atteinte, une nouvelle génération est écrite et les anciens fichiers supprimés
+    (les lecteurs qui les ont encore mappés les conservent jusqu'à leur rafraîchissement).
+    Les lecteurs mappent les fichiers en lecture seule : les pages sont partagées par
+    tous les processus via le cache du système.
+
+    Attributes:
+        path (str): Répertoire du store.
+        dimension (int): Dimension des embeddings.
+    """
+
+    def __init__(self, path: str, dimension: int = settings.EMBEDDING_DIMENSION):
+        self.path = path
+        self.dimension = dimension
+        self._meta_mtime = None
+        self._generation = None
+        self._count = 0
+        self._capacity = 0
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._published = np.empty(0, dtype=np.int64)
+        self._norms = None
+
+    # --- Lecture ---
+
+    def _file(self, name: str, generation: int) -> str:
+        return os.path.join(self.path, f"{name}-{generation}.{'f32' if name == 'vectors' else 'i64'}")
+
+    def _map(self, generation: int, capacity: int, mode: str = "r"):
+        if capacity == 0:
+            return (
+                np.empty((0, self.dimension), dtype=np.float32),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int64),
+            )
+        return (
+            np.memmap(self._file("vectors", generation), dtype=np.float32, mode=mode, shape=(capacity, self.dimension)),
+            np.memmap(self._file("ids", generation), dtype=np.int64, mode=mode, shape=(capacity,)),
+            np.memmap(self._file("published", generation), dtype=np.int64, mode=mode, shape=(capacity,)),
+        )
+
+    def refresh(self) -> None:
+        """
+        Relit meta.json s'il a changé et remappe les fichiers si la génération a changé.
+        """
+        for _ in range(3):
+            try:
+                mtime = os.stat(os.path.join(self.path, META_FILE)).st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._meta_mtime:
+                return
+            with open(os.path.join(self.path, META_FILE)) as f:
+                meta = json.load(f)
+            if meta["dimension"] != self.dimension:
+                raise ValueError(f"Store d'embeddings de dimension {meta['dimension']}, {self.dimension} attendue")
+            if meta["generation"] != self._generation or meta["capacity"] != self._capacity:
+                try:
+                    self._vectors, self._ids, self._published = self._map(meta["generation"], meta["capacity"])
+                except FileNotFoundError:
+                    # Génération remplacée entre la lecture de meta.json et le mappage
+                    continue
+                self._generation, self._capacity = meta["generation"], meta["capacity"]
+            self._count = meta["count"]
+            self._meta_mtime = mtime
+            self._norms = None
+            return
+
+    def __len__(self) -> int:
+        self.refresh()
+        return self._count
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne, sans copie, les identifiants et la matrice (en lecture seule) des articles du store.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Les identifiants (n,) et les embeddings (n, dimension).
+        """
+        self.refresh()
+        return self._ids[:self._count], self._vectors[:self._count]
+
+    def rows_for(self, article_ids) -> np.ndarray:
+        """
+        Retourne la ligne de chaque article dans la matrice, ou -1 s'il n'est pas dans le store.
+
+        Parameters:
+            article_ids: Les identifiants des articles.
+
+        Returns:
+            np.ndarray: Les lignes correspondantes.
+        """
+        ids, _ = self.view()
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        rows = np.searchsorted(ids, article_ids)
+        found = rows < len(ids)
+        found[found] = ids[rows[found]] == article_ids[found]
+        return np.where(found, rows, -1)
+
+    def get(self, article_ids) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copie les embeddings des articles demandés présents dans le store.
+
+        Parameters:
+            article_ids: Les identifiants des articles.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: La matrice (m, dimension) des embeddings trouvés et
+                les positions, dans `article_ids`, des m articles correspondants.
+        """
+        rows = self.rows_for(article_ids)
+        positions = np.flatnonzero(rows >= 0)
+        return np.ascontiguousarray(self._vectors[rows[positions]]), positions
+
+    def nearest(self, query, limit: int = 20, exclude: Optional[int] = None) -> Tuple[List[int], np.ndarray]:
+        """
+        Recherche exhaustive des articles les plus proches d'un vecteur (distance L2,
+        comme l'opérateur `<->` de pgvector).
+
+        Parameters:
+            query: Le vecteur de requête.
+            limit (int): Nombre maximal d'articles retournés.
+            exclude (Optional[int]): Article à exclure des résultats (l'article de référence).
+
+        Returns:
+            Tuple[List[int], np.ndarray]: Les identifiants des articles, du plus proche au plus
+                éloigné, et leurs distances.
+        """
+        ids, vectors = self.view()
+        if not len(ids) or limit <= 0:
+            return [], np.empty(0, dtype=np.float32)
+        if self._norms is None:
+            self._norms = np.einsum("ij,ij->i", vectors, vectors)
+        query = np.asarray(query, dtype=np.float32)
+        # |v - q|² = |v|² - 2 v.q + |q|², sans matrice intermédiaire des différences
+        distances = self._norms - 2 * (vectors @ query) + float(query @ query)
+        candidates = len(ids)
+        if exclude is not None:
+            excluded = ids == exclude
+            distances[excluded] = np.inf
+            candidates -= int(excluded.sum())
+        count = min(limit, candidates)
+        if count <= 0:
+            return [], np.empty(0, dtype=np.float32)
+        top = np.argpartition(distances, count - 1)[:count]
+        top = top[np.argsort(distances[top], kind="stable")]
+        return ids[top].tolist(), np.sqrt(np.maximum(distances[top], 0))
+
+    def related(self, article_id: int, limit: int = 10) -> Optional[List[int]]:
+        """
+        Retourne les articles les plus proches d'un article du store.
+
+        Parameters:
+            article_id (int): L'article de référence.
+            limit (int): Nombre maximal d'articles retournés.
+
+        Returns:
+            Optional[List[int]]: Les identifiants des articles proches, ou None si l'article
+                n'est pas dans le store.
+        """
+        row = int(self.rows_for([article_id])[0])
+        if row < 0:
+            return None
+        return self.nearest(self._vectors[row], limit, exclude=article_id)[0]
+
+    # --- Écriture (worker d'ingestion uniquement) ---
+
+    def _publish(self, generation: int, capacity: int, count: int) -> None:
+        temporary = os.path.join(self.path, f"{META_FILE}.tmp")
+        with open(temporary, "w") as f:
+            json.dump({"generation": generation, "capacity": capacity, "count": count, "dimension": self.dimension}, f)
+        os.replace(temporary, os.path.join(self.path, META_FILE))
+
+    def _rewrite(self, ids: np.ndarray, published: np.ndarray, vectors: np.ndarray) -> None:
+        generation = (self._generation or 0) + 1
+        capacity = max(2 * len(ids), 1024)
+        for name in ("vectors", "ids", "published"):
+            with open(self._file(name, generation), "wb") as f:
+                f.truncate(capacity * (4 * self.dimension if name == "vectors" else 8))
+        new_vectors, new_ids, new_published = self._map(generation, capacity, mode="r+")
+        new_vectors[:len(ids)] = vectors
+        new_ids[:len(ids)] = ids
+        new_published[:len(ids)] = published
+        for array in (new_vectors, new_ids, new_published):
+            array.flush()
+        del new_vectors, new_ids, new_published
+        self._publish(generation, capacity, len(ids))
+        for name in os.listdir(self.path):
+            stem, _, suffix = name.rpartition("-")
+            if stem in ("vectors", "ids", "published") and suffix.split(".")[0] != str(generation):
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+    def append(self, ids, published, vectors, cutoff: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Ajoute des embeddings (identifiants croissants, supérieurs à ceux du store) et retire
+        les articles publiés avant `cutoff`.
+
+        Parameters:
+            ids: Les identifiants des nouveaux articles.
+            published: Leurs dates de publication (secondes epoch).
+            vectors: Leurs embeddings (m, dimension).
+            cutoff (Optional[datetime]): Début de la fenêtre conservée.
+
+        Returns:
+            Dict[str, int]: Le nombre d'articles ajoutés ("added"), retirés ("evicted") et conservés ("size").
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self.refresh()
+        ids = np.asarray(ids, dtype=np.int64)
+        published = np.asarray(published, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimension)
+        count = self._count
+        keep = np.ones(count, dtype=bool)
+        if cutoff is not None:
+            keep = np.asarray(self._published[:count]) >= int(cutoff.timestamp())
+        evicted = int(count - keep.sum())
+
+        if evicted or count + len(ids) > self._capacity:
+            self._rewrite(
+                np.concatenate([self._ids[:count][keep], ids]),
+                np.concatenate([self._published[:count][keep], published]),
+                np.concatenate([self._vectors[:count][keep], vectors]),
+            )
+        elif len(ids):
+            # Les lecteurs ne voient les nouvelles lignes qu'une fois meta.json remplacé
+            writable = self._map(self._generation, self._capacity, mode="r+")
+            for target, values in zip(writable, (vectors, ids, published)):
+                target[count:count + len(ids)] = values
+                target.flush()
+            del writable
+            self._publish(self._generation, self._capacity, count + len(ids))
+        # Relecture forcée : meta.json peut avoir été remplacé dans la même tranche de mtime
+        self._meta_mtime = None
+        self.refresh()
+        return {"added": len(ids), "evicted": evicted, "size": self._count}
+
+    def sync(self, db: Session, window_days: int = settings.EMBEDDING_STORE_WINDOW_DAYS, chunk_size: int = 1000) -> Dict[str, int]:
+        """
+        Met le store à jour de façon incrémentale : ajoute les articles insérés depuis la
+        dernière synchronisation (identifiant supérieur au dernier du store) et publiés dans
+        la fenêtre, et retire ceux qui en sont sortis.
+
+        Parameters:
+            db (Session): La session de base de données.
+            window_days (int): Taille de la fenêtre (jours).
+            chunk_size (int): Nombre de lignes lues par aller-retour.
+
+        Returns:
+            Dict[str, int]: Le résultat de `append`.
+        """
+        self.refresh()
+        cutoff = datetime.utcnow() - timedelta(days=window_days)
+        last_id = int(self._ids[self._count - 1]) if self._count else 0
+        rows = (
+            db.query(Article.id, Article.published_at, Article.embedding)
+            .filter(Article.id > last_id, Article.published_at >= cutoff, Article.embedding.isnot(None))
+            .order_by(Article.id)
+            .yield_per(chunk_size)
+        )
+        ids, published, vectors = [], [], []
+        for article_id, published_at, embedding in rows:
+            ids.append(article_id)
+            published.append(int(published_at.timestamp()))
+            vectors.append(embedding)
+        return self.append(
+            ids, published, np.vstack(vectors) if vectors else np.empty((0, self.dimension), np.float32), cutoff
+        )
+
+
+_store: Optional[EmbeddingStore] = None
+
+
+def get_embedding_store() -> Optional[EmbeddingStore]:
+    """
+    Retourne le store d'embeddings du processus, ou None s'il est désactivé.
+
+    Returns:
+        Optional[EmbeddingStore]: Le store partagé.
+    """
+    global _store
+    if not settings.EMBEDDING_STORE_ENABLED:
+        return None
+    if _store is None:
+        _store = EmbeddingStore(settings.EMBEDDING_STORE_PATH)
+    return _store
@@ -0,0 +1,211 @@
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from ..config import settings
+
+
+class EmbeddingProvider:
+    """
+    Interface commune des fournisseurs d'embeddings.
+
+    Attributes:
+        model_name (str): Nom du modèle utilisé (sert aussi de clé de cache).
+        dimension (int): Dimension des vecteurs produits.
+    """
+    model_name: str = ""
+    dimension: int = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts in a single call.
+
+        Parameters:
+            texts (List[str]): The texts to encode.
+
+        Returns:
+            List[List[float]]: One embedding per text, in the same order.
+        """
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Generate the embedding of a single text.
+
+        Parameters:
+            text (str): The text to encode.
+
+        Returns:
+            List[float]: The embedding.
+        """
+        return self.embed_documents([text])[0]
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Fournisseur d'embeddings OpenAI via LangChain.
+    """
+
+    def __init__(self, model_name: str = settings.EMBEDDING_MODEL, dimension: int = settings.EMBEDDING_DIMENSION):
+        from langchain_openai import OpenAIEmbeddings
+
+        self.model_name = model_name
+        self.dimension = dimension
+        self._client = OpenAIEmbeddings(model=model_name, openai_api_key=settings.OPENAI_API_KEY)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._client.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._client.embed_query(text)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Fournisseur d'embeddings déterministe et hors ligne (feature hashing des mots).
+
+    Deux textes identiques donnent toujours le même vecteur et des textes partageant
+    des mots donnent des vecteurs proches, ce qui suffit pour les tests et les benchmarks.
+
+    Attributes:
+        latency (float): Délai simulé (en secondes) par appel, pour imiter un aller-retour réseau.
+    """
+
+    def __init__(self, dimension: int = settings.EMBEDDING_DIMENSION, latency: float = 0.0):
+        self.model_name = f"local-hash-{dimension}"
+        self.dimension = dimension
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimension] += 1.0 if (value >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+
+_provider: Optional[EmbeddingProvider] = None
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Return the process-wide embedding provider selected by `EMBEDDING_PROVIDER`.
+
+    Returns:
+        EmbeddingProvider: The configured provider.
+
+    Raises:
+        ValueError: If the configured provider is unknown.
+    """
+    global _provider
+    if _provider is None:
+        if settings.EMBEDDING_PROVIDER == "openai":
+            _provider = OpenAIEmbeddingProvider()
+        elif settings.EMBEDDING_PROVIDER == "local":
+            _provider = LocalEmbeddingProvider()
+        else:
+            raise ValueError(f"Fournisseur d'embeddings inconnu : {settings.EMBEDDING_PROVIDER}")
+    return _provider
+
+
+def set_embedding_provider(provider: Optional[EmbeddingProvider]) -> None:
+    """
+    Replace the process-wide embedding provider (None resets to the configured one).
+
+    Parameters:
+        provider (Optional[EmbeddingProvider]): The provider to use.
+    """
+    global _provider
+    _provider = provider
+
+
+def generate_embeddings_batch(
+    texts: List[str],
+    chunk_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    provider: Optional[EmbeddingProvider] = None,
+) -> List[List[float]]:
+    """
+    Génère les embeddings d'une liste de textes par lots, avec une concurrence bornée.
+
+    Parameters:
+        texts (List[str]): Les textes à encoder.
+        chunk_size (Optional[int]): Nombre de textes par appel (défaut : EMBEDDING_BATCH_SIZE).
+        max_concurrency (Optional[int]): Nombre maximal d'appels simultanés (défaut : EMBEDDING_MAX_CONCURRENCY).
+        provider (Optional[EmbeddingProvider]): Le fournisseur à utiliser (défaut : celui configuré).
+
+    Returns:
+        List[List[float]]: Les embeddings, dans le même ordre que `texts`.
+    """
+    if not texts:
+        return []
+    provider = provider or get_embedding_provider()
+    chunk_size = max(1, chunk_size or settings.EMBEDDING_BATCH_SIZE)
+    max_concurrency = max(1, max_concurrency or settings.EMBEDDING_MAX_CONCURRENCY)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if len(chunks) == 1 or max_concurrency == 1:
+        results = [provider.embed_documents(chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+            results = list(executor.map(provider.embed_documents, chunks))
+
+    return [embedding for chunk_embeddings in results for embedding in chunk_embeddings]
+
+
+@lru_cache(maxsize=8)
+def _pgvector_format(dimension: int) -> str:
+    # 9 chiffres significatifs suffisent à restituer exactement un float32
+    return "[" + ",".join(["%.9g"] * dimension) + "]"
+
+
+def format_pgvector(vector) -> Optional[str]:
+    """
+    Serialize a vector (list or array) to the pgvector text form, e.g. "[0.1,0.2]",
+    with a single formatting call instead of one `str` per component.
+
+    Parameters:
+        vector: The vector, or None.
+
+    Returns:
+        Optional[str]: The pgvector literal, or None if there is no vector.
+    """
+    if vector is None or isinstance(vector, str):
+        return vector
+    values = np.asarray(vector, dtype=np.float32).ravel().tolist()
+    return _pgvector_format(len(values)) % tuple(values)
+
+
+def embedding_to_array(value) -> Optional[np.ndarray]:
+    """
+    Convert an embedding read from the database to a float32 vector: binary pgvector
+    form (`vector_send`: dimension and reserved field on 2 bytes each, then big-endian
+    float32 components), pgvector text such as "[0.1,0.2]", list or array.
+
+    Parameters:
+        value: The stored embedding, or None.
+
+    Returns:
+        Optional[np.ndarray]: The float32 vector, or None if there is no embedding.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=">f4", offset=4).astype(np.float32)
+    if isinstance(value, str):
+        return np.fromstring(value.strip("[]"), dtype=np.float32, sep=",")
+    return np.asarray(value, dtype=np.float32)
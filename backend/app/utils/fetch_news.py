@@ -1,4 +1,3 @@
-import requests
 from datetime import datetime
 from typing import List, Dict
 from ..config import settings
@@ -10,69 +9,60 @@ from sqlalchemy.orm import Session
 from ..utils.openai import generate_embedding
 from ..database import SessionLocal
 from ..models import Article
-from ..crud import add_articles_to_db
+from .newsapi_client import NewsAPIClient
+from .near_duplicates import backfill_signatures
+from ..crud import seed_ingestion_coverage, get_next_uncovered_date
+from ..tasks.pipeline import run_pipeline
 
-def fetch_news_by_date(target_date: datetime.date) -> list:
+def fetch_news_by_date(target_date: datetime.date, query: str = 'news', max_pages: int = settings.NEWS_API_MAX_PAGES) -> list:
     """
-    Fetch les 100 articles les plus populaires pour une date spécifique.
+    Fetch les articles les plus populaires pour une date spécifique, sur plusieurs pages.
 
     Parameters:
         target_date (datetime.date): La date cible pour laquelle récupérer les articles.
+        query (str): Les mots-clés de recherche.
+        max_pages (int): Nombre maximal de pages de 100 articles à récupérer.
 
     Returns:
         list: Liste des articles formatés pour insertion dans la DB.
     """
-    url = "https://newsapi.org/v2/everything"
-    params = {
-        'apiKey': settings.NEWS_API_KEY,
-        'from': target_date.isoformat(),
-        'to': (target_date + timedelta(days=1)).isoformat(),
-        'sortBy': 'popularity',
-        'pageSize': 100,
-        'language': 'en',
-        'q': 'news',
-        'excludeDomains': 'yahoo.com'
-    }
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
-        raise Exception(f"Erreur lors de la récupération des articles: {response.status_code}, {response.text}")
+    async def fetch():
+        async with NewsAPIClient() as client:
+            return await client.fetch_day(target_date, query, max_pages=max_pages)
 
-    articles = []
-    for item in response.json().get('articles', []):
-        articles.append({
-            'title': item.get('title'),
-            'raw_text': item.get('content') or item.get('description'),
-            'summary': None,  # Résumé sera éventuellement ajouté plus tard
-            'published_at': datetime.fromisoformat(item['publishedAt'][:-1]),
-            'url': item.get('url')
-        })
-    return articles
+    return asyncio.run(fetch())
 
-def populate_function():
+def populate_function() -> dict:
     """
     Fonction pour récupérer et insérer les articles les plus populaires d'une date donnée.
-    À chaque appel, elle remonte d'un jour si des articles pour cette date existent déjà.
+    À chaque appel, elle remonte d'un jour si cette date a déjà été ingérée
+    (voir la table `ingestion_coverage`). Les articles traversent le pipeline en flux
+    (voir `app.tasks.pipeline`).
+
+    Returns:
+        dict: La date traitée ("date"), les compteurs "inserted" / "skipped" / "near_duplicates"
+            de l'ingestion et les métriques de chaque étape ("stages").
     """
     db: Session = SessionLocal()
-    target_date = datetime.utcnow().date() - timedelta(days=2)
-
-    while True:
-        # Vérifier si des articles pour la date cible existent déjà
-        articles_for_date = db.query(Article).filter(Article.published_at >= target_date,
-                                                     Article.published_at < target_date + timedelta(days=1)).all()
-
-        if articles_for_date:
-            print(f"[INFO] Articles déjà présents pour le {target_date}, passage au jour précédent.")
-            target_date -= timedelta(days=1)
-        else:
-            break
+    try:
+        seed_ingestion_coverage(db)
+        if settings.NEAR_DUPLICATE_ENABLED:
+            backfill_signatures(db)
+        # Prochaine date non couverte, sans charger les articles
+        target_date = get_next_uncovered_date(db, datetime.utcnow().date() - timedelta(days=2))
+    finally:
+        db.close()
 
     print(f"[INFO] Récupération des articles pour le {target_date}.")
-    
-    # Fetch des articles pour cette date via l’API
-    articles_data = fetch_news_by_date(target_date)
-    
-    # Utilisation de la fonction `add_articles_to_db`
-    add_articles_to_db(db, articles_data)
 
-    db.close()
+    # Fetch, nettoyage, dédoublonnage, embedding et écriture en flux ;
+    # la date n'est marquée comme couverte que si aucun lot n'a échoué
+    result = run_pipeline([(target_date, 'news')])
+
+    return {
+        "date": target_date,
+        "inserted": result["inserted"],
+        "skipped": result["skipped"],
+        "near_duplicates": result["near_duplicates"],
+        "stages": result["stages"],
+    }
@@ -0,0 +1,191 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Article, ArticleSignature
+
+SIMHASH_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = SIMHASH_BITS // BAND_COUNT
+SHINGLE_SIZE = 3
+
+# Marqueur de troncature ajouté par NewsAPI à la fin de `content`
+_TRUNCATION_MARKER = re.compile(r"\s*\[\+\d+ chars\]\s*$")
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def simhash(text: str) -> int:
+    """
+    Calcule la SimHash 64 bits d'un texte à partir de ses shingles de mots.
+
+    Deux textes presque identiques (dépêche légèrement retouchée) ont des SimHash
+    distantes de quelques bits seulement.
+
+    Parameters:
+        text (str): Le texte nettoyé.
+
+    Returns:
+        int: La SimHash, entier non signé sur 64 bits.
+    """
+    tokens = re.findall(r"\w+", _TRUNCATION_MARKER.sub("", text).lower())
+    if len(tokens) >= SHINGLE_SIZE:
+        features = [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+    else:
+        features = tokens or [""]
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little") for f in features],
+        dtype=np.uint64,
+    )
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    weights = (2 * bits.astype(np.int64) - 1).sum(axis=0)
+    return int(sum(1 << i for i in np.flatnonzero(weights > 0)))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Return the number of differing bits between two SimHashes.
+    """
+    return bin(a ^ b).count("1")
+
+
+def simhash_bands(value: int) -> List[int]:
+    """
+    Découpe une SimHash en `BAND_COUNT` bandes de 16 bits.
+
+    Si deux SimHash diffèrent d'au plus `BAND_COUNT - 1` bits, au moins une bande est
+    identique (principe des tiroirs) : la recherche par bandes indexées trouve donc
+    tous les candidats sans parcourir le corpus.
+
+    Parameters:
+        value (int): La SimHash.
+
+    Returns:
+        List[int]: Les valeurs des bandes.
+    """
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & mask for i in range(BAND_COUNT)]
+
+
+def to_signed64(value: int) -> int:
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def signature_row(article_id: int, value: int) -> dict:
+    """
+    Build the `article_signatures` row of an article.
+    """
+    row = {'article_id': article_id, 'simhash': to_signed64(value)}
+    for i, band in enumerate(simhash_bands(value)):
+        row[f'band_{i}'] = band
+    return row
+
+
+def filter_near_duplicates(
+    db: Session,
+    articles: List[dict],
+    max_distance: int = settings.NEAR_DUPLICATE_MAX_DISTANCE,
+    index: Optional[dict] = None,
+) -> Tuple[List[dict], List[Tuple[dict, Optional[int]]]]:
+    """
+    Écarte les articles quasi identiques à un article déjà en base ou à un article
+    précédent du même lot. La SimHash de chaque article conservé est ajoutée sous la
+    clé 'simhash' pour être enregistrée après insertion.
+
+    Parameters:
+        db (Session): La session de base de données.
+        articles (List[dict]): Les articles candidats (texte nettoyé dans 'raw_text').
+        max_distance (int): Distance de Hamming maximale entre deux quasi-doublons
+            (au plus BAND_COUNT - 1 pour que la recherche par bandes soit exhaustive).
+        index (Optional[dict]): Index des SimHash acceptés lors d'appels précédents et pas
+            encore en base (ingestion en flux) ; il est complété par cet appel.
+
+    Returns:
+        Tuple[List[dict], List[Tuple[dict, Optional[int]]]]: Les articles conservés, et les
+            quasi-doublons écartés avec l'id de l'article canonique (None s'il est dans le lot).
+    """
+    if not articles:
+        return [], []
+    hashes = [simhash(article['raw_text']) for article in articles]
+
+    # Une seule requête indexée sur les bandes pour récupérer les candidats du corpus
+    band_values = defaultdict(set)
+    for value in hashes:
+        for i, band in enumerate(simhash_bands(value)):
+            band_values[i].add(band)
+    band_columns = [getattr(ArticleSignature, f'band_{i}') for i in range(BAND_COUNT)]
+    candidates = (
+        db.query(ArticleSignature.article_id, ArticleSignature.simhash)
+        .filter(or_(*(band_columns[i].in_(values) for i, values in band_values.items())))
+        .all()
+    )
+
+    if index is None:
+        index = {}
+    corpus_index: Dict[Tuple[int, int], List[Tuple[int, Optional[int]]]] = defaultdict(list)
+    for article_id, value in candidates:
+        for i, band in enumerate(simhash_bands(to_unsigned64(value))):
+            corpus_index[(i, band)].append((to_unsigned64(value), article_id))
+
+    kept, duplicates = [], []
+    for article, value in zip(articles, hashes):
+        canonical = None
+        for i, band in enumerate(simhash_bands(value)):
+            entries = corpus_index.get((i, band), []) + index.get((i, band), [])
+            match = next((entry for entry in entries if hamming_distance(entry[0], value) <= max_distance), None)
+            if match is not None:
+                canonical = match
+                break
+        if canonical is not None:
+            duplicates.append((article, canonical[1]))
+            continue
+        article['simhash'] = value
+        for i, band in enumerate(simhash_bands(value)):
+            index.setdefault((i, band), []).append((value, None))
+        kept.append(article)
+    return kept, duplicates
+
+
+def save_signatures(db: Session, signatures: List[Tuple[int, int]]) -> None:
+    """
+    Enregistre les SimHash des articles insérés.
+
+    Parameters:
+        db (Session): La session de base de données.
+        signatures (List[Tuple[int, int]]): Les couples (article_id, simhash).
+    """
+    if signatures:
+        db.execute(insert(ArticleSignature), [signature_row(article_id, value) for article_id, value in signatures])
+
+
+def backfill_signatures(db: Session, limit: int = 1000) -> int:
+    """
+    Calcule les SimHash des articles qui n'en ont pas encore (articles ingérés avant
+    la détection des quasi-doublons), par lots pour étaler le coût.
+
+    Parameters:
+        db (Session): La session de base de données.
+        limit (int): Nombre maximal d'articles traités.
+
+    Returns:
+        int: Le nombre de signatures ajoutées.
+    """
+    rows = (
+        db.query(Article.id, Article.raw_text)
+        .outerjoin(ArticleSignature, ArticleSignature.article_id == Article.id)
+        .filter(ArticleSignature.article_id.is_(None))
+        .limit(limit)
+        .all()
+    )
+    save_signatures(db, [(article_id, simhash(raw_text)) for article_id, raw_text in rows])
+    db.commit()
+    return len(rows)
@@ -0,0 +1,245 @@
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+import httpx
+
+from ..config import settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class NewsAPIError(Exception):
+    """
+    Erreur renvoyée par l'API NewsAPI après épuisement des tentatives.
+    """
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Erreur lors de la récupération des articles: {status_code}, {message}")
+        self.status_code = status_code
+
+
+def format_article(item: dict) -> dict:
+    """
+    Convertit un article NewsAPI au format attendu par `add_articles_to_db`.
+
+    Parameters:
+        item (dict): L'article brut renvoyé par l'API.
+
+    Returns:
+        dict: L'article formaté pour insertion dans la DB.
+    """
+    return {
+        'title': item.get('title'),
+        'raw_text': item.get('content') or item.get('description'),
+        'summary': None,  # Résumé sera éventuellement ajouté plus tard
+        'published_at': datetime.fromisoformat(item['publishedAt'][:-1]),
+        'url': item.get('url')
+    }
+
+
+def day_params(target_date: date, query: str) -> dict:
+    """
+    Build the `/everything` search parameters for the most popular articles of a day.
+    """
+    return {
+        'from': target_date.isoformat(),
+        'to': (target_date + timedelta(days=1)).isoformat(),
+        'sortBy': 'popularity',
+        'language': 'en',
+        'q': query,
+        'excludeDomains': 'yahoo.com'
+    }
+
+
+def _error_code(response: httpx.Response) -> Optional[str]:
+    try:
+        return response.json().get("code")
+    except ValueError:
+        return None
+
+
+class NewsAPIClient:
+    """
+    Client asynchrone pour NewsAPI, avec un pool de connexions partagé, la pagination,
+    des timeouts et des tentatives avec backoff exponentiel (respectant `Retry-After` sur 429).
+
+    À utiliser comme gestionnaire de contexte asynchrone :
+
+        async with NewsAPIClient() as client:
+            articles = await client.fetch_day(date(2024, 1, 1))
+    """
+
+    def __init__(
+        self,
+        api_key: str = settings.NEWS_API_KEY,
+        base_url: str = settings.NEWS_API_BASE_URL,
+        timeout: float = settings.NEWS_API_TIMEOUT,
+        max_connections: int = settings.NEWS_API_MAX_CONNECTIONS,
+        max_retries: int = settings.NEWS_API_MAX_RETRIES,
+        backoff: float = settings.NEWS_API_BACKOFF,
+        concurrency: int = settings.NEWS_API_CONCURRENCY,
+        page_size: int = settings.NEWS_API_PAGE_SIZE,
+    ):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.page_size = page_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def __aenter__(self) -> "NewsAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Ferme le pool de connexions.
+        """
+        await self._client.aclose()
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    return max(0.0, float(retry_after))
+                except ValueError:
+                    pass
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+    async def _get(self, path: str, params: dict) -> httpx.Response:
+        """
+        Exécute une requête GET avec tentatives et backoff.
+
+        Parameters:
+            path (str): Le chemin de l'endpoint (ex. "/everything").
+            params (dict): Les paramètres de la requête.
+
+        Returns:
+            httpx.Response: La réponse finale (réussie ou non retentable).
+
+        Raises:
+            NewsAPIError: Si la requête échoue encore après `max_retries` tentatives.
+        """
+        headers = {"X-Api-Key": self.api_key}
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with self._semaphore:
+                    response = await self._client.get(path, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error = NewsAPIError(response.status_code, response.text)
+            except httpx.TransportError as e:
+                error = NewsAPIError(0, repr(e))
+
+            if attempt == self.max_retries:
+                raise error
+            delay = self._retry_delay(attempt, response)
+            print(f"[WARNING] NewsAPI : {error}, nouvelle tentative dans {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def iter_pages(self, params: dict, max_pages: int = settings.NEWS_API_MAX_PAGES) -> AsyncIterator[List[dict]]:
+        """
+        Itère sur les pages d'articles bruts de l'endpoint `/everything`, au fil de l'eau.
+
+        La pagination s'arrête quand toutes les pages ont été lues, quand `max_pages` est
+        atteint ou quand l'API signale la limite de résultats de l'abonnement.
+
+        Parameters:
+            params (dict): Les paramètres de recherche (sans `page` ni `pageSize`).
+            max_pages (int): Nombre maximal de pages à récupérer.
+
+        Yields:
+            List[dict]: Les articles bruts de chaque page.
+
+        Raises:
+            NewsAPIError: Si une page ne peut pas être récupérée.
+        """
+        seen = 0
+        for page in range(1, max_pages + 1):
+            response = await self._get("/everything", {**params, 'page': page, 'pageSize': self.page_size})
+            if response.status_code != 200:
+                # Limite de résultats de l'abonnement : on garde les pages déjà lues
+                if page > 1 and _error_code(response) == "maximumResultsReached":
+                    return
+                raise NewsAPIError(response.status_code, response.text)
+
+            payload = response.json()
+            page_items = payload.get('articles', [])
+            seen += len(page_items)
+            yield page_items
+            if len(page_items) < self.page_size or seen >= payload.get('totalResults', 0):
+                return
+
+    async def fetch_everything(self, params: dict, max_pages: int = settings.NEWS_API_MAX_PAGES) -> List[dict]:
+        """
+        Récupère tous les articles bruts de l'endpoint `/everything` (voir `iter_pages`).
+
+        Parameters:
+            params (dict): Les paramètres de recherche (sans `page` ni `pageSize`).
+            max_pages (int): Nombre maximal de pages à récupérer.
+
+        Returns:
+            List[dict]: Les articles bruts.
+
+        Raises:
+            NewsAPIError: Si une page ne peut pas être récupérée.
+        """
+        items = []
+        async for page_items in self.iter_pages(params, max_pages=max_pages):
+            items.extend(page_items)
+        return items
+
+    async def fetch_day(self, target_date: date, query: str = 'news', max_pages: int = settings.NEWS_API_MAX_PAGES) -> List[dict]:
+        """
+        Récupère les articles les plus populaires pour une date et une requête.
+
+        Parameters:
+            target_date (date): La date cible.
+            query (str): Les mots-clés de recherche.
+            max_pages (int): Nombre maximal de pages à récupérer.
+
+        Returns:
+            List[dict]: Liste des articles formatés pour insertion dans la DB.
+        """
+        items = await self.fetch_everything(day_params(target_date, query), max_pages=max_pages)
+        return [format_article(item) for item in items]
+
+    async def iter_day_pages(self, target_date: date, query: str = 'news', max_pages: int = settings.NEWS_API_MAX_PAGES) -> AsyncIterator[List[dict]]:
+        """
+        Itère sur les pages d'articles formatés d'une date et d'une requête.
+
+        Parameters:
+            target_date (date): La date cible.
+            query (str): Les mots-clés de recherche.
+            max_pages (int): Nombre maximal de pages à récupérer.
+
+        Yields:
+            List[dict]: Les articles formatés de chaque page.
+        """
+        async for page_items in self.iter_pages(day_params(target_date, query), max_pages=max_pages):
+            yield [format_article(item) for item in page_items]
+
+    async def fetch_many(self, requests: Iterable[Tuple[date, str]], max_pages: int = settings.NEWS_API_MAX_PAGES) -> List[List[dict]]:
+        """
+        Récupère en parallèle plusieurs couples (date, requête), dans la limite de
+        concurrence du client.
+
+        Parameters:
+            requests (Iterable[Tuple[date, str]]): Les couples (date, requête) à récupérer.
+            max_pages (int): Nombre maximal de pages par couple.
+
+        Returns:
+            List[List[dict]]: Les articles formatés de chaque couple, dans l'ordre des requêtes.
+        """
+        return await asyncio.gather(*(
+            self.fetch_day(target_date, query, max_pages=max_pages) for target_date, query in requests
+        ))
@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sqlalchemy import desc, insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Article, ArticleCluster, OnlineCluster
+from .embeddings import embedding_to_array
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _centroid(cluster: OnlineCluster) -> np.ndarray:
+    return np.frombuffer(cluster.centroid, dtype=np.float32).copy()
+
+
+def assign_articles(
+    db: Session,
+    embeddings: List[Tuple[int, list]],
+    threshold: float = settings.ONLINE_CLUSTER_DISTANCE_THRESHOLD,
+) -> Dict[int, int]:
+    """
+    Affecte chaque article au cluster dont le centroïde est le plus proche (distance
+    cosinus), ou ouvre un nouveau cluster au-delà de `threshold`. Les centroïdes sont
+    mis à jour en moyenne glissante : O(k) par article, sans réapprentissage.
+
+    Ne valide pas la transaction : l'appelant valide avec l'insertion des articles.
+
+    Parameters:
+        db (Session): La session de base de données.
+        embeddings (List[Tuple[int, list]]): Les couples (article_id, embedding) à affecter.
+        threshold (float): Distance cosinus maximale à un centroïde existant.
+
+    Returns:
+        Dict[int, int]: Le cluster de chaque article.
+    """
+    if not embeddings:
+        return {}
+    vectors = np.asarray([embedding for _, embedding in embeddings], dtype=np.float32)
+    clusters = db.query(OnlineCluster).all()
+    centroids = np.vstack([_centroid(c) for c in clusters]) if clusters else np.empty((0, vectors.shape[1]), np.float32)
+    sizes = [cluster.size for cluster in clusters]
+    units = _unit(centroids)
+    now = datetime.utcnow()
+
+    assignments: List[Tuple[int, int]] = []
+    touched = set()
+    for (article_id, _), vector in zip(embeddings, vectors):
+        index = None
+        if len(clusters):
+            similarities = units @ _unit(vector)
+            index = int(np.argmax(similarities))
+            if 1 - similarities[index] > threshold:
+                index = None
+        if index is None:
+            cluster = OnlineCluster(centroid=vector.tobytes(), size=0, created_at=now, updated_at=now)
+            db.add(cluster)
+            clusters.append(cluster)
+            centroids = np.vstack([centroids, vector])
+            units = np.vstack([units, _unit(vector)])
+            sizes.append(0)
+            index = len(clusters) - 1
+        centroids[index] = (centroids[index] * sizes[index] + vector) / (sizes[index] + 1)
+        units[index] = _unit(centroids[index])
+        sizes[index] += 1
+        touched.add(index)
+        assignments.append((article_id, index))
+
+    for index in touched:
+        clusters[index].centroid = centroids[index].tobytes()
+        clusters[index].size = sizes[index]
+        clusters[index].updated_at = now
+    # Attribue leurs identifiants aux nouveaux clusters
+    db.flush()
+    db.execute(insert(ArticleCluster), [
+        {'article_id': article_id, 'cluster_id': clusters[index].id} for article_id, index in assignments
+    ])
+    return {article_id: clusters[index].id for article_id, index in assignments}
+
+
+def assign_unclustered_articles(
+    db: Session,
+    limit: int = 1000,
+    retention_days: int = settings.ONLINE_CLUSTER_RETENTION_DAYS,
+) -> int:
+    """
+    Affecte les articles qui n'ont pas encore de cluster en ligne (articles ingérés avant
+    l'activation du mode en ligne), des plus récents aux plus anciens, par lots. Seuls les
+    articles publiés dans la fenêtre de rétention sont repris : les membres des clusters
+    retirés par `rebalance_clusters` restent sans cluster.
+
+    Parameters:
+        db (Session): La session de base de données.
+        limit (int): Nombre maximal d'articles traités.
+        retention_days (int): Ancienneté de publication au-delà de laquelle un article n'est pas affecté.
+
+    Returns:
+        int: Le nombre d'articles affectés.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    rows = (
+        db.query(Article.id, Article.embedding)
+        .outerjoin(ArticleCluster, ArticleCluster.article_id == Article.id)
+        .filter(
+            ArticleCluster.article_id.is_(None),
+            Article.embedding.isnot(None),
+            Article.published_at >= cutoff,
+        )
+        .order_by(desc(Article.published_at))
+        .limit(limit)
+        .all()
+    )
+    assign_articles(db, [(article_id, embedding_to_array(embedding)) for article_id, embedding in rows])
+    db.commit()
+    return len(rows)
+
+
+def _member_embeddings(db: Session, cluster_id: int) -> Tuple[List[int], np.ndarray]:
+    rows = (
+        db.query(Article.id, Article.embedding)
+        .join(ArticleCluster, ArticleCluster.article_id == Article.id)
+        .filter(ArticleCluster.cluster_id == cluster_id, Article.embedding.isnot(None))
+        .all()
+    )
+    return [article_id for article_id, _ in rows], np.vstack([embedding_to_array(embedding) for _, embedding in rows])
+
+
+def rebalance_clusters(
+    db: Session,
+    merge_distance: float = settings.ONLINE_CLUSTER_MERGE_DISTANCE,
+    split_min_size: int = settings.ONLINE_CLUSTER_SPLIT_MIN_SIZE,
+    split_spread: float = settings.ONLINE_CLUSTER_SPLIT_SPREAD,
+    retention_days: int = settings.ONLINE_CLUSTER_RETENTION_DAYS,
+) -> Dict[str, int]:
+    """
+    Rééquilibre périodiquement les clusters en ligne, dont l'affectation gloutonne dérive
+    avec le temps : retire les clusters inactifs, fusionne les clusters dont les centroïdes
+    se sont rapprochés et scinde en deux les clusters devenus trop dispersés.
+
+    Parameters:
+        db (Session): La session de base de données.
+        merge_distance (float): Distance cosinus entre centroïdes en deçà de laquelle deux clusters fusionnent.
+        split_min_size (int): Taille minimale d'un cluster pour être scindé.
+        split_spread (float): Distance cosinus moyenne des membres au centroïde au-delà de laquelle il est scindé.
+        retention_days (int): Ancienneté de la dernière affectation au-delà de laquelle un cluster est retiré.
+
+    Returns:
+        Dict[str, int]: Le nombre de clusters retirés ("retired"), fusionnés ("merged") et scindés ("split").
+    """
+    now = datetime.utcnow()
+    stats = {"retired": 0, "merged": 0, "split": 0}
+
+    stale_ids = [
+        cluster_id for (cluster_id,) in
+        db.query(OnlineCluster.id).filter(OnlineCluster.updated_at < now - timedelta(days=retention_days))
+    ]
+    if stale_ids:
+        db.query(ArticleCluster).filter(ArticleCluster.cluster_id.in_(stale_ids)).delete(synchronize_session=False)
+        db.query(OnlineCluster).filter(OnlineCluster.id.in_(stale_ids)).delete(synchronize_session=False)
+        stats["retired"] = len(stale_ids)
+
+    # Fusions : paires les plus proches d'abord, distance recalculée après chaque fusion
+    clusters = db.query(OnlineCluster).order_by(OnlineCluster.id).all()
+    if len(clusters) > 1:
+        centroids = np.vstack([_centroid(c) for c in clusters])
+        distances = 1 - _unit(centroids) @ _unit(centroids).T
+        first, second = np.triu_indices(len(clusters), k=1)
+        close = distances[first, second] < merge_distance
+        alive = [True] * len(clusters)
+        for i, j in sorted(zip(first[close], second[close]), key=lambda pair: distances[pair]):
+            if not (alive[i] and alive[j]):
+                continue
+            if 1 - float(_unit(centroids[i]) @ _unit(centroids[j])) >= merge_distance:
+                continue
+            keep, drop = (i, j) if clusters[i].size >= clusters[j].size else (j, i)
+            total = clusters[keep].size + clusters[drop].size
+            centroids[keep] = (centroids[keep] * clusters[keep].size + centroids[drop] * clusters[drop].size) / max(total, 1)
+            clusters[keep].centroid = centroids[keep].tobytes()
+            clusters[keep].size = total
+            clusters[keep].updated_at = max(clusters[keep].updated_at, clusters[drop].updated_at)
+            db.query(ArticleCluster).filter(ArticleCluster.cluster_id == clusters[drop].id).update(
+                {ArticleCluster.cluster_id: clusters[keep].id}, synchronize_session=False
+            )
+            db.delete(clusters[drop])
+            alive[drop] = False
+            stats["merged"] += 1
+        clusters = [cluster for cluster, is_alive in zip(clusters, alive) if is_alive]
+        db.flush()
+
+    # Scissions : 2-means sur les membres des gros clusters trop dispersés
+    for cluster in clusters:
+        if cluster.size < split_min_size:
+            continue
+        article_ids, vectors = _member_embeddings(db, cluster.id)
+        if len(article_ids) < split_min_size:
+            continue
+        spread = float(np.mean(1 - _unit(vectors) @ _unit(vectors.mean(axis=0))))
+        if spread <= split_spread:
+            continue
+        labels = KMeans(n_clusters=2, random_state=42).fit_predict(_unit(vectors))
+        moved = [article_id for article_id, label in zip(article_ids, labels) if label == 1]
+        if not moved or len(moved) == len(article_ids):
+            continue
+        cluster.centroid = vectors[labels == 0].mean(axis=0).tobytes()
+        cluster.size = len(article_ids) - len(moved)
+        new_cluster = OnlineCluster(
+            centroid=vectors[labels == 1].mean(axis=0).tobytes(),
+            size=len(moved),
+            created_at=now,
+            updated_at=cluster.updated_at,
+        )
+        db.add(new_cluster)
+        db.flush()
+        db.query(ArticleCluster).filter(ArticleCluster.article_id.in_(moved)).update(
+            {ArticleCluster.cluster_id: new_cluster.id}, synchronize_session=False
+        )
+        stats["split"] += 1
+
+    db.commit()
+    return stats
@@ -1,47 +1,136 @@
 import openai
 from langchain_openai import OpenAI
 from langchain_core.prompts import PromptTemplate
-from langchain_openai import OpenAIEmbeddings
 from ..config import settings
+from .embeddings import get_embedding_provider
 import os
 import asyncio
+import threading
 import time
+import weakref
 
-# Initialiser les embeddings OpenAI
-embeddings = OpenAIEmbeddings(
-    model="text-embedding-ada-002",
-    openai_api_key=settings.OPENAI_API_KEY
-)
 # Initialiser le modèle OpenAI
 openai_api_key = settings.OPENAI_API_KEY 
 llm = OpenAI(temperature=0.9, openai_api_key=openai_api_key)
 
-def generate_embedding(text: str) -> list:
+
+class TokenBucket:
     """
-    Génère un embedding pour un texte donné en utilisant OpenAI via LangChain.
+    Limiteur de débit à seau à jetons : `rate` jetons par seconde, au plus `capacity`
+    accumulés. Les jetons sont réservés sous verrou (le seau est partagé par toutes les
+    boucles d'événements du processus) et l'attente éventuelle se fait sans bloquer.
 
-    Parameters:
-        text (str): Le texte à encoder.
+    Attributes:
+        rate (float): Jetons ajoutés par seconde (0 = illimité).
+        capacity (float): Nombre maximal de jetons accumulés.
+    """
 
-    Returns:
-        list: L'embedding généré.
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Réserve des jetons, quitte à s'endetter, et retourne l'attente nécessaire avant de
+        pouvoir les utiliser.
+
+        Parameters:
+            tokens (float): Le nombre de jetons réservés.
+
+        Returns:
+            float: L'attente en secondes (0 si les jetons sont disponibles).
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncLLMClient:
+    """
+    Client LLM asynchrone partagé par le processus. Les appels sont natifs (`ainvoke`) et
+    s'exécutent sur la boucle d'événements de l'appelant, sans thread ni boucle dédiés ;
+    ils sont limités par un sémaphore de concurrence (un par boucle, les sémaphores
+    asyncio étant liés à leur boucle), par un seau à jetons commun et par un timeout.
+
+    Attributes:
+        llm: Le modèle LangChain appelé.
+        max_concurrency (int): Appels simultanés maximum.
+        timeout (float): Timeout par appel (secondes).
+        bucket (TokenBucket): Le limiteur de débit.
     """
 
-    embedding = embeddings.embed_query(text)
-    return embedding
+    def __init__(
+        self,
+        llm,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE,
+        burst: int = settings.LLM_BURST,
+        timeout: float = settings.LLM_TIMEOUT_SECONDS,
+    ):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_minute / 60, burst)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def invoke(self, prompt: str) -> str:
+        """
+        Appelle le LLM dans les limites de concurrence et de débit.
+
+        Parameters:
+            prompt (str): Le prompt.
+
+        Returns:
+            str: La réponse du modèle.
+
+        Raises:
+            asyncio.TimeoutError: Si l'appel dépasse le timeout.
+        """
+        async with self._semaphore():
+            await self.bucket.acquire()
+            return await asyncio.wait_for(self.llm.ainvoke(prompt), timeout=self.timeout)
+
+
+# Client partagé par toutes les requêtes du processus
+llm_client = AsyncLLMClient(llm)
 
-def generate_summary(text: str) -> str:
+def generate_embedding(text: str) -> list:
     """
-    Generates a concise and informative summary for the given text using OpenAI.
+    Génère un embedding pour un texte donné avec le fournisseur configuré
+    (OpenAI via LangChain par défaut).
 
     Parameters:
-        text (str): The text to summarize.
+        text (str): Le texte à encoder.
 
     Returns:
-        str: The generated summary.
+        list: L'embedding généré.
     """
-    # Enhanced prompt template for better summaries
-    template = """
+
+    embedding = get_embedding_provider().embed_query(text)
+    return embedding
+
+# Prompt des résumés d'articles
+SUMMARY_PROMPT = PromptTemplate(input_variables=["text"], template="""
     You are an expert summarizer. Your task is to create a clear and concise summary of the following text.
     
     Guidelines:
@@ -54,11 +143,19 @@ def generate_summary(text: str) -> str:
     {text}
 
     Summary:
+    """)
+
+def generate_summary(text: str) -> str:
     """
+    Generates a concise and informative summary for the given text using OpenAI.
+
+    Parameters:
+        text (str): The text to summarize.
 
-    # Create the prompt
-    prompt = PromptTemplate(input_variables=["text"], template=template)
-    summary_prompt = prompt.format(text=text)
+    Returns:
+        str: The generated summary.
+    """
+    summary_prompt = SUMMARY_PROMPT.format(text=text)
 
     # Generate the summary
     start_time = time.time()
@@ -79,20 +176,13 @@ async def generate_summary_async(text: str) -> str:
     Returns:
         str: Le résumé généré.
     """
-    return await asyncio.to_thread(generate_summary, text)
-
-def generate_summary_and_title(cluster_text: str) -> dict:
-    """
-    Génère un résumé et un titre pour un texte donné en utilisant OpenAI.
-
-    Parameters:
-        cluster_text (str): Le texte regroupé des articles d'un cluster.
+    summary = await llm_client.invoke(SUMMARY_PROMPT.format(text=text))
+    return summary.strip()
 
-    Returns:
-        dict: Un dictionnaire contenant le résumé et le titre.
-    """
-    # Prompt pour résumé et titre
-    template = """
+# Version du prompt de `generate_summary_and_title`, à incrémenter à chaque modification
+# du prompt : elle fait partie de la clé du cache des résumés de clusters
+SUMMARY_AND_TITLE_PROMPT_VERSION = "1"
+SUMMARY_AND_TITLE_PROMPT = PromptTemplate(input_variables=["text"], template="""
     You are a professional summarizer. Analyze the following text and perform the following tasks:
     
     1. Generate a concise summary of no more than 2-3 sentences.
@@ -104,16 +194,34 @@ def generate_summary_and_title(cluster_text: str) -> dict:
     Provide your response in the following format:
     Summary: <summary>
     Title: <title>
+    """)
+
+def generate_summary_and_title(cluster_text: str) -> dict:
     """
+    Génère un résumé et un titre pour un texte donné en utilisant OpenAI.
 
-    # Créer le prompt
-    prompt = PromptTemplate(input_variables=["text"], template=template)
-    formatted_prompt = prompt.format(text=cluster_text)
+    Parameters:
+        cluster_text (str): Le texte regroupé des articles d'un cluster.
+
+    Returns:
+        dict: Un dictionnaire contenant le résumé et le titre.
+    """
+    formatted_prompt = SUMMARY_AND_TITLE_PROMPT.format(text=cluster_text)
 
     # Appeler l'API OpenAI
     response = llm.invoke(formatted_prompt)
-    
-    # Extraire le résumé et le titre
+    return parse_summary_and_title(response)
+
+def parse_summary_and_title(response: str) -> dict:
+    """
+    Extrait le résumé et le titre d'une réponse au format "Summary: ... Title: ...".
+
+    Parameters:
+        response (str): La réponse du LLM.
+
+    Returns:
+        dict: Un dictionnaire contenant le résumé et le titre (None si la réponse n'est pas au format attendu).
+    """
     summary, title = None, None
     if "Summary:" in response and "Title:" in response:
         parts = response.split("Summary:")[1].strip().split("Title:")
@@ -131,10 +239,15 @@ async def generate_summary_and_title_async(text: str, cluster_id: int) -> tuple:
         cluster_id (int): L'identifiant du cluster.
 
     Returns:
-        tuple: (cluster_id, dict) où dict contient le résumé et le titre.
+        tuple: (cluster_id, dict) où dict contient le résumé et le titre (None en cas de timeout).
     """
-    summary_and_title = await asyncio.to_thread(generate_summary_and_title, text)
-    return cluster_id, summary_and_title
+    try:
+        response = await llm_client.invoke(SUMMARY_AND_TITLE_PROMPT.format(text=text))
+    except asyncio.TimeoutError:
+        # Le cluster garde un titre par défaut ; la réponse vide n'est pas mise en cache
+        print(f"[ERROR] Summary and title generation timed out for cluster {cluster_id}")
+        return cluster_id, {"summary": None, "title": None}
+    return cluster_id, parse_summary_and_title(response)
 
 
 async def generate_summaries_for_clusters(cluster_texts):
@@ -0,0 +1,200 @@
+import html
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
+
+from ..config import settings
+
+MAX_TEXT_LENGTH = 1000
+
+# Mêmes règles que le tree builder "html.parser" de BeautifulSoup
+EMPTY_ELEMENT_TAGS = {
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr',
+    'image', 'img', 'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid',
+    'param', 'source', 'spacer', 'track', 'wbr',
+}
+EXCLUDED_TEXT_TAGS = {'rp', 'rt', 'script', 'style', 'template'}
+PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+ASCII_SPACES = ' \n\t\x0c\r'
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Extracteur de texte en flux, sans construction d'arbre.
+
+    Reproduit `BeautifulSoup(markup, "html.parser").get_text()` : mêmes événements
+    du tokenizer `html.parser`, mêmes textes ignorés (scripts, styles, commentaires,
+    déclarations) et même normalisation des blocs ne contenant que des espaces.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self._data: List[str] = []
+        self._stack: List[str] = []
+        self._open = Counter()
+        self._excluded: List[int] = []
+        self._preserved: List[int] = []
+        self._closed_empty: List[str] = []
+
+    def _end_data(self, keep: bool = True, force: bool = False) -> None:
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if not keep or (self._excluded and not force):
+            return
+        if not self._preserved and not data.strip(ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+        self.parts.append(data)
+
+    def _push(self, tag: str) -> None:
+        self._stack.append(tag)
+        self._open[tag] += 1
+        if tag in EXCLUDED_TEXT_TAGS:
+            self._excluded.append(len(self._stack))
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserved.append(len(self._stack))
+
+    def _pop(self) -> None:
+        depth = len(self._stack)
+        self._open[self._stack.pop()] -= 1
+        if self._excluded and self._excluded[-1] == depth:
+            self._excluded.pop()
+        if self._preserved and self._preserved[-1] == depth:
+            self._preserved.pop()
+
+    def _pop_to(self, tag: str) -> None:
+        while self._stack and self._open[tag]:
+            if self._stack[-1] == tag:
+                self._pop()
+                break
+            self._pop()
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self._end_data()
+        self._push(tag)
+        if handle_empty_element and tag in EMPTY_ELEMENT_TAGS:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._closed_empty.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag, check_already_closed=False)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if check_already_closed and tag in self._closed_empty:
+            self._closed_empty.remove(tag)
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        self._data.append(html.unescape(f"&#{name};"))
+
+    def handle_entityref(self, name):
+        self._data.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f"&{name}"))
+
+    def _skip(self, data: str) -> None:
+        self._end_data()
+        self._data.append(data)
+        self._end_data(keep=False)
+
+    def handle_comment(self, data):
+        self._skip(data)
+
+    def handle_decl(self, decl):
+        self._skip(decl)
+
+    def handle_pi(self, data):
+        self._skip(data)
+
+    def unknown_decl(self, data):
+        # Les sections CDATA font partie du texte, les autres déclarations non
+        if data.upper().startswith("CDATA["):
+            self._end_data()
+            self._data.append(data[len("CDATA["):])
+            self._end_data(force=True)
+        else:
+            self._skip(data)
+
+    def get_text(self) -> str:
+        self._end_data()
+        return "".join(self.parts)
+
+
+def clean_html(text: str, max_length: int = MAX_TEXT_LENGTH) -> str:
+    """
+    Extrait le texte brut d'un contenu HTML et le tronque à `max_length` caractères.
+
+    Équivalent à `BeautifulSoup(text, "html.parser").get_text()[:max_length]`, en
+    évitant la construction de l'arbre ; les textes sans balise ni entité (cas
+    courant des contenus NewsAPI) sont renvoyés directement.
+
+    Parameters:
+        text (str): Le contenu à nettoyer.
+        max_length (int): La longueur maximale du texte renvoyé.
+
+    Returns:
+        str: Le texte nettoyé.
+    """
+    if "<" not in text and "&" not in text and text.strip(ASCII_SPACES):
+        return text[:max_length]
+    parser = _TextExtractor()
+    parser.feed(text)
+    parser.close()
+    return parser.get_text()[:max_length]
+
+
+def clean_html_reference(text: str, max_length: int = MAX_TEXT_LENGTH) -> str:
+    """
+    Nettoyage de référence avec BeautifulSoup (utilisé pour les tests et benchmarks).
+
+    Parameters:
+        text (str): Le contenu à nettoyer.
+        max_length (int): La longueur maximale du texte renvoyé.
+
+    Returns:
+        str: Le texte nettoyé.
+    """
+    return BeautifulSoup(text, "html.parser").get_text()[:max_length]
+
+
+def clean_texts(
+    texts: List[str],
+    max_length: int = MAX_TEXT_LENGTH,
+    workers: Optional[int] = None,
+    parallel_threshold: Optional[int] = None,
+) -> List[str]:
+    """
+    Nettoie une liste de contenus HTML, dans un pool de processus pour les gros lots.
+
+    Parameters:
+        texts (List[str]): Les contenus à nettoyer.
+        max_length (int): La longueur maximale de chaque texte.
+        workers (Optional[int]): Nombre de processus (défaut : TEXT_CLEANING_WORKERS, 0 = nombre de CPU).
+        parallel_threshold (Optional[int]): Taille de lot à partir de laquelle le pool est utilisé
+            (défaut : TEXT_CLEANING_PARALLEL_THRESHOLD).
+
+    Returns:
+        List[str]: Les textes nettoyés, dans le même ordre.
+    """
+    workers = workers if workers is not None else settings.TEXT_CLEANING_WORKERS
+    workers = workers or os.cpu_count() or 1
+    if parallel_threshold is None:
+        parallel_threshold = settings.TEXT_CLEANING_PARALLEL_THRESHOLD
+
+    if workers == 1 or len(texts) < parallel_threshold:
+        return [clean_html(text, max_length) for text in texts]
+
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(clean_html, texts, [max_length] * len(texts), chunksize=chunksize))
@@ -0,0 +1,186 @@
+# app/utils/vector_search.py
+"""
+Recherche vectorielle exacte en mémoire (force brute), pour les bases sans pgvector
+(SQLite, tests, benchmarks) et pour la fenêtre d'articles récents du store
+d'embeddings.
+
+Les distances sont celles des opérateurs pgvector (`<->` L2, `<=>` cosinus), calculées
+par produits matriciels float32 sur des blocs de lignes, avec une sélection top-k
+(argpartition) fusionnée d'un bloc à l'autre : plusieurs requêtes sont traitées par un
+même produit. En option, la matrice est quantifiée en int8 (une échelle par ligne) :
+le parcours se fait sur les codes int8, puis les `k * rerank_factor` meilleurs
+candidats sont reclassés avec les vecteurs float32 exacts.
+"""
+import threading
+from typing import Callable, Hashable, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+VECTOR_SEARCH_METRICS = ("l2", "cosine")
+
+
+class BruteForceVectorIndex:
+    """
+    Index exact en mémoire sur une matrice d'embeddings.
+
+    Attributes:
+        ids (np.ndarray): Identifiants des articles, dans l'ordre des lignes.
+        vectors (np.ndarray): Matrice float32 (n, dimension), éventuellement mappée en mémoire.
+        metric (str): "l2" ou "cosine".
+        codes (Optional[np.ndarray]): Matrice quantifiée int8, si la quantification est activée.
+    """
+
+    def __init__(
+        self,
+        ids,
+        vectors,
+        metric: str = "l2",
+        quantize: bool = False,
+        rerank_factor: int = settings.VECTOR_SEARCH_RERANK_FACTOR,
+        block_size: int = 4096,
+    ):
+        if metric not in VECTOR_SEARCH_METRICS:
+            raise ValueError(f"Distance inconnue : {metric} (attendu : {', '.join(VECTOR_SEARCH_METRICS)})")
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vectors = vectors if isinstance(vectors, np.ndarray) and vectors.dtype == np.float32 else np.asarray(vectors, dtype=np.float32)
+        self.metric = metric
+        self.rerank_factor = max(1, rerank_factor)
+        self.block_size = block_size
+        self.norms = np.sqrt(np.einsum("ij,ij->i", self.vectors, self.vectors))
+        self.codes = self.scales = None
+        if quantize and len(self.ids):
+            max_abs = np.abs(self.vectors).max(axis=1)
+            self.scales = np.where(max_abs > 0, max_abs / 127, 1).astype(np.float32)
+            self.codes = np.rint(self.vectors / self.scales[:, None]).astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _distances(self, dots: np.ndarray, query_norms: np.ndarray, row_norms: np.ndarray) -> np.ndarray:
+        if self.metric == "l2":
+            # |v - q|² = |v|² - 2 v.q + |q|², sans matrice intermédiaire des différences
+            squared = (query_norms ** 2)[:, None] - 2 * dots + (row_norms ** 2)[None, :]
+            return np.sqrt(np.maximum(squared, 0))
+        tiny = np.finfo(np.float32).tiny
+        return 1 - dots / (np.maximum(query_norms, tiny)[:, None] * np.maximum(row_norms, tiny)[None, :])
+
+    @staticmethod
+    def _sorted(rows: np.ndarray, distances: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Distance croissante, puis ligne (donc identifiant) croissante en cas d'égalité
+        order = np.lexsort((rows, distances), axis=-1)[:, :k]
+        rows, distances = np.take_along_axis(rows, order, axis=1), np.take_along_axis(distances, order, axis=1)
+        return np.where(np.isfinite(distances), rows, -1), distances
+
+    def _scan(
+        self,
+        queries: np.ndarray,
+        query_norms: np.ndarray,
+        k: int,
+        mask: Optional[np.ndarray],
+        after: Optional[Tuple[float, int]],
+        quantized: bool,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_distances = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.ids), self.block_size):
+            stop = min(start + self.block_size, len(self.ids))
+            if quantized:
+                dots = (queries @ self.codes[start:stop].T.astype(np.float32)) * self.scales[start:stop]
+            else:
+                dots = queries @ self.vectors[start:stop].T
+            distances = self._distances(dots, query_norms, self.norms[start:stop]).astype(np.float32, copy=False)
+            if mask is not None:
+                distances[:, ~mask[start:stop]] = np.inf
+            if after is not None:
+                # Égalité à l'arrondi près : la distance du curseur a pu être calculée par un
+                # produit de forme différente (reclassement int8, autre taille de lot)
+                last_distance, last_id = after
+                tolerance = 1e-5 * max(1.0, abs(last_distance))
+                ids = self.ids[start:stop]
+                distances[
+                    (distances < last_distance - tolerance)
+                    | ((distances <= last_distance + tolerance) & (ids <= last_id))
+                ] = np.inf
+            rows = np.broadcast_to(np.arange(start, stop, dtype=np.int64), distances.shape)
+            candidate_rows = np.concatenate([best_rows, rows], axis=1)
+            candidate_distances = np.concatenate([best_distances, distances], axis=1)
+            if candidate_distances.shape[1] > k:
+                top = np.argpartition(candidate_distances, k - 1, axis=1)[:, :k]
+                candidate_rows = np.take_along_axis(candidate_rows, top, axis=1)
+                candidate_distances = np.take_along_axis(candidate_distances, top, axis=1)
+            best_rows, best_distances = candidate_rows, candidate_distances
+        return self._sorted(best_rows, best_distances, k)
+
+    def search(
+        self,
+        queries,
+        k: int,
+        mask: Optional[np.ndarray] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les k plus proches voisins d'une ou plusieurs requêtes.
+
+        Parameters:
+            queries: Un vecteur (dimension,) ou un lot de requêtes (m, dimension).
+            k (int): Nombre de voisins par requête.
+            mask (Optional[np.ndarray]): Lignes autorisées (booléens, une valeur par ligne).
+            after (Optional[Tuple[float, int]]): Ne retourner que les lignes situées après
+                (distance, identifiant), pour paginer ; le parcours est alors exact.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Les identifiants (m, k) et distances (m, k), du plus
+                proche au plus éloigné ; -1 et inf au-delà des lignes disponibles.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return np.empty((len(queries), 0), dtype=np.int64), np.empty((len(queries), 0), dtype=np.float32)
+        query_norms = np.sqrt(np.einsum("ij,ij->i", queries, queries))
+
+        if self.codes is not None and after is None:
+            candidates, _ = self._scan(
+                queries, query_norms, min(k * self.rerank_factor, len(self.ids)), mask, None, quantized=True
+            )
+            # Reclassement exact : seules les lignes float32 des candidats sont lues
+            rows = np.full((len(queries), k), -1, dtype=np.int64)
+            distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+            for i, query_rows in enumerate(candidates):
+                query_rows = query_rows[query_rows >= 0]
+                exact = self._distances(
+                    queries[i:i + 1] @ self.vectors[query_rows].T, query_norms[i:i + 1], self.norms[query_rows]
+                )
+                top_rows, top_distances = self._sorted(query_rows[None, :], exact.astype(np.float32), k)
+                rows[i, :top_rows.shape[1]], distances[i, :top_rows.shape[1]] = top_rows[0], top_distances[0]
+        else:
+            rows, distances = self._scan(queries, query_norms, k, mask, after, quantized=False)
+        return np.where(rows >= 0, self.ids[np.maximum(rows, 0)], -1), distances
+
+
+class VectorIndexCache:
+    """
+    Garde l'index en mémoire du processus et le reconstruit quand la clé de son contenu
+    (nombre et bornes des identifiants, distance...) change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._index: Optional[BruteForceVectorIndex] = None
+
+    def get(self, key: Hashable, build: Callable[[], BruteForceVectorIndex]) -> BruteForceVectorIndex:
+        with self._lock:
+            if self._index is None or key != self._key:
+                self._index = build()
+                self._key = key
+            return self._index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = self._key = None
+
+
+# Index partagé par toutes les recherches du processus
+vector_index_cache = VectorIndexCache()
@@ -0,0 +1,64 @@
+# app/worker.py
+"""
+Worker d'ingestion autonome : `python -m app.worker`.
+
+Plusieurs workers peuvent être lancés (redondance) ; un seul est élu leader grâce à un
+verrou consultatif PostgreSQL et exécute le scheduler, les autres restent en veille et
+prennent le relais si le leader disparaît.
+"""
+import logging
+import signal
+import sys
+import time
+
+from .config import settings
+from .database import engine
+from .tasks.background_tasks import create_scheduler
+from .tasks.leader import try_acquire_lock, release_lock, lock_is_alive
+
+
+def run_as_leader(connection) -> None:
+    """
+    Exécute le scheduler tant que la connexion du verrou de leader reste valide.
+
+    Parameters:
+        connection (Connection): La connexion qui détient le verrou de leader.
+    """
+    scheduler = create_scheduler()
+    scheduler.start()
+    logging.info("[WORKER] Leader élu, scheduler démarré.")
+    try:
+        while lock_is_alive(connection):
+            time.sleep(settings.LEADER_HEARTBEAT_SECONDS)
+    finally:
+        scheduler.shutdown(wait=False)
+        logging.info("[WORKER] Scheduler arrêté.")
+
+
+def main() -> None:
+    """
+    Boucle d'élection : tente de devenir leader, sinon attend et retente.
+    """
+    # Convertir SIGTERM (arrêt du conteneur) en sortie propre pour libérer le verrou
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logging.info("[WORKER] Démarrage du worker d'ingestion.")
+    while True:
+        try:
+            connection = try_acquire_lock(engine, settings.INGESTION_LEADER_LOCK_ID)
+        except Exception as e:
+            logging.error(f"[WORKER] Élection impossible : {e}")
+            connection = None
+        else:
+            if connection is None:
+                logging.info("[WORKER] Un autre worker est leader, mise en veille.")
+
+        if connection is not None:
+            try:
+                run_as_leader(connection)
+            finally:
+                release_lock(connection, settings.INGESTION_LEADER_LOCK_ID)
+        time.sleep(settings.LEADER_RETRY_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
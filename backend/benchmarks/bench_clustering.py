@@ -0,0 +1,80 @@
+# benchmarks/bench_clustering.py
+"""
+Compare le choix de k historique (un KMeans complet par k) aux méthodes "minibatch"
+et "ward" (sous-échantillon + PCA) sur des corpus synthétiques d'embeddings : latence
+du choix de k, k retenu, et accord des partitions finales (indice de Rand ajusté).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_clustering --articles 500 --topics 8 --runs 5
+"""
+import argparse
+import time
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score
+
+from app.clustering import K_SELECTION_METHODS, select_optimal_k
+
+
+def synthetic_corpus(articles: int, topics: int, dimension: int, spread: float, seed: int):
+    """
+    Embeddings normalisés regroupés autour de `topics` directions aléatoires.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dimension))
+    labels = rng.integers(0, topics, size=articles)
+    points = centers[labels] + rng.normal(scale=spread, size=(articles, dimension))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32), labels
+
+
+def timed_k(embeddings, k_range, method, **kwargs):
+    start = time.perf_counter()
+    k = select_optimal_k(embeddings, k_range, method=method, **kwargs)
+    return k, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--topics", type=int, default=8)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--spread", type=float, default=0.6, help="Écart-type du bruit autour de chaque sujet")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de corpus générés")
+    parser.add_argument("--sample-size", type=int, default=1000)
+    parser.add_argument("--components", type=int, default=50)
+    args = parser.parse_args()
+
+    k_range = range(2, 21)
+    times = {method: [] for method in K_SELECTION_METHODS}
+    ari_truth = {method: [] for method in K_SELECTION_METHODS}
+    same_k = {method: 0 for method in K_SELECTION_METHODS}
+    ari_exhaustive = {method: [] for method in K_SELECTION_METHODS}
+
+    for seed in range(args.runs):
+        embeddings, truth = synthetic_corpus(args.articles, args.topics, args.dimension, args.spread, seed)
+        ks, labels = {}, {}
+        for method in K_SELECTION_METHODS:
+            ks[method], t = timed_k(embeddings, k_range, method, sample_size=args.sample_size, components=args.components)
+            times[method].append(t)
+            # Partition finale identique au workflow : KMeans complet avec le k retenu
+            labels[method] = KMeans(n_clusters=ks[method], random_state=42).fit_predict(embeddings)
+            ari_truth[method].append(adjusted_rand_score(truth, labels[method]))
+        for method in K_SELECTION_METHODS:
+            same_k[method] += ks[method] == ks["exhaustive"]
+            ari_exhaustive[method].append(adjusted_rand_score(labels["exhaustive"], labels[method]))
+        print(f"corpus {seed} ({args.topics} sujets) : " + ", ".join(f"k {m} = {k}" for m, k in ks.items()))
+
+    baseline = np.mean(times["exhaustive"])
+    for method in K_SELECTION_METHODS:
+        print(
+            f"{method:10s} : choix de k en {np.mean(times[method]):.3f}s (x{baseline / np.mean(times[method]):.1f}), "
+            f"même k que exhaustive {same_k[method]}/{args.runs}, "
+            f"ARI vs exhaustive {np.mean(ari_exhaustive[method]):.3f}, "
+            f"ARI vs sujets réels {np.mean(ari_truth[method]):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/bench_clustering_core.py
+"""
+Compare le cœur de clustering vectorisé (matrice float32, regroupement par argsort)
+à l'implémentation historique à base de DataFrame pandas, copiée ci-dessous :
+latence et pic mémoire (tracemalloc) pour un même k et des résumés factices.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_clustering_core --articles 2000 --k 12
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+import app.clustering as clustering
+
+
+async def fake_summaries(cluster_texts):
+    return {cluster_id: {"title": f"Cluster {cluster_id}", "summary": text[:50]} for cluster_id, text in cluster_texts.items()}
+
+
+# --- Implémentation historique (avant vectorisation), au choix de k et aux appels LLM près ---
+
+def legacy_fix_ndarray_embeddings(embedding):
+    try:
+        if isinstance(embedding, np.ndarray) and embedding.ndim == 0:
+            return np.array(json.loads(embedding.item()), dtype=float)
+        if isinstance(embedding, np.ndarray) and embedding.size == 1 and isinstance(embedding[0], str):
+            return np.array(json.loads(embedding[0]), dtype=float)
+        if isinstance(embedding, np.ndarray) and embedding.dtype in [np.float32, np.float64]:
+            return embedding
+        if isinstance(embedding, str):
+            return np.array(json.loads(embedding), dtype=float)
+    except Exception:
+        return None
+    return None
+
+
+def legacy_workflow(articles, k):
+    data = []
+    for art in articles:
+        embedding_array = np.array(art.embedding) if art.embedding else None
+        data.append({
+            'id': art.id,
+            'title': art.title,
+            'summary': art.summary,
+            'raw_text': art.raw_text,
+            'published_at': art.published_at,
+            'url': art.url,
+            'embedding': embedding_array
+        })
+
+    df = pd.DataFrame(data)
+    df['embedding'] = df['embedding'].apply(legacy_fix_ndarray_embeddings)
+    df = df.dropna(subset=['embedding'])
+    embeddings = np.vstack(df['embedding'].values)
+
+    kmeans = KMeans(n_clusters=k, random_state=42)
+    df['cluster'] = kmeans.fit_predict(embeddings)
+
+    summaries = asyncio.run(fake_summaries({
+        cluster_id: " ".join(df[df['cluster'] == cluster_id]['raw_text'])
+        for cluster_id in sorted(df['cluster'].unique())
+    }))
+    cluster_summaries = {}
+    for cluster_id, summary_and_title in summaries.items():
+        cluster_summaries[cluster_id] = {
+            "title": summary_and_title.get("title", f"Cluster {cluster_id}"),
+            "summary": summary_and_title.get("summary", "No summary available."),
+            "articles": df[df['cluster'] == cluster_id].to_dict(orient='records')
+        }
+
+    sorted_clusters = sorted(cluster_summaries.items(), key=lambda item: len(item[1]['articles']), reverse=True)
+    return {k: v for k, v in sorted_clusters}
+
+
+# --- Mesures ---
+
+def synthetic_articles(count: int, dimension: int, topics: int, embedding_format: str = "text", seed: int = 0):
+    """
+    Articles factices dont l'embedding est au format texte renvoyé par pgvector ("text")
+    ou déjà décodé en liste de flottants ("list").
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dimension))
+    vectors = centers[rng.integers(0, topics, size=count)] + rng.normal(scale=0.5, size=(count, dimension))
+    return [
+        SimpleNamespace(
+            id=i, title=f"Article {i}", summary=None, raw_text=f"Synthetic article {i} " * 20,
+            published_at=None, url=f"https://example.com/{i}",
+            embedding="[" + ",".join(f"{x:.6f}" for x in vector) + "]" if embedding_format == "text" else vector.tolist(),
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def measure(function, repeats: int):
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return result, (time.perf_counter() - start) / repeats, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--format", choices=("text", "list"), default="text", help="Format des embeddings lus en base")
+    args = parser.parse_args()
+
+    articles = synthetic_articles(args.articles, args.dimension, args.k, args.format)
+    clustering.generate_cluster_summaries = fake_summaries
+
+    legacy, legacy_time, legacy_peak = measure(lambda: legacy_workflow(articles, args.k), args.repeats)
+    vectorized, vectorized_time, vectorized_peak = measure(
+        lambda: asyncio.run(clustering.workflow_query_cluster_and_summarize(articles, k=args.k)), args.repeats
+    )
+
+    # Part du KMeans (identique en dehors de la précision float32/float64) pour isoler la préparation des données
+    matrix = clustering.embedding_matrix(articles)[0]
+    kmeans_time = {}
+    for dtype in (np.float64, np.float32):
+        start = time.perf_counter()
+        KMeans(n_clusters=args.k, random_state=42).fit(matrix.astype(dtype))
+        kmeans_time[dtype] = time.perf_counter() - start
+
+    same = [[a["id"] for a in c["articles"]] for c in legacy.values()] == [[a["id"] for a in c["articles"]] for c in vectorized.values()]
+    print(
+        f"historique : {legacy_time:.3f}s (dont KMeans {kmeans_time[np.float64]:.3f}s), "
+        f"pic mémoire {legacy_peak / 2**20:.1f} Mio"
+    )
+    print(
+        f"vectorisé  : {vectorized_time:.3f}s (dont KMeans {kmeans_time[np.float32]:.3f}s), "
+        f"pic mémoire {vectorized_peak / 2**20:.1f} Mio"
+    )
+    print(f"gain       : x{legacy_time / vectorized_time:.1f} en latence, x{legacy_peak / vectorized_peak:.1f} en mémoire")
+    print(f"clusters identiques : {same}")
+
+
+if __name__ == "__main__":
+    main()
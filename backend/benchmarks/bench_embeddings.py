@@ -0,0 +1,43 @@
+# benchmarks/bench_embeddings.py
+"""
+Compare l'ingestion séquentielle (un appel d'embedding par article) à la génération
+groupée, avec un fournisseur local qui simule la latence réseau.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_embeddings --articles 100 --latency 0.05
+"""
+import argparse
+import time
+
+from app.utils.embeddings import LocalEmbeddingProvider, generate_embeddings_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence simulée par appel (s)")
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    provider = LocalEmbeddingProvider(latency=args.latency)
+    texts = [f"Synthetic article {i} about markets, politics and sport" for i in range(args.articles)]
+
+    start = time.perf_counter()
+    serial = [provider.embed_query(text) for text in texts]
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = generate_embeddings_batch(
+        texts, chunk_size=args.chunk_size, max_concurrency=args.concurrency, provider=provider
+    )
+    batched_time = time.perf_counter() - start
+
+    assert serial == batched
+    print(f"séquentiel : {serial_time:.3f}s ({args.articles} appels)")
+    print(f"groupé     : {batched_time:.3f}s (lots de {args.chunk_size}, concurrence {args.concurrency})")
+    print(f"gain       : x{serial_time / batched_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_text_cleaning.py
+"""
+Compare le nettoyage HTML BeautifulSoup (ancienne implémentation) au nettoyage en flux
+de `app.utils.text_cleaning`, en séquentiel et avec le pool de processus.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_text_cleaning --articles 5000
+"""
+import argparse
+import random
+import time
+
+from app.utils.text_cleaning import clean_html, clean_html_reference, clean_texts
+
+TEMPLATES = [
+    "{words}… [+{n} chars]",
+    "<p>{words}</p><p>{words} &amp; more</p>… [+{n} chars]",
+    "<ul><li>{words}</li><li><a href=\"https://example.com\">{words}</a></li></ul>",
+    "<div><script>track();</script><p>{words}&nbsp;&#8212; {words}</p><!-- ad --></div>",
+]
+
+
+def synthetic_articles(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    vocabulary = "market election climate football tech startup court storm vaccine energy".split()
+    articles = []
+    for _ in range(count):
+        words = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(20, 80)))
+        articles.append(rng.choice(TEMPLATES).format(words=words, n=rng.randint(100, 5000)))
+    return articles
+
+
+def timed(label: str, func, baseline: float = None) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    speedup = f" (x{baseline / elapsed:.1f})" if baseline else ""
+    print(f"{label:<28} {elapsed:.3f}s{speedup}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = nombre de CPU")
+    args = parser.parse_args()
+
+    articles = synthetic_articles(args.articles)
+    assert [clean_html(text) for text in articles] == [clean_html_reference(text) for text in articles]
+
+    baseline = timed("BeautifulSoup", lambda: [clean_html_reference(text) for text in articles])
+    timed("flux (séquentiel)", lambda: [clean_html(text) for text in articles], baseline)
+    timed("flux (pool de processus)", lambda: clean_texts(articles, workers=args.workers, parallel_threshold=0), baseline)
+
+
+if __name__ == "__main__":
+    main()
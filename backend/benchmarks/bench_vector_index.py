@@ -0,0 +1,136 @@
+# benchmarks/bench_vector_index.py
+"""
+Mesure le compromis rappel/latence de la recherche vectorielle PostgreSQL : parcours
+exact (sans index), HNSW pour plusieurs `hnsw.ef_search` et IVFFlat pour plusieurs
+`ivfflat.probes`, sur un corpus synthétique chargé dans une table temporaire. La
+vérité terrain (k plus proches voisins exacts) est calculée avec numpy.
+
+Nécessite une base PostgreSQL avec l'extension pgvector (DATABASE_URL) ; la table
+`bench_vector_index` est supprimée à la fin.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_vector_index --articles 20000 --queries 100 --metric l2
+"""
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from app.crud import set_vector_search_options
+from app.database import SessionLocal, engine
+from app.tasks.search_index import VECTOR_METRICS, create_vector_index, drop_vector_index, ivfflat_lists
+from app.utils.embeddings import format_pgvector
+
+TABLE = "bench_vector_index"
+INDEX = "ix_bench_vector_index_ann"
+
+
+def synthetic_corpus(articles: int, topics: int, dimension: int, spread: float, seed: int):
+    """
+    Embeddings normalisés regroupés autour de `topics` directions aléatoires.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dimension))
+    labels = rng.integers(0, topics, size=articles)
+    points = centers[labels] + rng.normal(scale=spread, size=(articles, dimension))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32)
+
+
+def exact_neighbors(corpus: np.ndarray, queries: np.ndarray, k: int, metric: str) -> np.ndarray:
+    if metric == "cosine":
+        # Vecteurs normalisés : la distance cosinus ordonne comme le produit scalaire
+        scores = -(queries @ corpus.T)
+    else:
+        scores = (queries ** 2).sum(axis=1)[:, None] - 2 * queries @ corpus.T + (corpus ** 2).sum(axis=1)[None, :]
+    return np.argsort(scores, axis=1)[:, :k]
+
+
+def load_corpus(corpus: np.ndarray) -> None:
+    dimension = corpus.shape[1]
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        connection.execute(text(f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, embedding vector({dimension}))"))
+        for start in range(0, len(corpus), 1000):
+            connection.execute(
+                text(f"INSERT INTO {TABLE} (id, embedding) VALUES (:id, CAST(:embedding AS vector))"),
+                [{"id": start + i, "embedding": format_pgvector(row)} for i, row in enumerate(corpus[start:start + 1000])],
+            )
+        connection.execute(text(f"ANALYZE {TABLE}"))
+
+
+def run_queries(queries: np.ndarray, k: int, metric: str, ef_search=None, probes=None):
+    """
+    Exécute les requêtes k-NN une par une, chacune dans sa transaction (comme l'API).
+
+    Returns:
+        Tuple[np.ndarray, List[float]]: Les identifiants trouvés et les latences (s).
+    """
+    operator = VECTOR_METRICS[metric][1]
+    sql = text(f"SELECT id FROM {TABLE} ORDER BY embedding {operator} CAST(:query AS vector) LIMIT :k")
+    found, latencies = [], []
+    db = SessionLocal()
+    try:
+        for query in queries:
+            literal = format_pgvector(query)
+            start = time.perf_counter()
+            set_vector_search_options(db, ef_search, probes)
+            ids = db.execute(sql, {"query": literal, "k": k}).scalars().all()
+            latencies.append(time.perf_counter() - start)
+            db.rollback()
+            found.append(ids + [-1] * (k - len(ids)))
+    finally:
+        db.close()
+    return np.array(found), latencies
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def report(label: str, found, latencies, truth) -> None:
+    ms = np.array(latencies) * 1000
+    print(f"{label:<28} recall@k={recall(found, truth):.3f}  p50={np.percentile(ms, 50):7.2f} ms  p95={np.percentile(ms, 95):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--spread", type=float, default=0.8, help="Écart-type du bruit autour de chaque sujet")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--metric", choices=tuple(VECTOR_METRICS), default="l2")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[20, 40, 80, 160])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20])
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.articles + args.queries, args.topics, args.dimension, args.spread, seed=0)
+    corpus, queries = corpus[:args.articles], corpus[args.articles:]
+    truth = exact_neighbors(corpus, queries, args.k, args.metric)
+    load_corpus(corpus)
+    try:
+        report("exact (sans index)", *run_queries(queries, args.k, args.metric), truth)
+
+        start = time.perf_counter()
+        create_vector_index(method="hnsw", metric=args.metric, table=TABLE, name=INDEX)
+        print(f"HNSW construit en {time.perf_counter() - start:.1f}s")
+        for ef_search in args.ef_search:
+            report(f"hnsw ef_search={ef_search}", *run_queries(queries, args.k, args.metric, ef_search=ef_search), truth)
+        drop_vector_index(name=INDEX)
+
+        lists = ivfflat_lists(args.articles)
+        start = time.perf_counter()
+        create_vector_index(method="ivfflat", metric=args.metric, lists=lists, table=TABLE, name=INDEX)
+        print(f"IVFFlat ({lists} listes) construit en {time.perf_counter() - start:.1f}s")
+        for probes in args.probes:
+            report(f"ivfflat probes={probes}", *run_queries(queries, args.k, args.metric, probes=probes), truth)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# tests/unit/test_backfill.py
+
+from datetime import date
+from sqlalchemy.orm import Session
+from app import crud
+from app.config import settings
+from app.tasks import backfill as backfill_module
+from app.tasks.backfill import backfill, ingest_day, pending_dates
+
+
+def test_pending_dates_skips_covered_days(db_session: Session):
+    """
+    Teste la reprise : les jours déjà couverts ne sont pas retraités (sauf --force).
+    """
+    crud.mark_date_covered(db_session, date(2024, 1, 2), 10)
+    assert pending_dates(db_session, date(2024, 1, 1), date(2024, 1, 3)) == [date(2024, 1, 3), date(2024, 1, 1)]
+    assert len(pending_dates(db_session, date(2024, 1, 1), date(2024, 1, 3), force=True)) == 3
+
+def test_backfill_counts_and_failures(db_session: Session):
+    """
+    Teste le traitement parallèle, les compteurs et la gestion d'un jour en échec.
+    """
+    crud.mark_date_covered(db_session, date(2024, 1, 5), 3)
+    processed = []
+
+    def fake_ingest(db, target_date):
+        processed.append(target_date)
+        if target_date == date(2024, 1, 2):
+            raise RuntimeError("NewsAPI indisponible")
+        return {"inserted": 5, "skipped": 1, "near_duplicates": 0}
+
+    totals = backfill(date(2024, 1, 1), date(2024, 1, 5), workers=2,
+                      session_factory=lambda: db_session, ingest=fake_ingest)
+
+    assert sorted(processed) == [date(2024, 1, d) for d in range(1, 5)]
+    assert totals["days"] == 3
+    assert totals["failed_days"] == 1
+    assert totals["inserted"] == 15
+    assert totals["articles_per_second"] > 0
+
+def test_backfill_assigns_online_clusters_once_after_all_days(db_session: Session, monkeypatch):
+    """
+    Teste que les jours parallèles n'affectent pas les articles aux clusters en ligne :
+    l'affectation est faite une seule fois, par lots, une fois tous les jours traités.
+    """
+    monkeypatch.setattr(settings, "CLUSTERING_MODE", "online")
+    events = []
+
+    def fake_add_articles_to_db(db, articles_data, assign_clusters=True):
+        events.append(("ingest", assign_clusters))
+        return {"inserted": 1, "skipped": 0, "near_duplicates": 0}
+
+    def fake_assign(db, limit):
+        events.append(("assign", limit))
+        return limit if len([event for event in events if event[0] == "assign"]) == 1 else 3
+
+    monkeypatch.setattr(backfill_module, "fetch_news_by_date", lambda *args, **kwargs: [])
+    monkeypatch.setattr(backfill_module, "add_articles_to_db", fake_add_articles_to_db)
+    monkeypatch.setattr(backfill_module, "assign_unclustered_articles", fake_assign)
+    monkeypatch.setattr(backfill_module, "mark_date_covered", lambda db, target_date, count: None)
+
+    totals = backfill(date(2024, 1, 1), date(2024, 1, 3), workers=3,
+                      session_factory=lambda: db_session, ingest=ingest_day)
+
+    assert events == [("ingest", False)] * 3 + [("assign", 1000), ("assign", 1000)]
+    assert totals["days"] == 3 and totals["assigned"] == 1003
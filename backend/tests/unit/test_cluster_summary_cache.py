@@ -0,0 +1,111 @@
+# tests/unit/test_cluster_summary_cache.py
+
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import clustering
+from app.routers import subjects
+from app.models import Article, ClusterSummaryCacheEntry
+from app.utils.cluster_summary_cache import cluster_summary_key, get_cluster_summaries_cached
+
+
+class CountingGenerator:
+    """
+    Générateur factice qui compte les clusters envoyés au LLM.
+    """
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, cluster_texts):
+        self.calls.extend(cluster_texts.values())
+        return {cluster_id: {"title": f"Title {text}", "summary": f"Summary {text}"} for cluster_id, text in cluster_texts.items()}
+
+
+def cached(*args, **kwargs):
+    return asyncio.run(get_cluster_summaries_cached(*args, **kwargs))
+
+
+def test_same_members_skip_llm(db_session: Session):
+    """
+    Teste qu'un cluster de même composition (dans n'importe quel ordre) n'est pas résumé deux fois.
+    """
+    generate = CountingGenerator()
+    first = cached(db_session, {0: ([3, 1, 2], "a"), 1: ([4], "b")}, generate)
+    assert generate.calls == ["a", "b"]
+    assert first[0] == {"title": "Title a", "summary": "Summary a"}
+
+    # Identifiants de clusters différents, mêmes compositions : aucun appel
+    second = cached(db_session, {5: ([4], "b"), 7: ([2, 3, 1], "a")}, generate)
+    assert generate.calls == ["a", "b"]
+    assert second[7] == first[0]
+
+    # Nouvelle composition ou nouvelle version du prompt : appel
+    cached(db_session, {0: ([1, 2], "c")}, generate)
+    cached(db_session, {0: ([4], "b")}, generate, prompt_version="2")
+    assert generate.calls == ["a", "b", "c", "b"]
+
+def test_ttl_and_lru_eviction(db_session: Session):
+    """
+    Teste la régénération des entrées expirées et l'éviction des moins récemment utilisées.
+    """
+    generate = CountingGenerator()
+    cached(db_session, {0: ([1], "old")}, generate)
+    entry = db_session.get(ClusterSummaryCacheEntry, cluster_summary_key([1]))
+    entry.created_at = datetime.utcnow() - timedelta(hours=100)
+    db_session.commit()
+
+    result = cached(db_session, {0: ([1], "fresh")}, generate, ttl_hours=72)
+    assert result[0]["title"] == "Title fresh"
+
+    cached(db_session, {0: ([2], "x"), 1: ([3], "y")}, generate, max_entries=2)
+    assert db_session.query(ClusterSummaryCacheEntry).count() == 2
+
+def test_unparsed_llm_answers_are_not_cached(db_session: Session):
+    calls = []
+
+    async def failing_generate(cluster_texts):
+        calls.append(cluster_texts)
+        return {cluster_id: {"title": None, "summary": None} for cluster_id in cluster_texts}
+
+    assert cached(db_session, {0: ([1], "a")}, failing_generate)[0]["title"] is None
+    cached(db_session, {0: ([1], "a")}, failing_generate)
+    assert len(calls) == 2
+
+
+def test_search_does_not_reload_articles_after_clustering(db_session: Session, monkeypatch):
+    """
+    Teste que le cache des résumés ne valide pas la transaction de la requête : les
+    articles de la recherche ne sont pas rechargés un par un pour construire la réponse.
+    """
+    db_session.add_all([
+        Article(title=f"Article {i}", raw_text=f"text {i}", url=f"https://example.com/{i}",
+                published_at=datetime(2024, 1, i + 1), embedding=[float(i // 3), 1.0 - i // 3, 0.0])
+        for i in range(6)
+    ])
+    db_session.commit()
+    db_session.expire_all()
+    monkeypatch.setattr(clustering, "generate_cluster_summaries", CountingGenerator())
+
+    statements, clustered_at = [], []
+
+    async def traced_clustering(*args, **kwargs):
+        result = await clustering.workflow_query_cluster_and_summarize(*args, k=2, **kwargs)
+        clustered_at.append(len(statements))
+        return result
+
+    monkeypatch.setattr(subjects, "workflow_query_cluster_and_summarize", traced_clustering)
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        response = asyncio.run(subjects.search_news(
+            "text", mode="keyword", ef_search=None, probes=None, published_from=None, published_to=None,
+            subjects=None, limit=20, cursor=None, db=db_session,
+        ))
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert len(response.articles) == 6
+    assert sorted(len(cluster.articles) for cluster in response.clusters) == [3, 3]
+    assert not [statement for statement in statements[clustered_at[0]:] if "FROM articles" in statement]
+    assert db_session.query(ClusterSummaryCacheEntry).count() == 2
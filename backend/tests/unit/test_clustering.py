@@ -0,0 +1,82 @@
+# tests/unit/test_clustering.py
+
+import numpy as np
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy.orm import Session
+from app.clustering import embedding_matrix, group_by_label, select_optimal_k, ward_sse
+from app.models import Article
+
+
+def blobs(topics: int, per_topic: int = 30, dimension: int = 64, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=5.0, size=(topics, dimension))
+    return np.vstack([center + rng.normal(size=(per_topic, dimension)) for center in centers])
+
+
+def test_select_optimal_k_methods_agree_on_separated_topics():
+    """
+    Teste que les méthodes rapides retrouvent le k de la méthode exhaustive sur des sujets bien séparés.
+    """
+    embeddings = blobs(6)
+    k_range = range(2, 16)
+    expected = select_optimal_k(embeddings, k_range, method="exhaustive")
+    assert expected == 6
+    assert select_optimal_k(embeddings, k_range, method="ward", sample_size=100, components=10) == expected
+    assert select_optimal_k(embeddings, k_range, method="minibatch", sample_size=100, components=10) == expected
+
+def test_ward_sse_decreases_with_k():
+    """
+    Teste que la SSE déduite des fusions de Ward décroît avec k et vaut la SSE totale pour k = 1.
+    """
+    points = blobs(3, per_topic=10, dimension=4)
+    sse = ward_sse(points, range(1, 10))
+    assert sse == sorted(sse, reverse=True)
+    assert sse[0] == pytest.approx(((points - points.mean(axis=0)) ** 2).sum())
+
+def test_select_optimal_k_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        select_optimal_k(blobs(3), range(2, 6), method="silhouette")
+
+def test_embedding_matrix_skips_missing_embeddings():
+    """
+    Teste la construction de la matrice float32 depuis les formats lus en base.
+    """
+    articles = [
+        SimpleNamespace(embedding="[0.5,1,-2]"),
+        SimpleNamespace(embedding=None),
+        SimpleNamespace(embedding=np.array([1.0, 2.0, 3.0])),
+        SimpleNamespace(embedding=[0.0, 0.0, 1.0]),
+    ]
+    matrix, positions = embedding_matrix(articles)
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    assert positions.tolist() == [0, 2, 3]
+    assert matrix.tolist() == [[0.5, 1.0, -2.0], [1.0, 2.0, 3.0], [0.0, 0.0, 1.0]]
+
+def test_embedding_matrix_loads_only_store_misses(db_session: Session):
+    """
+    Teste que les embeddings trouvés dans le store sont conservés et que seuls les
+    manquants sont lus en base, sans passer par l'attribut `embedding` des articles.
+    """
+    class PartialStore:
+        def get(self, article_ids):
+            positions = np.array([i for i, article_id in enumerate(article_ids) if article_id % 2], dtype=np.intp)
+            return np.array([[float(article_ids[i])] * 3 for i in positions], dtype=np.float32).reshape(-1, 3), positions
+
+    db_session.add_all([
+        Article(id=article_id, title=f"Article {article_id}", raw_text="text", url=f"https://example.com/{article_id}",
+                published_at=datetime(2024, 1, 1), embedding=[-float(article_id)] * 3 if article_id != 4 else None)
+        for article_id in range(1, 6)
+    ])
+    db_session.commit()
+
+    # Articles sans attribut `embedding` : toute lecture article par article échouerait
+    articles = [SimpleNamespace(id=article_id) for article_id in [4, 1, 2, 3, 5]]
+    matrix, positions = embedding_matrix(articles, PartialStore(), db_session)
+    assert positions.tolist() == [1, 2, 3, 4]
+    assert matrix[:, 0].tolist() == [1.0, -2.0, 3.0, 5.0]
+
+def test_group_by_label_orders_by_size_then_label():
+    groups = group_by_label(np.array([2, 0, 2, 1, 0, 2, 1]))
+    assert [group.tolist() for group in groups] == [[0, 2, 5], [1, 4], [3, 6]]
@@ -4,6 +4,9 @@ import pytest
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from datetime import datetime
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
 def test_create_user(db_session: Session):
     """
@@ -137,3 +140,194 @@ def test_authenticate_user(db_session: Session):
     # Test : échec d'authentification
     user = crud.authenticate_user(db_session, username="testuser", password="wrongpassword")
     assert user is False
+
+def test_insert_articles_ignores_existing_urls(db_session: Session):
+    """
+    Teste l'insertion groupée avec ON CONFLICT DO NOTHING et la détection des URLs existantes.
+    """
+    rows = [
+        {"title": f"Article {i}", "raw_text": "text", "summary": None,
+         "published_at": datetime.utcnow(), "url": f"https://example.com/{i}", "embedding": None}
+        for i in range(3)
+    ]
+    inserted = crud.insert_articles(db_session, rows[:2])
+    db_session.commit()
+    assert [url for _, url in inserted] == ["https://example.com/0", "https://example.com/1"]
+
+    assert crud.get_existing_urls(db_session, [row["url"] for row in rows]) == {
+        "https://example.com/0", "https://example.com/1"
+    }
+
+    inserted = crud.insert_articles(db_session, rows)
+    db_session.commit()
+    assert [url for _, url in inserted] == ["https://example.com/2"]
+
+def test_filter_new_articles_deduplicates_batch(db_session: Session):
+    """
+    Teste que les doublons d'URL (en base ou dans le lot) sont écartés.
+    """
+    crud.insert_articles(db_session, [
+        {"title": "Old", "raw_text": "text", "summary": None,
+         "published_at": datetime.utcnow(), "url": "https://example.com/old", "embedding": None}
+    ])
+    db_session.commit()
+    candidates = [
+        {"title": "Old", "url": "https://example.com/old"},
+        {"title": "New", "url": "https://example.com/new"},
+        {"title": "New again", "url": "https://example.com/new"},
+    ]
+    new_articles = crud.filter_new_articles(db_session, candidates)
+    assert [article["title"] for article in new_articles] == ["New"]
+
+def test_ingestion_coverage_next_date(db_session: Session):
+    """
+    Teste l'initialisation de la couverture depuis les articles et le choix de la prochaine date.
+    """
+    from datetime import date
+    crud.insert_articles(db_session, [
+        {"title": "A", "raw_text": "text", "summary": None,
+         "published_at": datetime(2024, 1, 10, 8, 30), "url": "https://example.com/a", "embedding": None},
+        {"title": "B", "raw_text": "text", "summary": None,
+         "published_at": datetime(2024, 1, 9, 23, 0), "url": "https://example.com/b", "embedding": None},
+    ])
+    db_session.commit()
+
+    assert crud.seed_ingestion_coverage(db_session) == 2
+    assert crud.seed_ingestion_coverage(db_session) == 0
+    assert crud.get_next_uncovered_date(db_session, date(2024, 1, 10)) == date(2024, 1, 8)
+    assert crud.get_next_uncovered_date(db_session, date(2024, 1, 12)) == date(2024, 1, 12)
+
+    crud.mark_date_covered(db_session, date(2024, 1, 8), 0)
+    assert crud.get_next_uncovered_date(db_session, date(2024, 1, 10)) == date(2024, 1, 7)
+
+    # Une date couverte au-delà du trou ne prolonge pas la plage
+    crud.mark_date_covered(db_session, date(2024, 1, 6), 0)
+    assert crud.get_next_uncovered_date(db_session, date(2024, 1, 10)) == date(2024, 1, 7)
+    assert crud.get_next_uncovered_date(db_session, date(2024, 1, 6)) == date(2024, 1, 5)
+
+def test_get_latest_articles_paginates(db_session: Session):
+    """
+    Teste la pagination (skip/limit) des articles les plus récents.
+    """
+    crud.insert_articles(db_session, [
+        {"title": f"Article {day}", "raw_text": "text", "summary": None,
+         "published_at": datetime(2024, 1, day), "url": f"https://example.com/{day}", "embedding": None}
+        for day in range(1, 6)
+    ])
+    db_session.commit()
+    articles = crud.get_latest_articles(db_session, skip=1, limit=2)
+    assert [article.title for article in articles] == ["Article 4", "Article 3"]
+
+def test_cluster_snapshots_latest_and_pruning(db_session: Session):
+    """
+    Teste la lecture du dernier snapshot de clusters et la suppression des plus anciens.
+    """
+    assert crud.get_latest_cluster_snapshot(db_session) is None
+
+    inserted = crud.insert_articles(db_session, [
+        {"title": f"Article {day}", "raw_text": "text", "summary": None,
+         "published_at": datetime(2024, 1, day), "url": f"https://example.com/{day}", "embedding": None}
+        for day in range(1, 4)
+    ])
+    db_session.commit()
+    ids = [article_id for article_id, _ in inserted]
+
+    crud.create_cluster_snapshot(db_session, [
+        {"cluster_id": 0, "title": "Old", "summary": "Old summary", "article_ids": ids},
+    ], article_count=3)
+    latest = crud.create_cluster_snapshot(db_session, [
+        {"cluster_id": 1, "title": "Big", "summary": "Two articles", "article_ids": ids[:2]},
+        {"cluster_id": 0, "title": "Small", "summary": "One article", "article_ids": ids[2:]},
+    ], article_count=3)
+
+    snapshot = crud.get_latest_cluster_snapshot(db_session)
+    assert [(cluster.title, [a.title for a in articles]) for cluster, articles in snapshot] == [
+        ("Big", ["Article 2", "Article 1"]),
+        ("Small", ["Article 3"]),
+    ]
+
+    assert crud.prune_cluster_snapshots(db_session, keep=1) == 1
+    assert [s.id for s in db_session.query(models.ClusterSnapshot)] == [latest.id]
+    assert db_session.query(models.snapshot_cluster_articles).count() == 3
+
+    crud.create_cluster_snapshot(db_session, [], article_count=0)
+    assert crud.get_latest_cluster_snapshot(db_session) == []
+
+def test_vector_column_round_trip_and_bulk_load(db_session: Session):
+    """
+    Teste que la colonne vector accepte listes et tableaux, se relit en float32 et se
+    charge en une seule matrice.
+    """
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4) / 7
+    db_session.add_all([
+        models.Article(title=f"A{i}", raw_text="t", published_at=datetime(2024, 1, 1),
+                       url=f"https://example.com/v{i}", embedding=vectors[i] if i else vectors[i].tolist())
+        for i in range(3)
+    ])
+    db_session.add(models.Article(title="A3", raw_text="t", published_at=datetime(2024, 1, 1), url="https://example.com/v3"))
+    db_session.commit()
+    db_session.expire_all()
+
+    article = db_session.query(models.Article).filter_by(url="https://example.com/v0").one()
+    assert article.embedding.dtype == np.float32
+    assert np.array_equal(article.embedding, vectors[0])
+
+    ids, matrix = crud.load_embedding_matrix(db_session, dimension=4)
+    assert len(ids) == 3 and matrix.shape == (3, 4)
+    assert np.array_equal(matrix, vectors)
+    ids, matrix = crud.load_embedding_matrix(db_session, article_ids=ids[1:], dimension=4)
+    assert np.array_equal(matrix, vectors[1:])
+
+def test_similarity_search_binds_vector_parameter():
+    """
+    Teste que la requête de similarité lit l'embedding au format binaire et transmet le
+    vecteur de requête comme paramètre typé, sans formatage manuel.
+    """
+    query = select(models.Article.embedding).order_by(models.Article.embedding.l2_distance(np.ones(3, dtype=np.float32)))
+    compiled = query.compile(dialect=postgresql.dialect())
+    assert "vector_send(articles.embedding)" in str(compiled)
+    assert "articles.embedding <-> %(embedding_1)s" in str(compiled)
+    parameter = compiled.binds["embedding_1"]
+    assert isinstance(parameter.type, models.Vector)
+    assert parameter.type.bind_processor(postgresql.dialect())(parameter.value) == "[1,1,1]"
+
+def test_update_article_summaries_in_one_statement(db_session: Session):
+    """
+    Teste l'écriture groupée des résumés (repli executemany hors PostgreSQL) sans validation implicite.
+    """
+    db_session.add_all([
+        models.Article(title=f"A{i}", raw_text="t", published_at=datetime(2024, 1, 1), url=f"https://example.com/s{i}")
+        for i in range(3)
+    ])
+    db_session.commit()
+    ids = [article_id for (article_id,) in db_session.query(models.Article.id).order_by(models.Article.id)]
+
+    assert crud.update_article_summaries(db_session, {ids[0]: "first", ids[2]: "third"}) == 2
+    db_session.rollback()
+    assert db_session.query(models.Article).filter(models.Article.summary.isnot(None)).count() == 0
+
+    crud.update_article_summaries(db_session, {ids[0]: "first", ids[2]: "third"})
+    db_session.commit()
+    assert [a.summary for a in db_session.query(models.Article).order_by(models.Article.id)] == ["first", None, "third"]
+    assert crud.update_article_summaries(db_session, {}) == 0
+
+def test_update_article_summaries_postgresql_statement():
+    """
+    Teste la forme de la requête PostgreSQL : un UPDATE ... FROM (VALUES ...) par lot.
+    """
+    class FakeSession:
+        def __init__(self):
+            self.statements = []
+
+        def get_bind(self):
+            return type("Bind", (), {"dialect": postgresql.dialect()})()
+
+        def execute(self, statement):
+            self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+            return type("Result", (), {"rowcount": 2})()
+
+    db = FakeSession()
+    assert crud.update_article_summaries(db, {1: "a", 2: "b", 3: "c"}, chunk_size=2) == 4
+    assert len(db.statements) == 2
+    assert "UPDATE articles SET summary=new_summaries.summary FROM (VALUES" in db.statements[0]
+    assert "AS new_summaries (id, summary) WHERE articles.id = new_summaries.id" in db.statements[0]
@@ -0,0 +1,129 @@
+# tests/unit/test_embedding_cache.py
+
+import asyncio
+import threading
+import time
+import pytest
+from sqlalchemy.orm import Session
+from app.models import EmbeddingCacheEntry
+from app.utils.embedding_cache import QueryEmbeddingCache, get_embeddings_cached, embedding_cache_stats
+from app.utils.embeddings import LocalEmbeddingProvider
+
+
+class CountingProvider(LocalEmbeddingProvider):
+    """
+    Fournisseur local qui compte les textes encodés.
+    """
+    def __init__(self):
+        super().__init__(dimension=8)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_cache_hits_skip_provider(db_session: Session):
+    """
+    Teste que les textes déjà vus (ou dupliqués dans le lot) ne sont encodés qu'une fois.
+    """
+    provider = CountingProvider()
+    before = embedding_cache_stats.snapshot()
+
+    first = get_embeddings_cached(db_session, ["wire story", "other story", "wire story"], provider=provider)
+    assert provider.embedded == ["wire story", "other story"]
+    assert first[0] == first[2]
+
+    second = get_embeddings_cached(db_session, ["wire story", "new story"], provider=provider)
+    assert provider.embedded == ["wire story", "other story", "new story"]
+    assert second[0] == first[0]
+
+    after = embedding_cache_stats.snapshot()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] - before["misses"] == 3
+
+def test_cache_evicts_least_recently_used(db_session: Session):
+    """
+    Teste l'éviction LRU quand le cache dépasse sa taille maximale.
+    """
+    provider = CountingProvider()
+    get_embeddings_cached(db_session, ["a"], provider=provider, max_entries=2)
+    get_embeddings_cached(db_session, ["b"], provider=provider, max_entries=2)
+    get_embeddings_cached(db_session, ["a"], provider=provider, max_entries=2)  # "a" redevient récent
+    get_embeddings_cached(db_session, ["c"], provider=provider, max_entries=2)
+
+    assert db_session.query(EmbeddingCacheEntry).count() == 2
+    get_embeddings_cached(db_session, ["a"], provider=provider, max_entries=2)
+    assert provider.embedded == ["a", "b", "c"]
+
+
+class SlowLoader:
+    """
+    Chargeur factice (appelé dans un thread) qui compte ses appels.
+    """
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text):
+        with self.lock:
+            self.calls.append(text)
+        time.sleep(self.delay)
+        if text == "boom":
+            raise RuntimeError("provider down")
+        return [float(len(text)), 1.0]
+
+
+def test_query_cache_coalesces_concurrent_identical_queries():
+    """
+    Teste qu'une seule requête d'embedding est émise pour des requêtes identiques
+    (après normalisation) simultanées, sans bloquer la boucle d'événements.
+    """
+    loader = SlowLoader(delay=0.05)
+    cache = QueryEmbeddingCache(loader, max_entries=10, ttl_seconds=60)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        results = await asyncio.gather(*(cache.get(q) for q in ["Élections US", " élections  us ", "ÉLECTIONS US"]))
+        task.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+    assert loader.calls == ["élections us"]
+    assert all(result is results[0] for result in results)
+    assert ticks > 3
+    assert asyncio.run(cache.get("élections us")) is results[0]
+    assert cache.stats.snapshot()["misses"] == 1
+
+
+def test_query_cache_expires_and_evicts_entries():
+    """
+    Teste l'expiration (TTL), l'éviction LRU et la non-mise en cache des échecs.
+    """
+    now = [0.0]
+    loader = SlowLoader()
+    cache = QueryEmbeddingCache(loader, max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    for q in ["a", "b", "a", "c"]:
+        asyncio.run(cache.get(q))
+    assert loader.calls == ["a", "b", "c"]  # "b", le moins récent, a été évincé
+    asyncio.run(cache.get("b"))
+    assert loader.calls[-1] == "b"
+
+    now[0] = 11
+    asyncio.run(cache.get("b"))
+    assert loader.calls[-1] == "b" and len(loader.calls) == 5
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get("boom"))
+    assert loader.calls.count("boom") == 2
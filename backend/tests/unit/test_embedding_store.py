@@ -0,0 +1,64 @@
+# tests/unit/test_embedding_store.py
+
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models import Article
+from app.utils.embedding_store import EmbeddingStore
+
+
+def add_article(db: Session, n: int, vector, days_ago: float) -> int:
+    article = Article(
+        title=f"Article {n}", raw_text="t", url=f"https://example.com/{n}",
+        published_at=datetime.utcnow() - timedelta(days=days_ago), embedding=vector,
+    )
+    db.add(article)
+    db.commit()
+    return article.id
+
+
+def test_sync_appends_incrementally_and_evicts_old_articles(db_session: Session, tmp_path):
+    """
+    Teste l'ajout incrémental des nouveaux articles, le retrait de ceux sortis de la
+    fenêtre et la visibilité des mises à jour pour un lecteur séparé (autre processus).
+    """
+    vectors = np.eye(4, dtype=np.float32)
+    old_id = add_article(db_session, 0, vectors[0], days_ago=6)
+    first_id = add_article(db_session, 1, vectors[1], days_ago=1)
+    add_article(db_session, 2, vectors[2], days_ago=30)
+
+    writer = EmbeddingStore(str(tmp_path), dimension=4)
+    reader = EmbeddingStore(str(tmp_path), dimension=4)
+    assert writer.sync(db_session, window_days=7) == {"added": 2, "evicted": 0, "size": 2}
+    assert reader.view()[0].tolist() == [old_id, first_id]
+
+    new_id = add_article(db_session, 3, vectors[3], days_ago=0)
+    assert writer.sync(db_session, window_days=7) == {"added": 1, "evicted": 0, "size": 3}
+    assert writer.sync(db_session, window_days=7)["added"] == 0
+
+    # Fenêtre réduite : l'article d'il y a six jours sort du store
+    assert writer.sync(db_session, window_days=3) == {"added": 0, "evicted": 1, "size": 2}
+    ids, matrix = reader.view()
+    assert ids.tolist() == [first_id, new_id]
+    assert np.array_equal(matrix, vectors[[1, 3]])
+    assert len(list(tmp_path.glob("vectors-*.f32"))) == 1
+
+
+def test_lookup_nearest_and_related(tmp_path):
+    """
+    Teste l'index des identifiants et la recherche exhaustive des plus proches voisins.
+    """
+    store = EmbeddingStore(str(tmp_path), dimension=2)
+    vectors = np.array([[0, 0], [1, 0], [0, 3], [1, 1]], dtype=np.float32)
+    store.append([10, 20, 30, 40], [0, 0, 0, 0], vectors)
+
+    assert store.rows_for([30, 15, 10, 99]).tolist() == [2, -1, 0, -1]
+    matrix, positions = store.get([40, 15, 20])
+    assert positions.tolist() == [0, 2]
+    assert np.array_equal(matrix, vectors[[3, 1]])
+
+    ids, distances = store.nearest([0.9, 0.3], limit=2)
+    assert ids == [20, 40]
+    assert np.allclose(distances, [np.hypot(0.1, 0.3), np.hypot(0.1, 0.7)])
+    assert store.related(10, limit=2) == [20, 40]
+    assert store.related(99) is None
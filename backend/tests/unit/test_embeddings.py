@@ -0,0 +1,64 @@
+# tests/unit/test_embeddings.py
+
+from app.utils.embeddings import LocalEmbeddingProvider, embedding_to_array, format_pgvector, generate_embeddings_batch
+import numpy as np
+
+
+class RecordingProvider(LocalEmbeddingProvider):
+    """
+    Fournisseur local qui enregistre la taille de chaque appel.
+    """
+    def __init__(self):
+        super().__init__(dimension=16)
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(len(texts))
+        return super().embed_documents(texts)
+
+
+def test_local_provider_is_deterministic():
+    """
+    Teste que le fournisseur local renvoie toujours le même vecteur normalisé pour un texte.
+    """
+    provider = LocalEmbeddingProvider(dimension=64)
+    first = provider.embed_query("Markets rally after rate cut")
+    second = provider.embed_query("Markets rally after rate cut")
+    assert first == second
+    assert len(first) == 64
+    assert np.isclose(np.linalg.norm(first), 1.0)
+
+def test_generate_embeddings_batch_chunks_and_keeps_order():
+    """
+    Teste le découpage en lots et la conservation de l'ordre des embeddings.
+    """
+    provider = RecordingProvider()
+    texts = [f"article number {i}" for i in range(10)]
+    embeddings = generate_embeddings_batch(texts, chunk_size=3, max_concurrency=2, provider=provider)
+
+    assert sorted(provider.calls) == [1, 3, 3, 3]
+    assert embeddings == [provider.embed_query(text) for text in texts]
+
+def test_generate_embeddings_batch_empty():
+    """
+    Teste qu'aucun appel n'est fait pour une liste vide.
+    """
+    provider = RecordingProvider()
+    assert generate_embeddings_batch([], provider=provider) == []
+    assert provider.calls == []
+
+
+def test_pgvector_text_and_binary_round_trip():
+    """
+    Teste que les formes texte et binaire (vector_send) de pgvector restituent exactement le vecteur float32.
+    """
+    vector = np.random.default_rng(0).normal(size=32).astype(np.float32)
+    text = format_pgvector(vector)
+    assert text.startswith("[") and text.endswith("]")
+    assert np.array_equal(embedding_to_array(text), vector)
+
+    binary = memoryview(np.array([32, 0], dtype=">i2").tobytes() + vector.astype(">f4").tobytes())
+    decoded = embedding_to_array(binary)
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, vector)
+    assert format_pgvector(None) is None
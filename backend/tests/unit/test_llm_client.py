@@ -0,0 +1,61 @@
+# tests/unit/test_llm_client.py
+
+import asyncio
+import pytest
+from app.utils.openai import AsyncLLMClient, TokenBucket
+
+
+class SlowLLM:
+    """
+    Modèle factice qui mesure le nombre d'appels simultanés.
+    """
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+
+    async def ainvoke(self, prompt):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return f"answer to {prompt}"
+
+
+def test_client_limits_concurrency_on_caller_loop():
+    """
+    Teste que les appels s'exécutent sur la boucle de l'appelant dans la limite du sémaphore.
+    """
+    llm = SlowLLM(delay=0.01)
+    client = AsyncLLMClient(llm, max_concurrency=2, requests_per_minute=0, burst=1, timeout=1)
+
+    async def run():
+        return await asyncio.gather(*(client.invoke(str(i)) for i in range(6)))
+
+    assert asyncio.run(run()) == [f"answer to {i}" for i in range(6)]
+    assert llm.max_running == 2
+    # Une nouvelle boucle (autre requête, autre cycle du scheduler) obtient son propre sémaphore
+    assert asyncio.run(client.invoke("again")) == "answer to again"
+
+
+def test_client_times_out():
+    """
+    Teste le timeout par appel.
+    """
+    client = AsyncLLMClient(SlowLLM(delay=1), max_concurrency=1, requests_per_minute=0, burst=1, timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.invoke("slow"))
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    """
+    Teste que le seau laisse passer `capacity` appels puis impose l'intervalle du débit.
+    """
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+    assert TokenBucket(rate=0, capacity=1).reserve() == 0
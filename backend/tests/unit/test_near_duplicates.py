@@ -0,0 +1,62 @@
+# tests/unit/test_near_duplicates.py
+
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app import crud
+from app.utils.near_duplicates import (
+    simhash, hamming_distance, filter_near_duplicates, save_signatures, backfill_signatures,
+)
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent "
+    "inflation in services and a tight labour market, and signalled that further increases remain possible"
+)
+
+
+def test_simhash_is_close_for_light_edits():
+    """
+    Teste qu'une dépêche légèrement retouchée reste proche et qu'un autre texte est éloigné.
+    """
+    edited = STORY.replace("on Wednesday", "on Wednesday afternoon") + " … [+2817 chars]"
+    other = "The football club announced the signing of a young striker from the Portuguese league on a five year deal"
+    assert hamming_distance(simhash(STORY), simhash(STORY + " [+12 chars]")) == 0
+    assert hamming_distance(simhash(STORY), simhash(edited)) < hamming_distance(simhash(STORY), simhash(other))
+    assert hamming_distance(simhash(STORY), simhash(other)) > 3
+
+def test_filter_near_duplicates_against_corpus_and_batch(db_session: Session):
+    """
+    Teste l'exclusion des quasi-doublons du corpus (via les bandes indexées) et du lot.
+    """
+    inserted = crud.insert_articles(db_session, [
+        {"title": "Rates", "raw_text": STORY, "summary": None,
+         "published_at": datetime.utcnow(), "url": "https://example.com/rates", "embedding": None}
+    ])
+    save_signatures(db_session, [(inserted[0][0], simhash(STORY))])
+    db_session.commit()
+
+    candidates = [
+        {"title": "Syndicated", "raw_text": STORY + " [+1200 chars]", "url": "https://mirror.example.com/rates"},
+        {"title": "Sport", "raw_text": "The striker scored twice as the home side won the derby", "url": "https://example.com/sport"},
+        {"title": "Sport copy", "raw_text": "The striker scored twice as the home side won the derby", "url": "https://copy.example.com/sport"},
+    ]
+    kept, duplicates = filter_near_duplicates(db_session, candidates)
+
+    assert [article["title"] for article in kept] == ["Sport"]
+    assert "simhash" in kept[0]
+    assert [(article["title"], canonical) for article, canonical in duplicates] == [
+        ("Syndicated", inserted[0][0]), ("Sport copy", None)
+    ]
+
+def test_backfill_signatures(db_session: Session):
+    """
+    Teste le calcul des signatures manquantes pour les articles existants.
+    """
+    crud.insert_articles(db_session, [
+        {"title": f"A{i}", "raw_text": f"text {i}", "summary": None,
+         "published_at": datetime.utcnow(), "url": f"https://example.com/{i}", "embedding": None}
+        for i in range(3)
+    ])
+    db_session.commit()
+    assert backfill_signatures(db_session, limit=2) == 2
+    assert backfill_signatures(db_session) == 1
+    assert backfill_signatures(db_session) == 0
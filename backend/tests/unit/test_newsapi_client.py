@@ -0,0 +1,108 @@
+# tests/unit/test_newsapi_client.py
+
+import asyncio
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from app.utils.newsapi_client import NewsAPIClient, NewsAPIError
+
+
+class FakeNewsAPIHandler(BaseHTTPRequestHandler):
+    """
+    Faux serveur NewsAPI : 5 articles par requête, paginés, et un 429 au premier appel.
+    """
+    total_results = 5
+    calls = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.calls.append(query)
+        if len(self.calls) == 1:
+            return self._reply(429, {"status": "error", "code": "rateLimited"}, {"Retry-After": "0"})
+        if query["q"][0] == "broken":
+            return self._reply(401, {"status": "error", "code": "apiKeyInvalid"})
+
+        page, page_size = int(query["page"][0]), int(query["pageSize"][0])
+        start = (page - 1) * page_size
+        articles = [
+            {
+                "title": f"{query['q'][0]} {i}",
+                "content": f"content {i}",
+                "publishedAt": f"{query['from'][0]}T12:00:00Z",
+                "url": f"https://example.com/{query['q'][0]}/{i}",
+            }
+            for i in range(start, min(start + page_size, self.total_results))
+        ]
+        self._reply(200, {"status": "ok", "totalResults": self.total_results, "articles": articles})
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_newsapi():
+    """
+    Démarre le faux serveur NewsAPI dans un thread et renvoie son URL.
+    """
+    FakeNewsAPIHandler.calls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNewsAPIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_day_paginates_and_retries_on_429(fake_newsapi):
+    """
+    Teste la pagination et la reprise après une réponse 429.
+    """
+    async def run():
+        async with NewsAPIClient(base_url=fake_newsapi, page_size=2, backoff=0) as client:
+            return await client.fetch_day(date(2024, 1, 1), "news", max_pages=10)
+
+    articles = asyncio.run(run())
+    assert [article["title"] for article in articles] == [f"news {i}" for i in range(5)]
+    assert articles[0]["published_at"].isoformat() == "2024-01-01T12:00:00"
+    # 1 réponse 429 puis 3 pages
+    assert [call["page"][0] for call in FakeNewsAPIHandler.calls] == ["1", "1", "2", "3"]
+
+def test_fetch_many_runs_requests_concurrently(fake_newsapi):
+    """
+    Teste la récupération parallèle de plusieurs couples (date, requête).
+    """
+    async def run():
+        async with NewsAPIClient(base_url=fake_newsapi, page_size=5, backoff=0) as client:
+            return await client.fetch_many([(date(2024, 1, 1), "sport"), (date(2024, 1, 2), "tech")])
+
+    sport, tech = asyncio.run(run())
+    assert len(sport) == 5 and sport[0]["url"] == "https://example.com/sport/0"
+    assert len(tech) == 5 and tech[0]["published_at"].day == 2
+
+def test_fetch_day_raises_on_client_error(fake_newsapi):
+    """
+    Teste qu'une erreur non retentable est remontée.
+    """
+    async def run():
+        async with NewsAPIClient(base_url=fake_newsapi, backoff=0) as client:
+            await client.fetch_day(date(2024, 1, 1), "broken")
+
+    with pytest.raises(NewsAPIError):
+        asyncio.run(run())
@@ -0,0 +1,89 @@
+# tests/unit/test_online_clustering.py
+
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy.orm import Session
+from app import crud
+from app.models import ArticleCluster, OnlineCluster
+from app.utils.online_clustering import assign_articles, assign_unclustered_articles, rebalance_clusters
+
+
+def insert(db: Session, count: int) -> list:
+    inserted = crud.insert_articles(db, [
+        {"title": f"Article {i}", "raw_text": "text", "summary": None,
+         "published_at": datetime.utcnow(), "url": f"https://example.com/{i}", "embedding": None}
+        for i in range(count)
+    ])
+    db.commit()
+    return [article_id for article_id, _ in inserted]
+
+
+def test_assign_to_nearest_centroid_or_open_cluster(db_session: Session):
+    """
+    Teste l'affectation au centroïde le plus proche, l'ouverture d'un cluster au-delà du
+    seuil et la mise à jour des centroïdes en moyenne glissante.
+    """
+    ids = insert(db_session, 4)
+    assignments = assign_articles(db_session, [
+        (ids[0], [1.0, 0.0, 0.0]),
+        (ids[1], [0.0, 1.0, 0.0]),
+        (ids[2], [0.98, 0.05, 0.0]),
+    ], threshold=0.1)
+    db_session.commit()
+    assert assignments[ids[0]] == assignments[ids[2]] != assignments[ids[1]]
+
+    cluster = db_session.get(OnlineCluster, assignments[ids[0]])
+    assert cluster.size == 2
+    assert np.allclose(np.frombuffer(cluster.centroid, dtype=np.float32), [0.99, 0.025, 0.0])
+
+    # Un lot suivant réutilise les centroïdes persistés
+    assert assign_articles(db_session, [(ids[3], [0.0, 0.9, 0.1])], threshold=0.1) == {ids[3]: assignments[ids[1]]}
+
+def test_rebalance_merges_close_clusters_and_retires_stale_ones(db_session: Session):
+    """
+    Teste la fusion de deux clusters dont les centroïdes sont proches et le retrait des clusters inactifs.
+    """
+    ids = insert(db_session, 4)
+    assignments = assign_articles(db_session, [
+        (ids[0], [1.0, 0.0, 0.0]),
+        (ids[1], [0.9, 0.3, 0.0]),
+        (ids[2], [0.9, 0.3, 0.0]),
+        (ids[3], [0.0, 0.0, 1.0]),
+    ], threshold=0.02)
+    stale = db_session.get(OnlineCluster, assignments[ids[3]])
+    stale.updated_at = datetime.utcnow() - timedelta(days=30)
+    db_session.commit()
+    assert len(set(assignments.values())) == 3
+
+    stats = rebalance_clusters(db_session, merge_distance=0.1, split_min_size=100, retention_days=7)
+    assert stats == {"retired": 1, "merged": 1, "split": 0}
+
+    clusters = db_session.query(OnlineCluster).all()
+    assert [cluster.size for cluster in clusters] == [3]
+    members = {row.article_id: row.cluster_id for row in db_session.query(ArticleCluster)}
+    assert members == {ids[0]: clusters[0].id, ids[1]: clusters[0].id, ids[2]: clusters[0].id}
+
+
+def test_retired_articles_are_not_reassigned(db_session: Session):
+    """
+    Teste que les articles d'un cluster retiré ne sont pas réaffectés au passage suivant
+    (affectation → rééquilibrage → affectation), contrairement aux articles récents.
+    """
+    now = datetime.utcnow()
+    inserted = crud.insert_articles(db_session, [
+        {"title": "Old", "raw_text": "text", "summary": None, "published_at": now - timedelta(days=30),
+         "url": "https://example.com/old", "embedding": [0.0, 0.0, 1.0]},
+        {"title": "New", "raw_text": "text", "summary": None, "published_at": now,
+         "url": "https://example.com/new", "embedding": [1.0, 0.0, 0.0]},
+    ])
+    db_session.commit()
+    old_id, new_id = [article_id for article_id, _ in inserted]
+    assignments = assign_articles(db_session, [(old_id, [0.0, 0.0, 1.0])])
+    db_session.get(OnlineCluster, assignments[old_id]).updated_at = now - timedelta(days=30)
+    db_session.commit()
+
+    assert rebalance_clusters(db_session, split_min_size=100, retention_days=7)["retired"] == 1
+    assert assign_unclustered_articles(db_session, retention_days=7) == 1
+    members = {row.article_id for row in db_session.query(ArticleCluster)}
+    assert members == {new_id}
+    assert assign_unclustered_articles(db_session, retention_days=7) == 0
@@ -0,0 +1,92 @@
+# tests/unit/test_pipeline.py
+
+import asyncio
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import IngestionCoverage
+from app.tasks.pipeline import IngestionPipeline
+from app.utils.embeddings import LocalEmbeddingProvider
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent "
+    "inflation in services and a tight labour market, and signalled that further increases remain possible"
+)
+
+
+def article(n: int, text: str) -> dict:
+    return {"title": f"Article {n}", "raw_text": text, "summary": None,
+            "published_at": "2024-01-01T12:00:00", "url": f"https://example.com/{n}"}
+
+
+class FakeClient:
+    """
+    Client NewsAPI factice : deux pages pour le 1er janvier, une erreur pour le 2.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def iter_day_pages(self, target_date, query, max_pages):
+        if target_date == date(2024, 1, 2):
+            raise RuntimeError("NewsAPI indisponible")
+        yield [article(1, "<p>" + STORY + "</p>"), article(2, "Markets closed higher"), article(3, "")]
+        # Page suivante : une URL déjà vue et un quasi-doublon de la page précédente
+        yield [article(2, "Markets closed higher"), article(4, STORY + " [+1200 chars]"), article(5, "A new stadium opens")]
+
+
+class RecordingPipeline(IngestionPipeline):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.written = []
+
+    def write_batch(self, db, articles):
+        self.written.extend(articles)
+        return len(articles)
+
+
+def test_pipeline_streams_batches_and_tracks_failures(tmp_path):
+    """
+    Teste le passage des pages à travers toutes les étapes, le dédoublonnage entre pages,
+    les petites transactions, les métriques et la couverture des seules dates réussies.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    pipeline = RecordingPipeline(
+        session_factory=session_factory,
+        client_factory=FakeClient,
+        provider=LocalEmbeddingProvider(dimension=8),
+        queue_size=1,
+        commit_size=1,
+    )
+    result = asyncio.run(pipeline.run([(date(2024, 1, 1), "news"), (date(2024, 1, 2), "news")]))
+
+    assert sorted(a["url"] for a in pipeline.written) == [
+        "https://example.com/1", "https://example.com/2", "https://example.com/5",
+    ]
+    assert next(a for a in pipeline.written if a["url"].endswith("/1"))["raw_text"] == STORY
+    assert all(len(a["embedding"]) == 8 for a in pipeline.written)
+    assert result["inserted"] == 3
+    assert result["skipped"] == 3
+    assert result["near_duplicates"] == 1
+    assert result["covered"] == [date(2024, 1, 1)]
+    assert result["failed_dates"] == [date(2024, 1, 2)]
+
+    stages = result["stages"]
+    assert stages["fetch"]["items_out"] == 6
+    assert stages["fetch"]["errors"] == 1
+    assert stages["clean"]["items_out"] == 5
+    assert stages["write"]["batches"] == 2
+    assert all(stage["max_queue_depth"] <= 1 for stage in stages.values())
+
+    db = session_factory()
+    try:
+        assert [row.date for row in db.query(IngestionCoverage)] == [date(2024, 1, 1)]
+    finally:
+        db.close()
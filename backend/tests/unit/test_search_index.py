@@ -0,0 +1,181 @@
+# tests/unit/test_search_index.py
+
+from datetime import datetime
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app import crud
+from app.config import settings
+from app.models import Article
+from app.utils.vector_search import vector_index_cache
+from app.tasks.search_index import ivfflat_lists, text_search_ddl, vector_index_ddl
+
+
+def test_vector_index_ddl():
+    """
+    Teste l'instruction de création de l'index pour chaque méthode et distance.
+    """
+    assert vector_index_ddl("hnsw", "l2", m=16, ef_construction=64) == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_articles_embedding_ann ON articles "
+        "USING hnsw (embedding vector_l2_ops) WITH (m = 16, ef_construction = 64)"
+    )
+    assert vector_index_ddl("ivfflat", "cosine", lists=40).endswith("USING ivfflat (embedding vector_cosine_ops) WITH (lists = 40)")
+    with pytest.raises(ValueError):
+        vector_index_ddl("flat", "l2")
+    with pytest.raises(ValueError):
+        vector_index_ddl("hnsw", "dot")
+
+
+def test_ivfflat_lists():
+    assert ivfflat_lists(0) == 1
+    assert ivfflat_lists(50_000) == 50
+    assert ivfflat_lists(4_000_000) == 2000
+
+
+def test_vector_distance_matches_index_operator():
+    """
+    Teste que la requête utilise l'opérateur de la classe d'opérateurs de l'index.
+    """
+    def compiled(metric):
+        return str(crud.vector_distance([0.0, 1.0], metric).compile(dialect=postgresql.dialect()))
+
+    assert "<->" in compiled("l2")
+    assert "<=>" in compiled("cosine")
+    with pytest.raises(ValueError):
+        crud.vector_distance([0.0, 1.0], "dot")
+
+
+def test_search_options_ignored_outside_postgresql(db_session: Session):
+    """
+    Teste que les réglages de l'index ne sont appliqués que sur PostgreSQL.
+    """
+    crud.set_vector_search_options(db_session, ef_search=100, probes=10)
+    assert not db_session.in_transaction()
+
+
+def test_text_search_ddl():
+    """
+    Teste la colonne tsvector générée (titre pondéré plus fort que le texte) et son index GIN.
+    """
+    column, index = text_search_ddl("english")
+    assert column.startswith("ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (")
+    assert "setweight(to_tsvector('english', coalesce(title, '')), 'A')" in column
+    assert column.endswith("STORED")
+    assert index == "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)"
+    with pytest.raises(ValueError):
+        text_search_ddl("english'); DROP TABLE articles; --")
+
+
+def test_reciprocal_rank_fusion():
+    """
+    Teste que les articles bien classés dans les deux classements passent devant.
+    """
+    assert crud.reciprocal_rank_fusion([[1, 2, 3], [3, 4, 1]], k=60) == [1, 3, 2, 4]
+    assert crud.reciprocal_rank_fusion([[5, 6], []]) == [5, 6]
+
+
+def add_articles(db: Session):
+    articles = [
+        Article(title="NVDA rallies", raw_text="Chip stocks up", url="https://example.com/1", published_at=datetime(2024, 1, 1)),
+        Article(title="Markets", raw_text="nvda and AMD results", url="https://example.com/2", published_at=datetime(2024, 1, 2)),
+        Article(title="Weather", raw_text="Rain 100% likely", url="https://example.com/3", published_at=datetime(2024, 1, 3)),
+    ]
+    db.add_all(articles)
+    db.commit()
+    return articles
+
+
+def test_keyword_search_without_postgresql(db_session: Session):
+    """
+    Teste la recherche par mots-clés de repli (hors PostgreSQL) : tous les termes, sans
+    tenir compte de la casse, jokers LIKE échappés.
+    """
+    first, second, third = add_articles(db_session)
+    assert crud.search_articles_by_keywords(db_session, "nvda") == [second, first]
+    assert crud.search_articles_by_keywords(db_session, "NVDA amd") == [second]
+    assert crud.search_articles_by_keywords(db_session, "100%") == [third]
+    assert crud.search_articles_by_keywords(db_session, "0%l") == []
+    assert crud.search_articles_by_keywords(db_session, "  ") == []
+
+
+def vector(*values):
+    return list(values) + [0.0] * (1536 - len(values))
+
+
+@pytest.fixture
+def inprocess_search(monkeypatch):
+    """
+    Moteur vectoriel en mémoire (SQLite n'a pas pgvector), index reconstruit pour chaque test.
+    """
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_BACKEND", "inprocess")
+    vector_index_cache.clear()
+    yield
+    vector_index_cache.clear()
+
+
+def test_hybrid_search_fuses_vector_and_keyword_rankings(db_session: Session, inprocess_search):
+    """
+    Teste la fusion : un article trouvé par les deux classements passe en tête.
+    """
+    first, second, third = add_articles(db_session)
+    first.embedding, second.embedding, third.embedding = vector(3.0), vector(2.0), vector(1.0)
+    db_session.commit()
+
+    assert crud.search_articles_by_similarity(db_session, vector(1.0), limit=2) == [third, second]
+    assert crud.search_articles_by_similarity(db_session, vector(1.0), limit=2, query_text="nvda") == [second, first]
+
+
+def test_related_articles_use_search_metric(db_session: Session, inprocess_search):
+    """
+    Teste que les articles proches sont classés selon la distance de l'index vectoriel.
+    """
+    first, second, third = add_articles(db_session)
+    first.embedding, second.embedding, third.embedding = vector(1.0), vector(0.5, 0.5), vector(5.0, 0.2)
+    db_session.commit()
+
+    assert crud.get_related_articles(db_session, first.id, limit=1, metric="l2") == [second]
+    assert crud.get_related_articles(db_session, first.id, limit=1, metric="cosine") == [third]
+
+
+def test_search_cursor_round_trip():
+    """
+    Teste l'encodage des curseurs et le rejet des curseurs invalides.
+    """
+    position = {"distance": 0.123456789, "id": 42}
+    assert crud.decode_search_cursor(crud.encode_search_cursor(position)) == position
+    assert crud.decode_search_cursor(crud.encode_search_cursor({"offset": 20})) == {"offset": 20}
+    for cursor in ["not a cursor", crud.encode_search_cursor({"offset": -1}), crud.encode_search_cursor({"distance": "x", "id": 1})]:
+        with pytest.raises(ValueError):
+            crud.decode_search_cursor(cursor)
+
+
+def test_vector_search_filters_and_pages(db_session: Session, inprocess_search):
+    """
+    Teste les filtres (dates, sujets) et la pagination par curseur (keyset, égalités de
+    distance départagées par l'identifiant) de la recherche vectorielle, et la
+    pagination par rang des recherches par mots-clés.
+    """
+    first, second, third = add_articles(db_session)
+    subject = crud.create_subject(db_session, "markets")
+    first.embedding, second.embedding, third.embedding = vector(1.0), vector(0.0, 1.0), vector(2.0)
+    first.subjects.append(subject)
+    third.subjects.append(subject)
+    db_session.commit()
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = crud.search_articles(db_session, "q", vector(), mode="vector", limit=1, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert pages == [[first], [second], [third]]
+
+    filters = crud.article_search_filters(published_from=datetime(2024, 1, 2), subjects=["markets"])
+    assert crud.search_articles(db_session, "q", vector(), mode="vector", filters=filters) == ([third], None)
+    assert crud.get_related_articles(db_session, first.id, limit=1) == [third]
+
+    page, cursor = crud.search_articles(db_session, "nvda", mode="keyword", limit=1)
+    assert page == [second]
+    assert crud.search_articles(db_session, "nvda", mode="keyword", limit=1, cursor=cursor) == ([first], None)
+    with pytest.raises(ValueError):
+        crud.search_articles(db_session, "nvda", vector(), mode="vector", cursor=cursor)
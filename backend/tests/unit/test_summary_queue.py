@@ -0,0 +1,92 @@
+# tests/unit/test_summary_queue.py
+
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app import crud
+from app.models import Article, SummaryJob
+from app.tasks import summary_queue
+
+
+def add_articles(db: Session, days):
+    articles = [
+        Article(title=f"Article {day}", raw_text=f"text {day}", url=f"https://example.com/{day}",
+                published_at=datetime(2024, 1, day), summary="done" if day == 1 else None)
+        for day in days
+    ]
+    db.add_all(articles)
+    db.commit()
+    return articles
+
+
+def test_enqueue_prioritizes_recent_then_popular_articles(db_session: Session):
+    """
+    Teste la mise en file des seuls articles sans résumé, par fraîcheur puis popularité.
+    """
+    first, older, newer = add_articles(db_session, [1, 2, 3])
+    db_session.refresh(older)
+    assert crud.enqueue_summary_jobs(db_session, [first, older, newer]) == 2
+    # Pas de commit : les articles chargés par l'endpoint ne sont pas expirés (pas de N+1)
+    assert "title" not in inspect(older).expired_attributes
+    assert crud.claim_summary_jobs(db_session, limit=1) == [newer.id]
+
+    # Deux consultations de plus : l'article plus ancien passe devant un plus récent non consulté
+    latest, = add_articles(db_session, [4])
+    crud.enqueue_summary_jobs(db_session, [latest])
+    crud.enqueue_summary_jobs(db_session, [older], popularity_hours=36)
+    crud.enqueue_summary_jobs(db_session, [older], popularity_hours=36)
+    assert db_session.get(SummaryJob, older.id).requests == 3
+    assert crud.claim_summary_jobs(db_session, limit=5) == [older.id, latest.id]
+    assert crud.claim_summary_jobs(db_session, limit=5) == []
+
+
+def test_process_batch_writes_summaries_and_retries_failures(db_session: Session, monkeypatch):
+    """
+    Teste le traitement d'un lot : résumés enregistrés, échecs remis en file puis
+    abandonnés après le nombre maximal de tentatives, et statistiques de la file.
+    """
+    good, bad = add_articles(db_session, [2, 3])
+    crud.enqueue_summary_jobs(db_session, [good, bad])
+
+    async def fake_summary(text):
+        if text == "text 3":
+            raise asyncio.TimeoutError()
+        return f"summary of {text}"
+
+    monkeypatch.setattr(summary_queue, "generate_summary_async", fake_summary)
+    assert asyncio.run(summary_queue.process_summary_batch(db_session)) == 2
+    db_session.expire_all()
+    assert db_session.get(Article, good.id).summary == "summary of text 2"
+    assert db_session.get(SummaryJob, bad.id).status == "pending"
+
+    for _ in range(2):
+        asyncio.run(summary_queue.process_summary_batch(db_session))
+    db_session.expire_all()
+    assert db_session.get(SummaryJob, bad.id).status == "failed"
+    assert db_session.get(SummaryJob, bad.id).attempts == 3
+    assert asyncio.run(summary_queue.process_summary_batch(db_session)) == 0
+
+    stats = crud.get_summary_queue_stats(db_session)
+    assert (stats["pending"], stats["done"], stats["failed"], stats["completed"]) == (0, 1, 1, 1)
+
+
+def test_stats_are_read_only_and_drain_prunes_old_jobs(db_session: Session):
+    """
+    Teste que les statistiques ne suppriment rien et que le vidage de la file supprime
+    les jobs terminés au-delà de la durée de conservation.
+    """
+    old, recent = add_articles(db_session, [2, 3])
+    old_id, recent_id = old.id, recent.id
+    crud.enqueue_summary_jobs(db_session, [old, recent])
+    for job in db_session.query(SummaryJob):
+        job.status = "done"
+        job.completed_at = datetime.utcnow() - timedelta(hours=48 if job.article_id == old_id else 0)
+    db_session.commit()
+
+    assert crud.get_summary_queue_stats(db_session)["done"] == 2
+    assert db_session.query(SummaryJob).count() == 2
+
+    result = asyncio.run(summary_queue.drain_summary_queue(session_factory=lambda: db_session))
+    assert (result["processed"], result["pruned"]) == (0, 1)
+    assert [job.article_id for job in db_session.query(SummaryJob)] == [recent_id]
@@ -0,0 +1,52 @@
+# tests/unit/test_text_cleaning.py
+
+import random
+import warnings
+
+import pytest
+
+from app.utils.text_cleaning import clean_html, clean_html_reference, clean_texts
+
+SAMPLES = [
+    "Plain NewsAPI content with no markup… [+2345 chars]",
+    "<ul><li>First</li><li>Second &amp; third</li></ul> tail",
+    "<p>Intro</p><script>var x = '<p>';</script><style>p{}</style><!-- note -->Body",
+    "Prices &gt; &#36;100 &copy 2024 &foo; &#128; &#x1F600;",
+    "<pre>  keep\n  spaces </pre>   \n  <b>bold</b>",
+    "<br>line<br/>break</br> <img src='x'>",
+    "   \r\n\t ",
+    "unterminated <div class='a",
+    "<![CDATA[raw]]><!DOCTYPE html><?php echo 1; ?>",
+    "",
+]
+
+FUZZ_TOKENS = [
+    "<p>", "</p>", "<br>", "</br>", "<script>", "</script>", "<pre>", "</pre>", "<rt>", "</rt>",
+    "<!-- c -->", "<![CDATA[ x ]]>", "&amp;", "&foo", "&#150;", "&", "<", " ", "\n", "\t", "word",
+    "<a href='u'>", "</a>", "<img src=x>",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_clean_html_matches_beautifulsoup(text):
+    """
+    Teste l'équivalence avec le nettoyage BeautifulSoup sur des cas représentatifs.
+    """
+    assert clean_html(text) == clean_html_reference(text)
+
+def test_clean_html_matches_beautifulsoup_fuzz():
+    """
+    Teste l'équivalence sur des contenus HTML générés aléatoirement.
+    """
+    warnings.filterwarnings("ignore")
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 20)))
+        assert clean_html(text, 40) == clean_html_reference(text, 40), text
+
+def test_clean_texts_process_pool():
+    """
+    Teste que le mode pool de processus donne le même résultat, dans le même ordre.
+    """
+    texts = SAMPLES * 5
+    assert clean_texts(texts, workers=2, parallel_threshold=1) == [clean_html(text) for text in texts]
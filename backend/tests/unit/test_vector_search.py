@@ -0,0 +1,65 @@
+# tests/unit/test_vector_search.py
+
+import numpy as np
+import pytest
+from app.utils.vector_search import BruteForceVectorIndex
+
+
+def exact_neighbors(vectors, queries, k, metric):
+    if metric == "l2":
+        distances = np.linalg.norm(vectors[None, :, :] - queries[:, None, :], axis=2)
+    else:
+        distances = 1 - (queries @ vectors.T) / np.outer(np.linalg.norm(queries, axis=1), np.linalg.norm(vectors, axis=1))
+    return np.argsort(distances, axis=1, kind="stable")[:, :k], np.sort(distances, axis=1)[:, :k]
+
+
+@pytest.mark.parametrize("metric", ["l2", "cosine"])
+def test_batched_search_matches_exact_ranking(metric):
+    """
+    Teste le top-k par blocs (plusieurs requêtes, blocs plus petits que k) contre un tri complet.
+    """
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    queries = rng.normal(size=(5, 16)).astype(np.float32)
+    index = BruteForceVectorIndex(np.arange(300) + 1000, vectors, metric, block_size=7)
+
+    ids, distances = index.search(queries, 10)
+    rows, expected = exact_neighbors(vectors, queries, 10, metric)
+    assert np.array_equal(ids, rows + 1000)
+    assert np.allclose(distances, expected, atol=1e-4)
+
+
+def test_quantized_search_reranks_exactly():
+    """
+    Teste que la recherche int8 retrouve les mêmes voisins, avec les distances exactes.
+    """
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, 32))
+    vectors = (centers[rng.integers(0, 20, 500)] + rng.normal(scale=0.3, size=(500, 32))).astype(np.float32)
+    queries = vectors[:8] + rng.normal(scale=0.05, size=(8, 32)).astype(np.float32)
+    exact = BruteForceVectorIndex(np.arange(500), vectors)
+    quantized = BruteForceVectorIndex(np.arange(500), vectors, quantize=True, rerank_factor=4)
+
+    assert quantized.codes.dtype == np.int8
+    exact_ids, exact_distances = exact.search(queries, 5)
+    ids, distances = quantized.search(queries, 5)
+    assert np.array_equal(ids, exact_ids)
+    assert np.allclose(distances, exact_distances, atol=1e-4)
+
+
+def test_mask_and_keyset_position():
+    """
+    Teste les lignes exclues par le masque, la reprise après (distance, identifiant) et
+    le remplissage quand il y a moins de k lignes disponibles.
+    """
+    vectors = np.array([[1, 0], [0, 1], [2, 0], [0, 0]], dtype=np.float32)
+    index = BruteForceVectorIndex([10, 20, 30, 40], vectors, quantize=True)
+
+    ids, distances = index.search([0, 0], 3, mask=np.array([True, True, True, False]))
+    assert ids.tolist() == [[10, 20, 30]]
+    assert distances.tolist() == [[1, 1, 2]]
+    ids, _ = index.search([0, 0], 3, after=(1.0, 10))
+    assert ids.tolist() == [[20, 30, -1]]
+    assert index.search([0, 0], 0)[0].shape == (1, 0)
+    with pytest.raises(ValueError):
+        BruteForceVectorIndex([1], vectors[:1], metric="dot")